@@ -0,0 +1,45 @@
+from typing import Annotated, Callable, Type, TypeVar
+
+from fastapi import Depends
+from supabase import AsyncClient
+
+from app.core.database import get_async_supabase_client
+from app.repositories import (
+    ActionRepository,
+    AgendaRepository,
+    CollectedItemRepository,
+    ConversationRepository,
+    FeedbackRepository,
+    PrincipleRepository,
+    ReportRepository,
+    Repository,
+    SourceRepository,
+    StackRepository,
+)
+
+R = TypeVar("R", bound=Repository)
+
+
+def repository(repository_class: Type[R]) -> Callable[..., R]:
+    """
+    Dependency giving an endpoint `repository_class` over the shared async
+    client, which the app's lifespan opens and closes. Tests point every
+    endpoint at another client with
+    app.dependency_overrides[get_async_supabase_client].
+    """
+
+    def provide(client: AsyncClient = Depends(get_async_supabase_client)) -> R:
+        return repository_class(client)
+
+    return provide
+
+
+Actions = Annotated[ActionRepository, Depends(repository(ActionRepository))]
+Agendas = Annotated[AgendaRepository, Depends(repository(AgendaRepository))]
+CollectedItems = Annotated[CollectedItemRepository, Depends(repository(CollectedItemRepository))]
+Conversations = Annotated[ConversationRepository, Depends(repository(ConversationRepository))]
+Feedback = Annotated[FeedbackRepository, Depends(repository(FeedbackRepository))]
+Principles = Annotated[PrincipleRepository, Depends(repository(PrincipleRepository))]
+Reports = Annotated[ReportRepository, Depends(repository(ReportRepository))]
+Sources = Annotated[SourceRepository, Depends(repository(SourceRepository))]
+Stack = Annotated[StackRepository, Depends(repository(StackRepository))]
@@ -1,116 +1,96 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 from datetime import datetime
-from app.core.database import get_supabase_client
+from app.api.deps import Actions, Feedback
+from app.core.pagination import Page, Paginated
+from app.repositories import ActionRepository
 from app.schemas.reports import ActionResponse, ActionConfirm
 
 router = APIRouter()
 
 
 @router.get("", response_model=List[ActionResponse])
-async def list_actions(status: str | None = None, priority: str | None = None):
-    client = get_supabase_client()
-    query = client.table("actions").select("*")
-
-    if status:
-        query = query.eq("status", status)
-    if priority:
-        query = query.eq("priority", priority)
-
-    result = query.order("created_at", desc=True).execute()
-    return result.data
+async def list_actions(
+    actions: Actions,
+    status: str | None = None,
+    priority: str | None = None,
+    page: Page = Depends(Paginated(ActionRepository, ActionResponse)),
+):
+    return page.respond(await actions.list(status=status, priority=priority, **page.query))
 
 
 @router.get("/pending", response_model=List[ActionResponse])
-async def list_pending_actions():
+async def list_pending_actions(actions: Actions):
     """Get all pending actions"""
-    client = get_supabase_client()
-    result = (
-        client.table("actions")
-        .select("*")
-        .eq("status", "pending")
-        .order("priority", desc=True)
-        .order("created_at", desc=True)
-        .execute()
-    )
-    return result.data
+    return await actions.list_pending()
 
 
 @router.get("/{action_id}", response_model=ActionResponse)
-async def get_action(action_id: str):
-    client = get_supabase_client()
-    result = client.table("actions").select("*").eq("id", action_id).single().execute()
+async def get_action(action_id: str, actions: Actions):
+    action = await actions.get(action_id)
 
-    if not result.data:
+    if not action:
         raise HTTPException(status_code=404, detail="Action not found")
 
-    return result.data
+    return action
 
 
 @router.post("/{action_id}/confirm")
-async def confirm_action(action_id: str, body: ActionConfirm | None = None):
+async def confirm_action(action_id: str, actions: Actions, feedback: Feedback, body: ActionConfirm | None = None):
     """Confirm an action (user approves)"""
-    client = get_supabase_client()
-
-    result = client.table("actions").update({
+    action = await actions.update(action_id, {
         "status": "confirmed",
         "confirmed_at": datetime.now().isoformat(),
-    }).eq("id", action_id).execute()
+    })
 
-    if not result.data:
+    if not action:
         raise HTTPException(status_code=404, detail="Action not found")
 
     # Record feedback
     if body and body.comment:
-        client.table("feedback").insert({
+        await feedback.insert({
             "entity_type": "action",
             "entity_id": action_id,
             "feedback_type": "confirm",
             "comment": body.comment,
-        }).execute()
+        })
 
-    return result.data[0]
+    return action
 
 
 @router.post("/{action_id}/reject")
-async def reject_action(action_id: str, body: ActionConfirm | None = None):
+async def reject_action(action_id: str, actions: Actions, feedback: Feedback, body: ActionConfirm | None = None):
     """Reject an action"""
-    client = get_supabase_client()
-
-    result = client.table("actions").update({
+    action = await actions.update(action_id, {
         "status": "rejected",
-    }).eq("id", action_id).execute()
+    })
 
-    if not result.data:
+    if not action:
         raise HTTPException(status_code=404, detail="Action not found")
 
     # Record feedback
-    client.table("feedback").insert({
+    await feedback.insert({
         "entity_type": "action",
         "entity_id": action_id,
         "feedback_type": "reject",
         "comment": body.comment if body else None,
-    }).execute()
+    })
 
-    return result.data[0]
+    return action
 
 
 @router.post("/{action_id}/execute")
-async def mark_executed(action_id: str):
+async def mark_executed(action_id: str, actions: Actions):
     """Mark action as executed"""
-    client = get_supabase_client()
-
     # Check if confirmed first
-    action = client.table("actions").select("status").eq("id", action_id).single().execute()
-    if not action.data:
+    action = await actions.get(action_id, columns="status")
+    if not action:
         raise HTTPException(status_code=404, detail="Action not found")
 
-    if action.data["status"] != "confirmed":
+    if action["status"] != "confirmed":
         raise HTTPException(status_code=400, detail="Action must be confirmed before execution")
 
-    result = client.table("actions").update({
+    return await actions.update(action_id, {
         "status": "executed",
         "executed_at": datetime.now().isoformat(),
-    }).eq("id", action_id).execute()
-
-    return result.data[0]
+    })
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
-from app.core.database import get_supabase_client
+from app.api.deps import Conversations
+from app.core.pagination import Page, Paginated
+from app.repositories import ConversationRepository
 from app.schemas.conversations import (
-    ConversationCreate,
     ConversationResponse,
     ConversationImportRequest,
     ConversationImportResponse,
@@ -15,46 +16,43 @@ parser = ConversationParser()
 
 
 @router.get("", response_model=List[ConversationResponse])
-async def list_conversations(platform: Platform | None = None, limit: int = 100):
-    client = get_supabase_client()
-    query = client.table("conversations").select("*").limit(limit)
-
-    if platform:
-        query = query.eq("platform", platform.value)
-
-    result = query.order("imported_at", desc=True).execute()
-    return result.data
+async def list_conversations(
+    conversations: Conversations,
+    platform: Platform | None = None,
+    page: Page = Depends(Paginated(ConversationRepository, ConversationResponse, default_limit=100)),
+):
+    return page.respond(await conversations.list(
+        platform=platform.value if platform else None,
+        **page.query,
+    ))
 
 
 @router.get("/{conversation_id}", response_model=ConversationResponse)
-async def get_conversation(conversation_id: str):
-    client = get_supabase_client()
-    result = client.table("conversations").select("*").eq("id", conversation_id).single().execute()
+async def get_conversation(conversation_id: str, conversations: Conversations):
+    conversation = await conversations.get(conversation_id)
 
-    if not result.data:
+    if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    return result.data
+    return conversation
 
 
 @router.post("/import", response_model=ConversationImportResponse)
-async def import_conversations(request: ConversationImportRequest):
+async def import_conversations(request: ConversationImportRequest, conversations: Conversations):
     """Import conversations from AI platform export file"""
     try:
-        conversations = parser.parse(request.platform, request.file_content)
+        parsed = parser.parse(request.platform, request.file_content)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse: {str(e)}")
 
-    client = get_supabase_client()
-    imported = []
-
-    for conv in conversations:
+    rows = []
+    for conv in parsed:
         data = conv.model_dump()
         data["platform"] = data["platform"].value
+        rows.append(data)
 
-        result = client.table("conversations").insert(data).execute()
-        if result.data:
-            imported.append(result.data[0])
+    # One request for the whole export
+    imported = await conversations.insert_many(rows)
 
     return ConversationImportResponse(
         imported_count=len(imported),
@@ -63,7 +61,6 @@ async def import_conversations(request: ConversationImportRequest):
 
 
 @router.delete("/{conversation_id}")
-async def delete_conversation(conversation_id: str):
-    client = get_supabase_client()
-    client.table("conversations").delete().eq("id", conversation_id).execute()
+async def delete_conversation(conversation_id: str, conversations: Conversations):
+    await conversations.delete(conversation_id)
     return {"deleted": True}
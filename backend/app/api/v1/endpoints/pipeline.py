@@ -1,10 +1,24 @@
-from fastapi import APIRouter, BackgroundTasks
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Literal
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query
+from app.api.deps import CollectedItems
+from app.core.config import get_settings
+from app.core.locks import PIPELINE_LOCK, JobLock, JobLockLost
+from app.core.sse import sse_response
+from app.repositories import CollectedItemRepository
 from app.services.pipeline import Pipeline
 from app.services.learner.feedback import FeedbackLearner
+from app.services.run_history import RunHistory
+from app.services.runs import PipelineRun, get_run_registry
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 pipeline = Pipeline()
 learner = FeedbackLearner()
+history = RunHistory()
 
 
 @router.post("/run")
@@ -12,14 +26,126 @@ async def run_pipeline(
     background_tasks: BackgroundTasks,
     agenda_id: str | None = None,
     run_in_background: bool = False,
+    mode: Literal["streaming", "phased"] | None = None,
 ):
-    """Run the full pipeline"""
+    """
+    Run the full pipeline.
+
+    mode overrides settings.pipeline_mode; "phased" runs one step at a time.
+    In the background, the response carries the run ID; follow progress on
+    GET /pipeline/runs/{run_id}/events.
+
+    Returns 409 while another run (manual or scheduled, in any process)
+    holds the pipeline lock.
+    """
+    lock = JobLock(PIPELINE_LOCK)
+    if not await lock.acquire():
+        raise HTTPException(status_code=409, detail="A pipeline run is already in progress")
+
+    run = get_run_registry().create(agenda_id)
+
     if run_in_background:
-        background_tasks.add_task(pipeline.run_full_pipeline, agenda_id)
-        return {"status": "started", "message": "Pipeline running in background"}
+        background_tasks.add_task(_run_in_background, lock, agenda_id, run, mode)
+        return {
+            "status": "started",
+            "message": "Pipeline running in background",
+            "run_id": run.id,
+        }
+
+    try:
+        return await _run_holding(lock, agenda_id, run, mode)
+    except JobLockLost as e:
+        logger.error(f"Pipeline run {run.id} aborted: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+async def _run_holding(lock: JobLock, agenda_id: str | None, run: PipelineRun, mode: str | None):
+    """Run the pipeline under an acquired lock and release it when done"""
+    try:
+        return await lock.run(pipeline.run_full_pipeline(agenda_id, run, mode))
+    finally:
+        await lock.release()
+
+
+async def _run_in_background(lock: JobLock, agenda_id: str | None, run: PipelineRun, mode: str | None):
+    """_run_holding for a background task, where the run's events are the only place to report"""
+    try:
+        await _run_holding(lock, agenda_id, run, mode)
+    except JobLockLost as e:
+        logger.error(f"Pipeline run {run.id} aborted: {e}")
+        if not run.finished:
+            run.fail(str(e))
+
+
+@router.get("/runs")
+async def list_runs():
+    """Recent pipeline runs, newest first"""
+    return [run.summary() for run in get_run_registry().list()]
+
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    """Status of a pipeline run, with its results once finished"""
+    run = get_run_registry().get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {**run.summary(), "result": run.result}
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_run_events(
+    run_id: str,
+    after: int = 0,
+    last_event_id: int | None = Header(default=None),
+):
+    """
+    Server-Sent Events for a pipeline run.
+
+    Replays the events so far, then streams new ones until the run
+    finishes. Reconnecting clients resume after Last-Event-ID (or `after`).
+    """
+    run = get_run_registry().get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    events = run.subscribe(
+        after=last_event_id if last_event_id is not None else after,
+        keepalive=get_settings().sse_keepalive_seconds,
+    )
+    return sse_response(events)
+
+
+@router.get("/history")
+async def list_run_history(
+    limit: int = 20,
+    offset: int = 0,
+    agenda_id: str | None = None,
+    success: bool | None = None,
+):
+    """Finished pipeline runs saved in pipeline_runs, newest first"""
+    return await history.list(limit=min(limit, 100), offset=offset, agenda_id=agenda_id, success=success)
+
+
+@router.get("/history/stats")
+async def get_run_stats(
+    days: int = 30,
+    bucket: Literal["hour", "day", "week", "month"] = "day",
+):
+    """
+    Pipeline run trends over the last `days`: run and failure counts,
+    p50/p95 duration, items per run, quality filter pass rate and LLM cost,
+    overall and per bucket.
+    """
+    return await history.stats(days=days, bucket=bucket)
 
-    results = await pipeline.run_full_pipeline(agenda_id)
-    return results
+
+@router.get("/history/{run_id}")
+async def get_run_history(run_id: UUID):
+    """A saved pipeline run with its steps, metrics and errors"""
+    run = await history.get(str(run_id))
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
 
 
 @router.post("/weekly-summary/{agenda_id}")
@@ -44,29 +170,67 @@ async def get_principle_suggestions():
 
 
 @router.post("/reprocess")
-async def reprocess_items(limit: int = 50):
-    """Reset processed_at to allow reprocessing of items"""
-    from app.core.database import get_supabase_client
-    client = get_supabase_client()
-
-    # Get items that have been processed
-    items = (
-        client.table("collected_items")
-        .select("id")
-        .not_.is_("processed_at", "null")
-        .eq("filtered_out", False)
-        .limit(limit)
-        .execute()
-    )
+async def reprocess_items(
+    background_tasks: BackgroundTasks,
+    items: CollectedItems,
+    source_id: List[str] | None = Query(None),
+    agenda_id: str | None = None,
+    collected_after: datetime | None = None,
+    collected_before: datetime | None = None,
+    verdict: List[Literal["ADOPT", "CONSIDER", "SKIP"]] | None = Query(None),
+    min_quality: float | None = None,
+    max_quality: float | None = None,
+    limit: int = Query(50, ge=0),
+    dry_run: bool = False,
+    run_in_background: bool = False,
+):
+    """
+    Reset processed_at so the next pipeline run analyzes items again.
+
+    Filters combine with AND; source_id and verdict may be repeated.
+    Newest items go first up to `limit` (0 for every matching item).
+    dry_run only counts the matching items. Resets run as set-based
+    statements of up to settings.reprocess_chunk_size items; use
+    run_in_background for large ones.
+    """
+    filters = {
+        "source_ids": source_id,
+        "agenda_id": agenda_id,
+        "collected_after": collected_after.isoformat() if collected_after else None,
+        "collected_before": collected_before.isoformat() if collected_before else None,
+        "verdicts": verdict,
+        "min_quality": min_quality,
+        "max_quality": max_quality,
+    }
+    max_items = limit or None
+
+    if dry_run:
+        matched = await items.reprocess(**filters, limit=max_items, dry_run=True)
+        return {"dry_run": True, "matched_count": matched}
+
+    if run_in_background:
+        background_tasks.add_task(_reprocess, items, filters, max_items)
+        return {"status": "started", "message": "Reprocessing reset running in background"}
 
-    if not items.data:
+    reset_count = await _reprocess(items, filters, max_items)
+
+    if not reset_count:
         return {"reset_count": 0, "message": "No processed items found"}
 
-    # Reset processed_at to NULL
-    item_ids = [item["id"] for item in items.data]
-    for item_id in item_ids:
-        client.table("collected_items").update({
-            "processed_at": None
-        }).eq("id", item_id).execute()
+    return {"reset_count": reset_count, "message": f"Reset {reset_count} items for reprocessing"}
+
+
+async def _reprocess(items: CollectedItemRepository, filters: Dict[str, Any], limit: int | None) -> int:
+    """Reset matching items chunk by chunk, so no single statement runs long"""
+    chunk_size = get_settings().reprocess_chunk_size
+    total = 0
+    while limit is None or total < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - total)
+        reset = await items.reprocess(**filters, limit=size)
+        total += reset
+        # Reset items no longer match, so a short chunk means none are left
+        if reset < size:
+            break
 
-    return {"reset_count": len(item_ids), "message": f"Reset {len(item_ids)} items for reprocessing"}
+    logger.info(f"Reset {total} items for reprocessing")
+    return total
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
-from app.core.database import get_supabase_client
+from app.api.deps import Conversations, Principles
+from app.core.pagination import Page, Paginated
+from app.repositories import PrincipleRepository
 from app.schemas.principles import (
     PrincipleCreate,
     PrincipleUpdate,
@@ -10,89 +14,77 @@ from app.schemas.principles import (
     ExtractionResponse,
 )
 from app.services.principles.extractor import PrincipleExtractor
+from app.services.context import invalidate_run_context
 
 router = APIRouter()
 extractor = PrincipleExtractor()
 
 
 @router.get("", response_model=List[PrincipleResponse])
-async def list_principles(category: str | None = None, active_only: bool = True):
-    client = get_supabase_client()
-    query = client.table("principles").select("*")
-
-    if category:
-        query = query.eq("category", category)
-    if active_only:
-        query = query.eq("is_active", True)
-
-    result = query.order("confidence_score", desc=True).execute()
-    return result.data
+async def list_principles(
+    principles: Principles,
+    category: str | None = None,
+    active_only: bool = True,
+    page: Page = Depends(Paginated(PrincipleRepository, PrincipleResponse)),
+):
+    return page.respond(await principles.list(category=category, active_only=active_only, **page.query))
 
 
 @router.get("/{principle_id}", response_model=PrincipleWithEvidence)
-async def get_principle(principle_id: str):
-    client = get_supabase_client()
-
-    principle = client.table("principles").select("*").eq("id", principle_id).single().execute()
-    if not principle.data:
+async def get_principle(principle_id: str, principles: Principles):
+    principle, evidences = await asyncio.gather(
+        principles.get(principle_id),
+        principles.list_evidences(principle_id),
+    )
+    if not principle:
         raise HTTPException(status_code=404, detail="Principle not found")
 
-    evidences = client.table("principle_evidences").select("*").eq("principle_id", principle_id).execute()
-
-    return {**principle.data, "evidences": evidences.data}
+    return {**principle, "evidences": evidences}
 
 
 @router.post("", response_model=PrincipleResponse)
-async def create_principle(principle: PrincipleCreate):
-    client = get_supabase_client()
-    result = client.table("principles").insert(principle.model_dump()).execute()
-    return result.data[0]
+async def create_principle(principle: PrincipleCreate, principles: Principles):
+    created = await principles.insert(principle.model_dump())
+    invalidate_run_context("principles")
+    return created
 
 
 @router.patch("/{principle_id}", response_model=PrincipleResponse)
-async def update_principle(principle_id: str, principle: PrincipleUpdate):
-    client = get_supabase_client()
-
+async def update_principle(principle_id: str, principle: PrincipleUpdate, principles: Principles):
     update_data = {k: v for k, v in principle.model_dump().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    result = client.table("principles").update(update_data).eq("id", principle_id).execute()
-    if not result.data:
+    updated = await principles.update(principle_id, update_data)
+    if not updated:
         raise HTTPException(status_code=404, detail="Principle not found")
 
-    return result.data[0]
+    invalidate_run_context("principles")
+    return updated
 
 
 @router.delete("/{principle_id}")
-async def delete_principle(principle_id: str):
-    client = get_supabase_client()
-    client.table("principles").delete().eq("id", principle_id).execute()
+async def delete_principle(principle_id: str, principles: Principles):
+    await principles.delete(principle_id)
+    invalidate_run_context("principles")
     return {"deleted": True}
 
 
 @router.post("/extract", response_model=ExtractionResponse)
-async def extract_principles(request: ExtractionRequest):
+async def extract_principles(request: ExtractionRequest, conversations: Conversations, principles: Principles):
     """Extract principles from imported conversations using LLM"""
-    client = get_supabase_client()
-
-    query = client.table("conversations").select("*")
-    if request.conversation_ids:
-        query = query.in_("id", request.conversation_ids)
+    found = await conversations.list(ids=request.conversation_ids)
 
-    conversations = query.execute()
-
-    if not conversations.data:
+    if not found:
         raise HTTPException(status_code=404, detail="No conversations found")
 
-    extracted = await extractor.extract_from_conversations(conversations.data)
+    extracted = await extractor.extract_from_conversations(found)
+
+    # Save extracted principles in one request
+    saved = await principles.insert_many([p.model_dump() for p in extracted])
 
-    # Save extracted principles
-    saved = []
-    for p in extracted:
-        result = client.table("principles").insert(p.model_dump()).execute()
-        if result.data:
-            saved.append(result.data[0])
+    if saved:
+        invalidate_run_context("principles")
 
     return ExtractionResponse(
         extracted_count=len(saved),
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, HTTPException
+from app.core.sse import sse_response
+from app.services.analyzer.cache import cache_stats_scope
 from app.services.processor.vibecoding import VibeCodingProcessor
 
 router = APIRouter()
@@ -8,15 +10,31 @@ processor = VibeCodingProcessor()
 @router.post("/vibecoding/process")
 async def process_vibecoding_items():
     """Process new VibeCoding items"""
-    results = await processor.process_new_items()
-    return {"processed": len(results), "results": results}
+    with cache_stats_scope() as cache_stats:
+        results = await processor.process_new_items()
+    return {
+        "processed": len(results),
+        "results": results,
+        "llm_cache": cache_stats,
+    }
 
 
 @router.get("/vibecoding/compare/{category}")
-async def compare_with_current_stack(category: str):
-    """Compare tools with current stack (terminal, harness, orchestrator)"""
+async def compare_with_current_stack(
+    category: str, stream: bool = False, timeout: float | None = None
+):
+    """
+    Compare tools with current stack (terminal, harness, orchestrator).
+
+    Comparisons run concurrently; any still running after `timeout` seconds
+    are reported under "timed_out". With stream=true, each comparison is
+    sent as a Server-Sent Event as soon as it completes.
+    """
     try:
-        report = await processor.generate_comparison_report(category)
+        if stream:
+            events = await processor.stream_comparison_report(category, timeout=timeout)
+            return sse_response(events)
+        report = await processor.generate_comparison_report(category, timeout=timeout)
         return report
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,82 +1,66 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
-from app.core.database import get_supabase_client
-from app.schemas.reports import ReportCreate, ReportResponse, ReportStatus
+from datetime import datetime
+from app.api.deps import Actions, Reports
+from app.core.pagination import Page, Paginated
+from app.repositories import ReportRepository
+from app.schemas.reports import ReportResponse, ReportStatus
 
 router = APIRouter()
 
 
 @router.get("", response_model=List[ReportResponse])
-async def list_reports(status: str | None = None, limit: int = 50):
-    client = get_supabase_client()
-    query = client.table("reports").select("*")
-
-    if status:
-        query = query.eq("status", status)
-
-    result = query.order("created_at", desc=True).limit(limit).execute()
-    return result.data
+async def list_reports(
+    reports: Reports,
+    status: str | None = None,
+    page: Page = Depends(Paginated(ReportRepository, ReportResponse, default_limit=50)),
+):
+    return page.respond(await reports.list(status=status, **page.query))
 
 
 @router.get("/pending", response_model=List[ReportResponse])
-async def list_pending_reports():
-    """Get all pending reports for review"""
-    client = get_supabase_client()
-    result = (
-        client.table("reports")
-        .select("*")
-        .eq("status", ReportStatus.PENDING.value)
-        .order("created_at", desc=True)
-        .execute()
-    )
-    return result.data
+async def list_pending_reports(reports: Reports, page: Page = Depends(Paginated(ReportRepository, ReportResponse))):
+    """Get pending reports for review"""
+    return page.respond(await reports.list(status=ReportStatus.PENDING.value, **page.query))
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
-async def get_report(report_id: str):
-    client = get_supabase_client()
-    result = client.table("reports").select("*").eq("id", report_id).single().execute()
+async def get_report(report_id: str, reports: Reports):
+    report = await reports.get(report_id)
 
-    if not result.data:
+    if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return result.data
+    return report
 
 
 @router.get("/{report_id}/actions")
-async def get_report_actions(report_id: str):
-    client = get_supabase_client()
-    result = client.table("actions").select("*").eq("report_id", report_id).execute()
-    return result.data
+async def get_report_actions(report_id: str, actions: Actions):
+    return await actions.list(report_id=report_id)
 
 
 @router.post("/{report_id}/review")
-async def mark_reviewed(report_id: str):
+async def mark_reviewed(report_id: str, reports: Reports):
     """Mark report as reviewed"""
-    client = get_supabase_client()
-    from datetime import datetime
-
-    result = client.table("reports").update({
+    report = await reports.update(report_id, {
         "status": ReportStatus.REVIEWED.value,
         "reviewed_at": datetime.now().isoformat(),
-    }).eq("id", report_id).execute()
+    })
 
-    if not result.data:
+    if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return result.data[0]
+    return report
 
 
 @router.post("/{report_id}/archive")
-async def archive_report(report_id: str):
+async def archive_report(report_id: str, reports: Reports):
     """Archive a report"""
-    client = get_supabase_client()
-
-    result = client.table("reports").update({
+    report = await reports.update(report_id, {
         "status": ReportStatus.ARCHIVED.value,
-    }).eq("id", report_id).execute()
+    })
 
-    if not result.data:
+    if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return result.data[0]
+    return report
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends
 from typing import List
 from pydantic import BaseModel
-from app.core.database import get_supabase_client
+from app.api.deps import CollectedItems, Sources
+from app.core.pagination import Page, Paginated
+from app.repositories import SourceRepository
 from app.services.collector.manager import CollectorManager
 
 router = APIRouter()
@@ -24,52 +26,40 @@ class SourceResponse(BaseModel):
     config: dict
     is_active: bool
     last_collected_at: str | None
+    next_poll_at: str | None = None
+    poll_interval_minutes: int | None = None
+    consecutive_failures: int = 0
     created_at: str
 
 
 @router.get("", response_model=List[SourceResponse])
-async def list_sources(agenda_id: str | None = None):
-    client = get_supabase_client()
-    query = client.table("sources").select("*")
-
-    if agenda_id:
-        query = query.eq("agenda_id", agenda_id)
-
-    result = query.execute()
-    return result.data
+async def list_sources(
+    sources: Sources,
+    agenda_id: str | None = None,
+    page: Page = Depends(Paginated(SourceRepository, SourceResponse)),
+):
+    return page.respond(await sources.list(agenda_id, **page.query))
 
 
 @router.post("", response_model=SourceResponse)
-async def create_source(source: SourceCreate):
-    client = get_supabase_client()
-    result = client.table("sources").insert(source.model_dump()).execute()
-    return result.data[0]
+async def create_source(source: SourceCreate, sources: Sources):
+    return await sources.insert(source.model_dump())
 
 
 @router.delete("/{source_id}")
-async def delete_source(source_id: str):
-    client = get_supabase_client()
-    client.table("sources").delete().eq("id", source_id).execute()
+async def delete_source(source_id: str, sources: Sources):
+    await sources.delete(source_id)
     return {"deleted": True}
 
 
 @router.post("/collect")
-async def trigger_collection(agenda_id: str | None = None):
-    """Manually trigger collection"""
+async def trigger_collection(agenda_id: str | None = None, due_only: bool = False):
+    """Manually trigger collection; due_only skips sources not yet due for polling"""
     manager = CollectorManager()
-    results = await manager.collect_all(agenda_id)
-    return {"results": results}
+    results = await manager.collect_all(agenda_id, due_only=due_only)
+    return {"results": results, "summary": manager.summarize(results)}
 
 
 @router.get("/{source_id}/items")
-async def get_source_items(source_id: str, limit: int = 50):
-    client = get_supabase_client()
-    result = (
-        client.table("collected_items")
-        .select("*")
-        .eq("source_id", source_id)
-        .order("collected_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return result.data
+async def get_source_items(source_id: str, items: CollectedItems, limit: int = 50):
+    return await items.list_for_source(source_id, limit)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
-from app.core.database import get_supabase_client
+from typing import List
+from app.api.deps import Stack
+from app.services.context import invalidate_run_context
 
 router = APIRouter()
 
@@ -31,52 +32,47 @@ class StackItemUpdate(BaseModel):
 
 
 @router.get("", response_model=List[StackItem])
-async def list_stack():
+async def list_stack(stack: Stack):
     """Get all stack items."""
-    client = get_supabase_client()
-    result = client.table("user_stack").select("*").order("category").execute()
-    return result.data
+    return await stack.list()
 
 
 @router.get("/{category}", response_model=StackItem)
-async def get_stack_item(category: str):
+async def get_stack_item(category: str, stack: Stack):
     """Get a specific stack item by category."""
-    client = get_supabase_client()
-    result = client.table("user_stack").select("*").eq("category", category).single().execute()
-    if not result.data:
+    item = await stack.get(category)
+    if not item:
         raise HTTPException(status_code=404, detail=f"Stack item not found: {category}")
-    return result.data
+    return item
 
 
 @router.post("", response_model=StackItem)
-async def create_stack_item(item: StackItemCreate):
+async def create_stack_item(item: StackItemCreate, stack: Stack):
     """Add a new stack item."""
-    client = get_supabase_client()
-    result = client.table("user_stack").insert(item.model_dump()).execute()
-    return result.data[0]
+    created = await stack.insert(item.model_dump())
+    invalidate_run_context("stack")
+    return created
 
 
 @router.put("/{category}", response_model=StackItem)
-async def update_stack_item(category: str, item: StackItemUpdate):
+async def update_stack_item(category: str, item: StackItemUpdate, stack: Stack):
     """Update a stack item by category."""
-    client = get_supabase_client()
-
     # Filter out None values
     update_data = {k: v for k, v in item.model_dump().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    result = client.table("user_stack").update(update_data).eq("category", category).execute()
-    if not result.data:
+    updated = await stack.update(category, update_data)
+    if not updated:
         raise HTTPException(status_code=404, detail=f"Stack item not found: {category}")
-    return result.data[0]
+    invalidate_run_context("stack")
+    return updated
 
 
 @router.delete("/{category}")
-async def delete_stack_item(category: str):
+async def delete_stack_item(category: str, stack: Stack):
     """Delete a stack item by category."""
-    client = get_supabase_client()
-    result = client.table("user_stack").delete().eq("category", category).execute()
-    if not result.data:
+    if not await stack.delete(category):
         raise HTTPException(status_code=404, detail=f"Stack item not found: {category}")
+    invalidate_run_context("stack")
     return {"message": f"Deleted stack item: {category}"}
@@ -19,15 +19,95 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_anon_key: str
     supabase_service_role_key: str
+    # Shared, pooled PostgREST session (see core.database)
+    supabase_timeout: float = 120.0
+    supabase_max_connections: int = 50
+    supabase_max_keepalive_connections: int = 20
+
+    # Bulk writes (collection upserts, quality scores, processed flags,
+    # report actions): "postgrest" or "asyncpg", which sends them as
+    # COPY / UNNEST statements straight to Postgres at database_url
+    db_bulk_backend: str = "postgrest"
+    database_url: str | None = None
+    database_pool_min_size: int = 1
+    database_pool_max_size: int = 10
+    database_timeout: float = 60.0
 
     # Gemini API
     gemini_api_key: str
+    gemini_requests_per_minute: int = 60
+    gemini_burst: int = 4
+
+    # LLM calls
+    llm_max_concurrency: int = 4
+    llm_max_retries: int = 4
+    llm_retry_base_delay: float = 2.0
+
+    # USD per million tokens, for pipeline run cost in /pipeline/history
+    llm_prompt_price_per_million: float = 0.10
+    llm_output_price_per_million: float = 0.40
+
+    # Batched analysis: up to this many items per Gemini prompt (1 = off)
+    llm_batch_max_items: int = 1
+    llm_batch_input_token_budget: int = 30000
+    llm_batch_output_token_budget: int = 8192
+    llm_batch_output_tokens_per_item: int = 1500
+
+    # LLM response cache
+    llm_cache_backend: str = "sqlite"  # "sqlite", "memory" or "none"
+    llm_cache_path: str = ".cache/llm_cache.sqlite3"
+    llm_cache_ttl_hours: float = 168.0
+    llm_cache_max_entries: int = 5000
+
+    # Cached principles / user stack shared across pipeline runs
+    run_context_ttl_seconds: int = 300
+
+    # Collected item search: "postgres" (search_collected_items RPC) or "memory"
+    search_backend: str = "postgres"
+
+    # Stack comparisons still running after this are dropped from the report
+    comparison_timeout_seconds: float = 60.0
+
+    # Pipeline execution: "streaming" (overlapped stages) or "phased"
+    pipeline_mode: str = "streaming"
+    pipeline_queue_size: int = 200
+
+    # /pipeline/reprocess resets at most this many items per statement
+    reprocess_chunk_size: int = 5000
+
+    # Pipeline runs kept in memory for /pipeline/runs and their event streams
+    pipeline_run_retention: int = 20
+    sse_keepalive_seconds: float = 15.0
 
     # RapidAPI (for Twitter)
     rapidapi_key: str | None = None
 
     # Scheduler
     scheduler_enabled: bool = False
+    # Lease on job_locks rows; renewed every third of this while a job runs
+    job_lock_ttl_seconds: int = 300
+
+    # Collection
+    collector_max_concurrency: int = 10
+    collector_per_host_concurrency: int = 2
+    collector_save_scope: str = "source"  # "source" or "run"
+    collector_upsert_chunk_size: int = 500
+
+    # Adaptive polling: a source is due again once it should have about
+    # collector_poll_target_items new items at its recent publish rate
+    collector_adaptive_polling: bool = True
+    collector_poll_tick_minutes: int = 10
+    collector_poll_min_minutes: int = 30
+    collector_poll_max_minutes: int = 1440
+    collector_poll_target_items: float = 3.0
+    collector_poll_history_days: int = 14
+
+    # Outbound HTTP (shared client for collectors and notifiers)
+    http_timeout: float = 30.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_max_connections_per_host: int = 4
+    http_keepalive_expiry: float = 30.0
 
     @property
     def is_production(self) -> bool:
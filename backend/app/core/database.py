@@ -1,13 +1,56 @@
-from supabase import create_client, Client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions
 
 from app.core.config import get_settings
+from app.core.http import HTTP2_AVAILABLE
+from app.core.metrics import db_transport
 
+_async_session: httpx.AsyncClient | None = None
+_async_client: AsyncClient | None = None
 
-def get_supabase_client() -> Client:
+
+def _session_options() -> dict:
     settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    return {
+        "follow_redirects": True,
+        "timeout": settings.supabase_timeout,
+        "transport": db_transport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.supabase_max_connections,
+                max_keepalive_connections=settings.supabase_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        ),
+    }
 
 
-def get_supabase_anon_client() -> Client:
-    settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
+def get_async_supabase_client() -> AsyncClient:
+    """
+    Process-wide service-role client whose queries are awaited, so DB round
+    trips yield the event loop instead of blocking it. Used by the
+    repositories in app.repositories.
+    """
+    global _async_session, _async_client
+    if _async_client is None or _async_session is None or _async_session.is_closed:
+        _async_session = httpx.AsyncClient(**_session_options())
+        settings = get_settings()
+        _async_client = AsyncClient(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            AsyncClientOptions(
+                httpx_client=_async_session,
+                auto_refresh_token=False,
+                persist_session=False,
+            ),
+        )
+    return _async_client
+
+
+async def close_supabase_clients():
+    """Close the shared session; the next get_async_supabase_client() call starts a fresh pool"""
+    global _async_session, _async_client
+    if _async_session is not None:
+        await _async_session.aclose()
+        _async_session = None
+    _async_client = None
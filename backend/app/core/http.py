@@ -0,0 +1,65 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.metrics import http_transport
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # httpx[http2] extra not installed
+    HTTP2_AVAILABLE = False
+
+
+_client: httpx.AsyncClient | None = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide pooled HTTP client.
+
+    Connections are kept alive between calls and negotiated over HTTP/2
+    when the server supports it. Closed by close_http_client() on shutdown.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            timeout=settings.http_timeout,
+            transport=http_transport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry,
+                ),
+            ),
+        )
+    return _client
+
+
+@asynccontextmanager
+async def host_slot(url: str):
+    """Cap in-flight requests per host (settings.http_max_connections_per_host)"""
+    host = urlparse(url).hostname or ""
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = asyncio.Semaphore(get_settings().http_max_connections_per_host)
+        _host_slots[host] = slot
+    async with slot:
+        yield
+
+
+async def close_http_client():
+    """Close the shared client and drop per-host limits"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_slots.clear()
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Awaitable
+
+from app.core.config import get_settings
+from app.core.database import get_async_supabase_client
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process in job_locks.holder
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Lock names shared by the scheduler and the API
+PIPELINE_LOCK = "pipeline"
+COLLECTION_LOCK = "collection"
+WEEKLY_SUMMARY_LOCK = "weekly_summary"
+
+
+class JobLockBusy(Exception):
+    """Another holder has the lock"""
+
+    def __init__(self, name: str):
+        super().__init__(f"Job lock '{name}' is held elsewhere")
+        self.name = name
+
+
+class JobLockLost(Exception):
+    """The lease ran out or was taken over while the job was running"""
+
+    def __init__(self, name: str):
+        super().__init__(f"Job lock '{name}' was lost; the job was cancelled")
+        self.name = name
+
+
+class JobLock:
+    """
+    Lease on a row in job_locks, shared by every API and scheduler process.
+
+    The lease lasts settings.job_lock_ttl_seconds and is renewed in the
+    background every third of that while held, so a crashed process
+    blocks the job for at most one TTL. Each JobLock has its own holder
+    ID, so a second acquire in the same process fails too.
+
+        async with JobLock(PIPELINE_LOCK) as lock:  # JobLockBusy if held elsewhere
+            await lock.run(job())  # JobLockLost if the lease is lost
+
+    A job passed to run() is cancelled as soon as a renewal finds the lease
+    gone, so it never keeps going alongside the process that took it over.
+
+    acquire()/release() are for holders that outlive one block, such as an
+    endpoint that hands the run to a background task.
+    """
+
+    def __init__(self, name: str, ttl_seconds: int | None = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds or get_settings().job_lock_ttl_seconds
+        self.holder = f"{INSTANCE_ID}:{uuid.uuid4().hex[:8]}"
+        self.client = get_async_supabase_client()
+        self.lost = False
+        self._renewal: asyncio.Task | None = None
+        self._job: asyncio.Future | None = None
+
+    async def acquire(self) -> bool:
+        result = await self.client.rpc("acquire_job_lock", {
+            "lock_name": self.name,
+            "lock_holder": self.holder,
+            "ttl_seconds": self.ttl_seconds,
+        }).execute()
+        if not result.data:
+            return False
+
+        self.lost = False
+        self._renewal = asyncio.create_task(self._renew())
+        logger.info(f"Acquired job lock {self.name} ({self.holder})")
+        return True
+
+    async def release(self):
+        if self._renewal is not None:
+            self._renewal.cancel()
+            try:
+                await self._renewal
+            except asyncio.CancelledError:
+                pass
+            self._renewal = None
+
+        try:
+            await self.client.rpc("release_job_lock", {
+                "lock_name": self.name,
+                "lock_holder": self.holder,
+            }).execute()
+        except Exception as e:
+            # The lease still expires on its own
+            logger.warning(f"Could not release job lock {self.name}: {e}")
+
+    async def _renew(self):
+        while True:
+            await asyncio.sleep(self.ttl_seconds / 3)
+            try:
+                result = await self.client.rpc("renew_job_lock", {
+                    "lock_name": self.name,
+                    "lock_holder": self.holder,
+                    "ttl_seconds": self.ttl_seconds,
+                }).execute()
+            except Exception as e:
+                # Retried on the next tick, well before the lease runs out
+                logger.warning(f"Could not renew job lock {self.name}: {e}")
+                continue
+
+            if not result.data:
+                self.lost = True
+                logger.error(f"Lost job lock {self.name}; cancelling the job")
+                if self._job is not None:
+                    # The message ends up in the job's CancelledError
+                    self._job.cancel(f"Lost job lock {self.name}")
+                return
+
+    async def run(self, job: Awaitable[Any]) -> Any:
+        """
+        Await `job` while holding the lock. Raises JobLockLost if the lease
+        is lost first, after cancelling the job.
+        """
+        self._job = asyncio.ensure_future(job)
+        try:
+            return await self._job
+        except asyncio.CancelledError:
+            if self.lost and self._job.cancelled():
+                raise JobLockLost(self.name) from None
+            raise
+        finally:
+            self._job = None
+
+    async def __aenter__(self) -> "JobLock":
+        if not await self.acquire():
+            raise JobLockBusy(self.name)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
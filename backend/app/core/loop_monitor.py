@@ -0,0 +1,50 @@
+import asyncio
+from collections import deque
+from typing import Dict
+
+
+class LoopLagMonitor:
+    """
+    Measure event loop lag: how late a periodic sleep wakes up.
+
+    Anything that blocks the loop (sync I/O, CPU work in a coroutine)
+    shows up as lag. Samples are kept over a rolling window.
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 120):
+        self.interval = interval
+        self._samples: deque[float] = deque(maxlen=window)
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - started - self.interval
+            self._samples.append(max(lag, 0.0) * 1000)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Lag in milliseconds: latest sample and max over the window"""
+        samples = list(self._samples)
+        return {
+            "last_ms": round(samples[-1], 2) if samples else 0.0,
+            "max_ms": round(max(samples), 2) if samples else 0.0,
+            "window_s": round(len(samples) * self.interval, 1),
+        }
+
+
+loop_monitor = LoopLagMonitor()
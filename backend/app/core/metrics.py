@@ -0,0 +1,359 @@
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urlparse
+import functools
+import inspect
+import math
+import threading
+import time
+
+import httpx
+
+# Histogram buckets in seconds, from fast DB reads to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# name -> (type, help)
+METRICS = {
+    "pipeline_stage_duration_seconds": ("histogram", "Time spent in one call of a pipeline component"),
+    "pipeline_stage_items_total": ("counter", "Items handled by a pipeline component"),
+    "pipeline_runs_total": ("counter", "Finished pipeline runs by status"),
+    "pipeline_run_duration_seconds": ("histogram", "Wall time of whole pipeline runs"),
+    "db_request_duration_seconds": ("histogram", "Supabase REST round trips and direct Postgres statements"),
+    "db_request_errors_total": ("counter", "Supabase REST requests that failed or returned status >= 400, and failed Postgres statements"),
+    "http_client_request_duration_seconds": ("histogram", "Outbound collector and notifier requests"),
+    "http_client_request_errors_total": ("counter", "Outbound requests that failed or returned status >= 400"),
+    "llm_request_duration_seconds": ("histogram", "LLM API calls, one per attempt"),
+    "llm_request_errors_total": ("counter", "LLM API calls that raised"),
+    "llm_tokens_total": ("counter", "LLM tokens by kind (prompt or output)"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms in Prometheus text format.
+
+    Only the names in METRICS are rendered; label sets are free-form.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[Labels, float]] = defaultdict(lambda: defaultdict(float))
+        # name -> labels -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any):
+        with self._lock:
+            self._counters[name][_labels(labels)] += value
+
+    def observe(self, name: str, value: float, **labels: Any):
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms[name].get(key)
+            if series is None:
+                series = self._histograms[name][key] = [0.0] * (len(self.buckets) + 2)
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "counter":
+                    for labels, value in sorted(self._counters[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+
+                for labels, series in sorted(self._histograms[name].items()):
+                    cumulative = 0.0
+                    for bound, count in zip(self.buckets, series):
+                        cumulative += count
+                        bucket_labels = labels + (("le", _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}")
+                    bucket_labels = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {_format_value(series[-1])}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {_format_value(series[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _percentile(values: List[float], q: float) -> float | None:
+    """Nearest-rank percentile of unsorted values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _latency_summary(seconds: List[float]) -> Dict[str, Any]:
+    return {
+        "count": len(seconds),
+        "total_ms": round(sum(seconds) * 1000, 1),
+        **{
+            f"p{round(q * 100)}_ms": round(_percentile(seconds, q) * 1000, 1) if seconds else None
+            for q in (0.5, 0.95, 0.99)
+        },
+    }
+
+
+class RunMetrics:
+    """
+    Everything recorded while one pipeline run is the current run (see
+    run_metrics_scope), summarized into its result.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "busy_s": 0.0, "items": 0}
+        )
+        self.db: Dict[str, List[float]] = defaultdict(list)
+        self.db_errors = 0
+        self.http: Dict[str, List[float]] = defaultdict(list)
+        self.http_errors = 0
+        self.llm: List[float] = []
+        self.llm_errors = 0
+        self.tokens = {"prompt": 0, "output": 0}
+
+    def summary(self) -> Dict[str, Any]:
+        stages = {}
+        for name, stage in self.stages.items():
+            stages[name] = {
+                "calls": stage["calls"],
+                "busy_ms": round(stage["busy_s"] * 1000, 1),
+                "items": stage["items"],
+                "items_per_sec": round(stage["items"] / stage["busy_s"], 2) if stage["busy_s"] else None,
+            }
+
+        db_all = [value for values in self.db.values() for value in values]
+        http_all = [value for values in self.http.values() for value in values]
+        return {
+            "stages": stages,
+            "db": {
+                **_latency_summary(db_all),
+                "errors": self.db_errors,
+                "by_table": {table: _latency_summary(values) for table, values in sorted(self.db.items())},
+            },
+            "http": {
+                **_latency_summary(http_all),
+                "errors": self.http_errors,
+                "by_host": {host: _latency_summary(values) for host, values in sorted(self.http.items())},
+            },
+            "llm": {
+                **_latency_summary(self.llm),
+                "errors": self.llm_errors,
+                "prompt_tokens": self.tokens["prompt"],
+                "output_tokens": self.tokens["output"],
+            },
+        }
+
+
+_current_run: ContextVar[RunMetrics | None] = ContextVar("current_run_metrics", default=None)
+
+
+@contextmanager
+def run_metrics_scope() -> Iterator[RunMetrics]:
+    """
+    Make a fresh RunMetrics current for the block.
+
+    Tasks created inside the block inherit it, so concurrent stages and
+    workers all record into the same run.
+    """
+    run_metrics = RunMetrics()
+    token = _current_run.set(run_metrics)
+    try:
+        yield run_metrics
+    finally:
+        _current_run.reset(token)
+
+
+def record_stage(stage: str, seconds: float, items: int = 0):
+    metrics.observe("pipeline_stage_duration_seconds", seconds, stage=stage)
+    metrics.inc("pipeline_stage_items_total", items, stage=stage)
+    run = _current_run.get()
+    if run:
+        entry = run.stages[stage]
+        entry["calls"] += 1
+        entry["busy_s"] += seconds
+        entry["items"] += items
+
+
+class StageTimer:
+    """Yielded by stage_timer; set `items` to what the call handled"""
+
+    def __init__(self, items: int = 0):
+        self.items = items
+
+
+@contextmanager
+def stage_timer(stage: str, items: int = 0) -> Iterator[StageTimer]:
+    """Time one call of a pipeline component, even if it raises"""
+    timer = StageTimer(items)
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        record_stage(stage, time.perf_counter() - started, timer.items)
+
+
+def timed(stage: str, items: Callable[[Any], int] = lambda result: 1):
+    """
+    Decorator form of stage_timer for a whole function or coroutine.
+    `items` maps the return value to the number of items it handled.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage) as timer:
+                    result = await func(*args, **kwargs)
+                    timer.items = items(result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage) as timer:
+                result = func(*args, **kwargs)
+                timer.items = items(result)
+            return result
+        return wrapper
+
+    return decorator
+
+
+def record_llm(
+    provider: str,
+    model: str,
+    seconds: float,
+    prompt_tokens: int = 0,
+    output_tokens: int = 0,
+    error: bool = False,
+):
+    metrics.observe("llm_request_duration_seconds", seconds, provider=provider, model=model)
+    if error:
+        metrics.inc("llm_request_errors_total", provider=provider, model=model)
+    if prompt_tokens:
+        metrics.inc("llm_tokens_total", prompt_tokens, provider=provider, model=model, kind="prompt")
+    if output_tokens:
+        metrics.inc("llm_tokens_total", output_tokens, provider=provider, model=model, kind="output")
+
+    run = _current_run.get()
+    if run:
+        run.llm.append(seconds)
+        run.llm_errors += error
+        run.tokens["prompt"] += prompt_tokens
+        run.tokens["output"] += output_tokens
+
+
+def record_run(status: str, seconds: float):
+    metrics.inc("pipeline_runs_total", status=status)
+    metrics.observe("pipeline_run_duration_seconds", seconds)
+
+
+def _db_table(url: httpx.URL) -> str:
+    """"collected_items" or "rpc/update_quality_scores" from a PostgREST URL"""
+    path = url.path
+    marker = "/rest/v1/"
+    return path.split(marker, 1)[1] if marker in path else path
+
+
+def record_db(table: str, method: str, seconds: float, error: bool = False):
+    """One DB round trip, over PostgREST or the direct Postgres pool"""
+    metrics.observe("db_request_duration_seconds", seconds, table=table, method=method)
+    if error:
+        metrics.inc("db_request_errors_total", table=table, method=method)
+
+    run = _current_run.get()
+    if run:
+        run.db[table].append(seconds)
+        run.db_errors += error
+
+
+def record_http(host: str, seconds: float, error: bool = False):
+    """One outbound request to `host`"""
+    metrics.observe("http_client_request_duration_seconds", seconds, host=host)
+    if error:
+        metrics.inc("http_client_request_errors_total", host=host)
+
+    run = _current_run.get()
+    if run:
+        run.http[host].append(seconds)
+        run.http_errors += error
+
+
+def _record_db_request(request: httpx.Request, seconds: float, error: bool):
+    record_db(_db_table(request.url), request.method, seconds, error)
+
+
+def _record_http_request(request: httpx.Request, seconds: float, error: bool):
+    record_http(urlparse(str(request.url)).hostname or "", seconds, error)
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """
+    Times each round trip of the wrapped transport to response headers.
+    Responses with status >= 400 count as errors, and so do timeouts,
+    resets and other transport failures, which never produce a response.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        record: Callable[[httpx.Request, float, bool], None],
+    ):
+        self._transport = transport
+        self._record = record
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._record(request, time.perf_counter() - started, True)
+            raise
+        self._record(request, time.perf_counter() - started, response.status_code >= 400)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def db_transport(**options) -> MeteredTransport:
+    """AsyncHTTPTransport(**options) timing each Supabase REST round trip"""
+    return MeteredTransport(httpx.AsyncHTTPTransport(**options), _record_db_request)
+
+
+def http_transport(**options) -> MeteredTransport:
+    """AsyncHTTPTransport(**options) timing each outbound request"""
+    return MeteredTransport(httpx.AsyncHTTPTransport(**options), _record_http_request)
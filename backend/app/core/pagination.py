@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Type
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.repositories import Cursor, Repository
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode()).decode()
+
+
+def decode_cursor(cursor: str, repository: Repository) -> Cursor:
+    """A cursor from encode_cursor, checked against the repository's keyset types"""
+    try:
+        value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return repository.parse_cursor(value, key)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+class Page:
+    """One page request; pass `query` to the repository's list() and its rows to respond()"""
+
+    def __init__(
+        self,
+        repository: Repository,
+        response: Response,
+        columns: str,
+        after: Cursor | None,
+        limit: int | None,
+        projected: bool,
+    ):
+        self.repository = repository
+        self.response = response
+        self.columns = columns
+        self.after = after
+        self.limit = limit
+        self.projected = projected
+
+    @property
+    def query(self) -> Dict[str, Any]:
+        # One row past the page tells whether another page follows
+        limit = self.limit + 1 if self.limit is not None else None
+        return {"columns": self.columns, "after": self.after, "limit": limit}
+
+    def respond(self, rows: List[Dict[str, Any]]):
+        headers = {}
+        if self.limit is not None and len(rows) > self.limit:
+            rows = rows[:self.limit]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(self.repository.cursor_of(rows[-1]))
+
+        if self.projected:
+            # Partial rows would fail the endpoint's response model
+            return JSONResponse(rows, headers=headers)
+
+        self.response.headers.update(headers)
+        return rows
+
+
+class Paginated:
+    """
+    Dependency adding keyset pagination and field projection to a list
+    endpoint over a `repository_class` table:
+
+        @router.get("", response_model=List[ActionResponse])
+        async def list_actions(actions: Actions, page: Page = Depends(Paginated(ActionRepository, ActionResponse))):
+            return page.respond(await actions.list(**page.query))
+
+    Rows come in the repository's (order_column, key) order, `limit` at a
+    time. The X-Next-Cursor response header is passed back as `cursor` for
+    the next page. Without `limit`, the endpoint's `default_limit` applies;
+    None returns every row, as the list endpoints did before paging.
+    `fields` picks columns of `model`; the keyset columns are always
+    included.
+    """
+
+    def __init__(self, repository_class: Type[Repository], model: Type[BaseModel], default_limit: int | None = None):
+        # Only the keyset settings are used, so no client is needed
+        self.repository = repository_class()
+        self.fields = set(model.model_fields)
+        self.default_limit = default_limit
+
+    def __call__(
+        self,
+        response: Response,
+        cursor: str | None = Query(None, description=f"{NEXT_CURSOR_HEADER} of the previous page"),
+        limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        fields: str | None = Query(None, description="Comma-separated fields to return"),
+    ) -> Page:
+        columns = "*"
+        if fields is not None:
+            requested = [field.strip() for field in fields.split(",") if field.strip()]
+            unknown = sorted(set(requested) - self.fields)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+            keyset = [self.repository.order_column, self.repository.key]
+            columns = ",".join(dict.fromkeys(requested + keyset))
+
+        return Page(
+            self.repository,
+            response,
+            columns,
+            decode_cursor(cursor, self.repository) if cursor else None,
+            limit or self.default_limit,
+            projected=fields is not None,
+        )
@@ -0,0 +1,144 @@
+import functools
+import io
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+
+from app.core.config import get_settings
+from app.core.metrics import record_db
+
+try:
+    import asyncpg
+
+    ASYNCPG_AVAILABLE = True
+except ImportError:  # only needed for db_bulk_backend = "asyncpg"
+    asyncpg = None
+    ASYNCPG_AVAILABLE = False
+
+
+_pool: "asyncpg.Pool | None" = None
+_json_dumps = functools.partial(json.dumps, default=str)
+
+
+def bulk_enabled() -> bool:
+    """Whether bulk writes go straight to Postgres instead of through PostgREST"""
+    return get_settings().db_bulk_backend == "asyncpg"
+
+
+async def _init_connection(conn):
+    # JSON columns as dicts and lists, like PostgREST returns them
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=_json_dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def get_pg_pool() -> "asyncpg.Pool":
+    """
+    Process-wide asyncpg pool on settings.database_url, used by the
+    repositories for bulk writes when db_bulk_backend is "asyncpg".
+    Closed by close_pg_pool() on shutdown.
+    """
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        if not ASYNCPG_AVAILABLE:
+            raise RuntimeError('db_bulk_backend "asyncpg" needs the asyncpg package')
+        if not settings.database_url:
+            raise RuntimeError('db_bulk_backend "asyncpg" needs database_url')
+        _pool = await asyncpg.create_pool(
+            settings.database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            command_timeout=settings.database_timeout,
+            init=_init_connection,
+            # Transaction-mode poolers (Supabase's port 6543) can't keep
+            # prepared statements across transactions
+            statement_cache_size=0,
+        )
+    return _pool
+
+
+async def close_pg_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def connection(table: str, method: str) -> AsyncIterator["asyncpg.Connection"]:
+    """
+    Pooled connection inside a transaction, timed into the DB metrics as
+    one round trip on `table` (labelled like the PostgREST ones).
+    """
+    pool = await get_pg_pool()
+    started = time.perf_counter()
+    error = False
+    try:
+        async with pool.acquire() as conn, conn.transaction():
+            yield conn
+    except Exception:
+        error = True
+        raise
+    finally:
+        record_db(table, method, time.perf_counter() - started, error)
+
+
+def ident(name: str) -> str:
+    """Quoted SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def columns_of(rows: List[Dict[str, Any]]) -> List[str]:
+    """Every key used by any row, in first-seen order"""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        text = "t" if value else "f"
+    elif isinstance(value, (dict, list)):
+        text = _json_dumps(value)
+    else:
+        text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_text(rows: List[Dict[str, Any]], columns: List[str]) -> io.BytesIO:
+    """
+    Rows as a COPY text format stream for Connection.copy_to_table.
+    Postgres parses every value from text, so ISO timestamps and JSON
+    columns need no client-side type mapping.
+    """
+    lines = ("\t".join(_copy_value(row.get(column)) for column in columns) for row in rows)
+    return io.BytesIO("".join(line + "\n" for line in lines).encode())
+
+
+async def insert_rows(table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Insert rows in one statement and return them as JSON dicts.
+
+    The rows are sent as one JSONB parameter and expanded server-side with
+    jsonb_populate_recordset, so each value gets its column's type. Keys
+    missing from a row are inserted as NULL, as PostgREST does for
+    multi-row inserts.
+    """
+    if not rows:
+        return []
+
+    columns = ", ".join(ident(column) for column in columns_of(rows))
+    sql = (
+        f"INSERT INTO {ident(table)} ({columns}) "
+        f"SELECT {columns} FROM jsonb_populate_recordset(NULL::{ident(table)}, $1::jsonb) "
+        f"RETURNING to_jsonb({ident(table)})"
+    )
+    async with connection(table, "INSERT") as conn:
+        records = await conn.fetch(sql, rows)
+    return [record[0] for record in records]
@@ -0,0 +1,42 @@
+from typing import Any, AsyncIterator, Dict
+import json
+
+from fastapi.responses import StreamingResponse
+
+# Disable proxy buffering (nginx) so events reach the client as they are sent
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+# Comment line that keeps idle connections from being closed by proxies
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+
+def format_sse(data: Any, event: str | None = None, event_id: str | int | None = None) -> str:
+    """Encode one Server-Sent Event; `data` is sent as JSON"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    lines.extend(f"data: {line}" for line in payload.splitlines())
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_response(events: AsyncIterator[Dict[str, Any] | None]) -> StreamingResponse:
+    """
+    Stream event dicts as text/event-stream.
+
+    Each dict's "event" and "id" keys become the SSE event name and ID and
+    the whole dict is sent as data. None sends a keepalive comment.
+    """
+    async def body():
+        async for event in events:
+            if event is None:
+                yield SSE_KEEPALIVE
+            else:
+                yield format_sse(event, event=event.get("event"), event_id=event.get("id"))
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -2,22 +2,37 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import get_settings
+from app.core.database import close_supabase_clients
+from app.core.http import close_http_client
+from app.core.loop_monitor import loop_monitor
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.postgres import close_pg_pool
+from app.core.metrics import metrics
 from app.api.v1 import router as api_v1_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
+    loop_monitor.start()
     if settings.scheduler_enabled:
-        from app.services.scheduler import start_scheduler, shutdown_scheduler
+        from app.services.scheduler import start_scheduler
 
         start_scheduler()
-        yield
+
+    yield
+
+    if settings.scheduler_enabled:
+        from app.services.scheduler import shutdown_scheduler
+
         shutdown_scheduler()
-    else:
-        yield
+    await close_http_client()
+    await close_supabase_clients()
+    await close_pg_pool()
+    await loop_monitor.stop()
 
 
 def create_app() -> FastAPI:
@@ -35,13 +50,23 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     app.include_router(api_v1_router, prefix="/api/v1")
 
     @app.get("/health")
     async def health_check():
-        return {"status": "healthy", "app": settings.app_name}
+        return {
+            "status": "healthy",
+            "app": settings.app_name,
+            "loop_lag": loop_monitor.snapshot(),
+        }
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def prometheus_metrics():
+        """Process-wide pipeline, DB, HTTP and LLM metrics in Prometheus text format"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
     return app
 
@@ -0,0 +1,26 @@
+# Repositories
+# Async table access over the shared async Supabase client
+
+from app.repositories.agendas import AgendaRepository
+from app.repositories.base import Cursor, Repository
+from app.repositories.collected_items import CollectedItemRepository
+from app.repositories.conversations import ConversationRepository
+from app.repositories.pipeline_runs import PipelineRunRepository
+from app.repositories.principles import PrincipleRepository, StackRepository
+from app.repositories.reports import ActionRepository, FeedbackRepository, ReportRepository
+from app.repositories.sources import SourceRepository
+
+__all__ = [
+    "ActionRepository",
+    "AgendaRepository",
+    "CollectedItemRepository",
+    "ConversationRepository",
+    "Cursor",
+    "FeedbackRepository",
+    "PipelineRunRepository",
+    "PrincipleRepository",
+    "ReportRepository",
+    "Repository",
+    "SourceRepository",
+    "StackRepository",
+]
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from app.repositories.base import Cursor, Repository
+
+
+class AgendaRepository(Repository):
+    table = "agendas"
+
+    async def list(
+        self,
+        active_only: bool = False,
+        columns: str = "*",
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest first"""
+        query = self.select(columns)
+        if active_only:
+            query = query.eq("is_active", True)
+        result = await self.ordered(query, after, limit).execute()
+        return result.data
+
+    async def get_by_name(self, name: str) -> Dict[str, Any] | None:
+        result = await self.select().eq("name", name).limit(1).execute()
+        return result.data[0] if result.data else None
@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+import math
+import uuid
+
+from supabase import AsyncClient
+
+from app.core import postgres
+from app.core.database import get_async_supabase_client
+
+# (order_column value, key) of the last row of a page
+Cursor = Tuple[Any, str]
+
+
+def _cursor_part(kind: type, value: Any) -> Any:
+    """`value` checked as a `kind` column value, in the form filters expect"""
+    if kind is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"Expected a number, got {value!r}")
+        return float(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Expected a string, got {value!r}")
+    if kind is datetime:
+        return datetime.fromisoformat(value).isoformat()
+    if kind is uuid.UUID:
+        return str(uuid.UUID(value))
+    return value
+
+
+def _quoted(value: Any) -> str:
+    """Filter value as a PostgREST double-quoted string"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class Repository:
+    """
+    Async access to one table through the shared async Supabase client.
+
+    Every query is awaited, so it yields the event loop while the round trip
+    is in flight and independent queries can be overlapped with
+    asyncio.gather. Subclasses set `table` (and `key` when rows are not
+    addressed by "id") and add the queries their callers need; list
+    queries go through ordered() so they can be paged by cursor.
+    """
+
+    table: str
+    key: str = "id"
+    # list() returns rows by (order_column, key) descending, which is also
+    # the keyset that pages through them; the types check client cursors
+    order_column: str = "created_at"
+    order_type: type = datetime
+    key_type: type = uuid.UUID
+
+    def __init__(self, client: AsyncClient | None = None):
+        self._client = client
+
+    @property
+    def client(self) -> AsyncClient:
+        # Resolved per call so a repository outlives a client restart
+        return self._client or get_async_supabase_client()
+
+    def select(self, columns: str = "*"):
+        return self.client.table(self.table).select(columns)
+
+    def ordered(self, query, after: Cursor | None = None, limit: int | None = None):
+        """Order `query` by (order_column, key) descending, starting after the `after` row"""
+        column = self.order_column
+        if after:
+            value, key = after
+            # NULL order values sort first, so after a NULL come the other
+            # NULLs and then every non-NULL row; after a value, no NULLs
+            if value is None:
+                query = query.or_(
+                    f"and({column}.is.null,{self.key}.lt.{_quoted(key)}),{column}.not.is.null"
+                )
+            else:
+                query = query.or_(
+                    f"{column}.lt.{_quoted(value)},"
+                    f"and({column}.eq.{_quoted(value)},{self.key}.lt.{_quoted(key)})"
+                )
+        query = query.order(column, desc=True, nullsfirst=True).order(self.key, desc=True)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def cursor_of(self, row: Dict[str, Any]) -> Cursor:
+        return row[self.order_column], row[self.key]
+
+    def parse_cursor(self, value: Any, key: Any) -> Cursor:
+        """
+        A client-supplied cursor checked against order_type and key_type.
+        Raises ValueError when it doesn't fit them.
+        """
+        if value is not None:
+            value = _cursor_part(self.order_type, value)
+        return value, _cursor_part(self.key_type, key)
+
+    async def get(self, key: str, columns: str = "*") -> Dict[str, Any] | None:
+        result = await self.select(columns).eq(self.key, key).limit(1).execute()
+        return result.data[0] if result.data else None
+
+    async def get_many(self, keys: List[str], columns: str = "*") -> List[Dict[str, Any]]:
+        if not keys:
+            return []
+        result = await self.select(columns).in_(self.key, keys).execute()
+        return result.data
+
+    async def insert(self, row: Dict[str, Any]) -> Dict[str, Any] | None:
+        result = await self.client.table(self.table).insert(row).execute()
+        return result.data[0] if result.data else None
+
+    async def insert_many(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        if postgres.bulk_enabled():
+            return await postgres.insert_rows(self.table, rows)
+        result = await self.client.table(self.table).insert(rows).execute()
+        return result.data
+
+    async def update(self, key: str, data: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Updated row, or None when no row has that key"""
+        result = await self.client.table(self.table).update(data).eq(self.key, key).execute()
+        return result.data[0] if result.data else None
+
+    async def delete(self, key: str) -> bool:
+        """Whether a row was deleted"""
+        result = await self.client.table(self.table).delete().eq(self.key, key).execute()
+        return bool(result.data)
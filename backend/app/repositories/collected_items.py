@@ -0,0 +1,210 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.core import postgres
+from app.repositories.base import Repository
+
+
+class CollectedItemRepository(Repository):
+    table = "collected_items"
+
+    async def list_for_source(self, source_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        result = await (
+            self.select()
+            .eq("source_id", source_id)
+            .order("collected_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return result.data
+
+    async def insert_new(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert rows, skipping any whose (source_id, external_id) exists.
+        Returns only the newly inserted rows.
+        """
+        if not rows:
+            return []
+        if postgres.bulk_enabled():
+            return await self._copy_new(rows)
+        result = await self.client.table(self.table).upsert(
+            rows,
+            on_conflict="source_id,external_id",
+            ignore_duplicates=True,
+        ).execute()
+        return result.data
+
+    async def _copy_new(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """insert_new as a COPY into a staging table and one INSERT ... ON CONFLICT"""
+        columns = postgres.columns_of(rows)
+        column_list = ", ".join(postgres.ident(column) for column in columns)
+        async with postgres.connection(self.table, "COPY") as conn:
+            # Same column types, none of the constraints
+            await conn.execute(
+                "CREATE TEMP TABLE collected_items_staging ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM collected_items WITH NO DATA"
+            )
+            await conn.copy_to_table(
+                "collected_items_staging",
+                source=postgres.copy_text(rows, columns),
+                columns=columns,
+            )
+            records = await conn.fetch(
+                f"INSERT INTO collected_items ({column_list}) "
+                f"SELECT {column_list} FROM collected_items_staging "
+                "ON CONFLICT (source_id, external_id) DO NOTHING "
+                "RETURNING to_jsonb(collected_items)"
+            )
+        return [record[0] for record in records]
+
+    async def list_unscored(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """Newest items without a quality score"""
+        result = await (
+            self.select()
+            .is_("quality_score", "null")
+            .order("collected_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return result.data
+
+    async def list_unprocessed(self, source_ids: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Newest unprocessed items of the given sources that passed the quality filter"""
+        if not source_ids:
+            return []
+        result = await (
+            self.select()
+            .in_("source_id", source_ids)
+            .is_("processed_at", "null")
+            .eq("filtered_out", False)
+            .order("collected_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return result.data
+
+    async def list_since(self, collected_after: str, limit: int = 100) -> List[Dict[str, Any]]:
+        result = await (
+            self.select()
+            .gte("collected_at", collected_after)
+            .order("collected_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return result.data
+
+    async def page_after(
+        self, after_seq: int | None, size: int, columns: str = "*"
+    ) -> List[Dict[str, Any]]:
+        """Items saved after the one with ingest_seq `after_seq`, in save order, `size` at a time"""
+        query = self.select(columns).order("ingest_seq").limit(size)
+        if after_seq is not None:
+            query = query.gt("ingest_seq", after_seq)
+        result = await query.execute()
+        return result.data
+
+    async def mark_processed(self, verdicts: Dict[str, str | None]):
+        """
+        Set processed_at and the analyzer verdict on items (id -> verdict):
+        one UNNEST update straight to Postgres, or one request per distinct verdict
+        """
+        if not verdicts:
+            return
+        if postgres.bulk_enabled():
+            async with postgres.connection(self.table, "PATCH") as conn:
+                await conn.execute(
+                    "UPDATE collected_items AS c "
+                    "SET processed_at = now(), verdict = u.verdict "
+                    "FROM UNNEST($1::uuid[], $2::text[]) AS u(id, verdict) "
+                    "WHERE c.id = u.id",
+                    list(verdicts),
+                    list(verdicts.values()),
+                )
+            return
+
+        by_verdict: Dict[str | None, List[str]] = defaultdict(list)
+        for item_id, verdict in verdicts.items():
+            by_verdict[verdict].append(item_id)
+        processed_at = datetime.now().isoformat()
+        await asyncio.gather(*(
+            self.client.table(self.table).update({
+                "processed_at": processed_at,
+                "verdict": verdict,
+            }).in_("id", item_ids).execute()
+            for verdict, item_ids in by_verdict.items()
+        ))
+
+    async def reprocess(
+        self,
+        source_ids: List[str] | None = None,
+        agenda_id: str | None = None,
+        collected_after: str | None = None,
+        collected_before: str | None = None,
+        verdicts: List[str] | None = None,
+        min_quality: float | None = None,
+        max_quality: float | None = None,
+        limit: int | None = None,
+        dry_run: bool = False,
+    ) -> int:
+        """
+        Clear processed_at on up to `limit` processed, unfiltered items
+        matching every given filter, newest first, in one statement
+        (reprocess_items RPC). Returns how many were reset, or with
+        dry_run how many would be.
+        """
+        params = {
+            "filter_source_ids": source_ids,
+            "filter_agenda_id": agenda_id,
+            "collected_after": collected_after,
+            "collected_before": collected_before,
+            "filter_verdicts": verdicts,
+            "min_quality": min_quality,
+            "max_quality": max_quality,
+            "max_items": limit,
+            "dry_run": dry_run,
+        }
+        if postgres.bulk_enabled():
+            async with postgres.connection("rpc/reprocess_items", "POST") as conn:
+                return await conn.fetchval(
+                    "SELECT reprocess_items($1::uuid[], $2::uuid, $3::text::timestamptz, "
+                    "$4::text::timestamptz, $5::text[], $6, $7, $8, $9)",
+                    *params.values(),
+                )
+
+        result = await self.client.rpc("reprocess_items", params).execute()
+        return result.data
+
+    async def update_quality_scores(self, updates: List[Dict[str, Any]]):
+        """
+        Bulk update (id, quality_score, quality_breakdown, filtered_out): one
+        update_quality_scores RPC call, or one UNNEST update straight to Postgres
+        """
+        if not postgres.bulk_enabled():
+            await self.client.rpc("update_quality_scores", {"updates": updates}).execute()
+            return
+
+        async with postgres.connection(self.table, "PATCH") as conn:
+            await conn.execute(
+                "UPDATE collected_items AS c "
+                "SET quality_score = u.quality_score, "
+                "    quality_breakdown = u.quality_breakdown::jsonb, "
+                "    filtered_out = u.filtered_out "
+                "FROM UNNEST($1::uuid[], $2::float8[], $3::text[], $4::boolean[]) "
+                "  AS u(id, quality_score, quality_breakdown, filtered_out) "
+                "WHERE c.id = u.id",
+                [update["id"] for update in updates],
+                [update["quality_score"] for update in updates],
+                [json.dumps(update["quality_breakdown"]) for update in updates],
+                [update["filtered_out"] for update in updates],
+            )
+
+    async def search(self, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Ranked full-text matches (search_collected_items RPC)"""
+        result = await self.client.rpc(
+            "search_collected_items",
+            {"search_terms": terms, "match_limit": limit},
+        ).execute()
+        return result.data
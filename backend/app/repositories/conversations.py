@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from app.repositories.base import Cursor, Repository
+
+
+class ConversationRepository(Repository):
+    table = "conversations"
+    order_column = "imported_at"
+
+    async def list(
+        self,
+        platform: str | None = None,
+        ids: List[str] | None = None,
+        limit: int | None = None,
+        columns: str = "*",
+        after: Cursor | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Most recently imported first"""
+        query = self.select(columns)
+        if platform:
+            query = query.eq("platform", platform)
+        if ids:
+            query = query.in_("id", ids)
+        result = await self.ordered(query, after, limit).execute()
+        return result.data
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+
+from app.repositories.base import Repository
+
+
+class PipelineRunRepository(Repository):
+    table = "pipeline_runs"
+    order_column = "started_at"
+
+    async def save(self, row: Dict[str, Any]):
+        """Insert or replace a run by id"""
+        await self.client.table(self.table).upsert(row).execute()
+
+    async def list(
+        self,
+        agenda_id: str | None = None,
+        success: bool | None = None,
+        columns: str = "*",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Newest first"""
+        query = self.select(columns)
+        if agenda_id:
+            query = query.eq("agenda_id", agenda_id)
+        if success is not None:
+            query = query.eq("success", success)
+        result = await self.ordered(query).range(offset, offset + limit - 1).execute()
+        return result.data
+
+    async def stats(self, since: str, bucket: str) -> List[Dict[str, Any]]:
+        """pipeline_run_stats RPC rows; one row for bucket "all\""""
+        result = await self.client.rpc("pipeline_run_stats", {"since": since, "bucket": bucket}).execute()
+        return result.data
@@ -0,0 +1,50 @@
+from typing import Any, Dict, List
+
+from app.repositories.base import Cursor, Repository
+
+
+class PrincipleRepository(Repository):
+    table = "principles"
+    order_column = "confidence_score"
+    order_type = float
+
+    async def list(
+        self,
+        category: str | None = None,
+        active_only: bool = False,
+        max_confidence: float | None = None,
+        limit: int | None = None,
+        columns: str = "*",
+        after: Cursor | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Most confident first; max_confidence keeps those below it"""
+        query = self.select(columns)
+        if category:
+            query = query.eq("category", category)
+        if active_only:
+            query = query.eq("is_active", True)
+        if max_confidence is not None:
+            query = query.lt("confidence_score", max_confidence)
+        result = await self.ordered(query, after, limit).execute()
+        return result.data
+
+    async def list_evidences(self, principle_id: str) -> List[Dict[str, Any]]:
+        result = await (
+            self.client.table("principle_evidences")
+            .select("*")
+            .eq("principle_id", principle_id)
+            .execute()
+        )
+        return result.data
+
+
+class StackRepository(Repository):
+    """user_stack rows, one per category"""
+
+    table = "user_stack"
+    key = "category"
+    key_type = str
+
+    async def list(self, columns: str = "*") -> List[Dict[str, Any]]:
+        result = await self.select(columns).order("category").execute()
+        return result.data
@@ -0,0 +1,67 @@
+from typing import Any, Dict, List
+
+from app.repositories.base import Cursor, Repository
+
+
+class ReportRepository(Repository):
+    table = "reports"
+
+    async def list(
+        self,
+        agenda_id: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+        columns: str = "*",
+        after: Cursor | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest first"""
+        query = self.select(columns)
+        if agenda_id:
+            query = query.eq("agenda_id", agenda_id)
+        if status:
+            query = query.eq("status", status)
+        result = await self.ordered(query, after, limit).execute()
+        return result.data
+
+
+class ActionRepository(Repository):
+    table = "actions"
+
+    async def list(
+        self,
+        status: str | None = None,
+        priority: str | None = None,
+        report_id: str | None = None,
+        columns: str = "*",
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest first"""
+        query = self.select(columns)
+        if status:
+            query = query.eq("status", status)
+        if priority:
+            query = query.eq("priority", priority)
+        if report_id:
+            query = query.eq("report_id", report_id)
+        result = await self.ordered(query, after, limit).execute()
+        return result.data
+
+    async def list_pending(self) -> List[Dict[str, Any]]:
+        """Pending actions, highest priority first"""
+        result = await (
+            self.select()
+            .eq("status", "pending")
+            .order("priority", desc=True)
+            .order("created_at", desc=True)
+            .execute()
+        )
+        return result.data
+
+
+class FeedbackRepository(Repository):
+    table = "feedback"
+
+    async def list(self) -> List[Dict[str, Any]]:
+        result = await self.select().execute()
+        return result.data
@@ -0,0 +1,43 @@
+from typing import Any, Dict, List
+
+from app.repositories.base import Cursor, Repository
+
+
+class SourceRepository(Repository):
+    table = "sources"
+
+    async def list(
+        self,
+        agenda_id: str | None = None,
+        active_only: bool = False,
+        due_before: str | None = None,
+        columns: str = "*",
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest first, optionally only those whose next_poll_at is unset or not after `due_before`"""
+        query = self.select(columns)
+        if agenda_id:
+            query = query.eq("agenda_id", agenda_id)
+        if active_only:
+            query = query.eq("is_active", True)
+        if due_before:
+            query = query.or_(f"next_poll_at.is.null,next_poll_at.lte.{due_before}")
+        result = await self.ordered(query, after, limit).execute()
+        return result.data
+
+    async def update_many(self, updates: List[Dict[str, Any]]):
+        """
+        Collection state of many existing sources in one update_sources RPC
+        call; each update is {id, ...} with only the columns to change
+        """
+        if updates:
+            await self.client.rpc("update_sources", {"updates": updates}).execute()
+
+    async def publish_stats(self, since: str) -> Dict[str, int]:
+        """
+        Items per source published since `since` or since the source was
+        added, whichever is later (source_publish_stats RPC)
+        """
+        result = await self.client.rpc("source_publish_stats", {"since": since}).execute()
+        return {row["source_id"]: row["item_count"] for row in result.data}
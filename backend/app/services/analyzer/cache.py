@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Tuple
+
+from app.core.config import get_settings
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend (lost on restart)"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # LLMCache calls backends from worker threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCacheBackend:
+    """On-disk backend: TTL on write time, least-recently-read eviction"""
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)"
+            )
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+_scope_stats: ContextVar[Dict[str, int] | None] = ContextVar("llm_cache_stats", default=None)
+
+
+@contextmanager
+def cache_stats_scope() -> Iterator[Dict[str, int]]:
+    """
+    Count the cache hits and misses of lookups made inside the block.
+
+    Tasks created inside the block inherit the counters, so a run's
+    concurrent workers all count into them, and concurrent runs with
+    their own scopes don't mix.
+    """
+    stats = {"hits": 0, "misses": 0}
+    token = _scope_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _scope_stats.reset(token)
+
+
+class LLMCache:
+    """
+    Content-addressed cache for parsed LLM responses.
+
+    Keys hash the model name, the prompt template and its version, and the
+    call inputs, so any change to one of them is a miss. Backend I/O runs in
+    a worker thread to keep the event loop free. With no backend every
+    lookup is a miss. Hits and misses are counted per cache_stats_scope.
+    """
+
+    def __init__(self, backend: MemoryCacheBackend | SQLiteCacheBackend | None):
+        self.backend = backend
+
+    @staticmethod
+    def make_key(model: str, template: str, version: str, inputs: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            [model, template, version, inputs],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Any | None:
+        value = await asyncio.to_thread(self.backend.get, key) if self.backend else None
+        stats = _scope_stats.get()
+        if stats is not None:
+            stats["misses" if value is None else "hits"] += 1
+        return None if value is None else json.loads(value)
+
+    async def set(self, key: str, value: Any):
+        if self.backend:
+            await asyncio.to_thread(self.backend.set, key, json.dumps(value, ensure_ascii=False))
+
+
+_llm_cache: LLMCache | None = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide LLM cache built from settings.llm_cache_*"""
+    global _llm_cache
+    if _llm_cache is None:
+        settings = get_settings()
+        ttl_seconds = settings.llm_cache_ttl_hours * 3600
+        if settings.llm_cache_backend == "sqlite":
+            backend = SQLiteCacheBackend(
+                settings.llm_cache_path, ttl_seconds, settings.llm_cache_max_entries
+            )
+        elif settings.llm_cache_backend == "memory":
+            backend = MemoryCacheBackend(ttl_seconds, settings.llm_cache_max_entries)
+        else:
+            backend = None
+        _llm_cache = LLMCache(backend)
+    return _llm_cache
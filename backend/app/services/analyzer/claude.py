@@ -1,7 +1,9 @@
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from typing import Dict, Any, List
 from app.core.config import get_settings
+from app.core.metrics import record_llm
 import json
+import time
 
 
 class ClaudeAnalyzer:
@@ -9,7 +11,7 @@ class ClaudeAnalyzer:
 
     def __init__(self):
         settings = get_settings()
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
         self.model = "claude-sonnet-4-20250514"
 
     async def analyze(
@@ -30,7 +32,19 @@ class ClaudeAnalyzer:
         if system_prompt:
             kwargs["system"] = system_prompt
 
-        response = self.client.messages.create(**kwargs)
+        started = time.perf_counter()
+        try:
+            response = await self.client.messages.create(**kwargs)
+        except Exception:
+            record_llm("anthropic", self.model, time.perf_counter() - started, error=True)
+            raise
+        record_llm(
+            "anthropic",
+            self.model,
+            time.perf_counter() - started,
+            prompt_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+        )
         return response.content[0].text
 
     async def analyze_new_tool(
@@ -1,7 +1,82 @@
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from typing import Dict, Any, List
 from app.core.config import get_settings
+from app.core.metrics import record_llm
+from app.services.analyzer.cache import get_llm_cache
+from app.services.analyzer.ratelimit import get_gemini_rate_limiter
+import asyncio
 import json
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# 429 (quota) and 5xx responses are retried with exponential backoff
+RETRYABLE_ERRORS = (google_exceptions.TooManyRequests, google_exceptions.ServerError)
+
+# Bump a template's version whenever its prompt changes so cached
+# responses for the old prompt stop matching. analyze_new_tools_batch
+# caches each item under analyze_new_tool, so it bumps that one.
+PROMPT_VERSIONS = {
+    "analyze_new_tool": "1",
+    "compare_with_current_stack": "1",
+    "summarize_trends": "1",
+}
+
+
+def record_gemini_usage(model_name: str, started: float, response: Any):
+    """Record a successful Gemini call's latency and token counts"""
+    usage = getattr(response, "usage_metadata", None)
+    record_llm(
+        "gemini",
+        model_name,
+        time.perf_counter() - started,
+        prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+        output_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+    )
+
+
+# Rough prompt size estimate; Korean text runs close to one token per char
+CHARS_PER_TOKEN = 3
+
+# Output schema for one analyze_new_tool result (shared by the batch prompt)
+NEW_TOOL_SCHEMA = '''{
+  "summary": "한 문장 요약 (한국어)",
+  "verdict": "ADOPT | CONSIDER | SKIP",
+  "confidence": 0.0-1.0,
+
+  "difference_from_current": {
+    "what_changes": "현재 도구 → 새 도구 변경 요약",
+    "breaking_changes": ["호환 안되는 변경사항"],
+    "compatible": ["그대로 사용 가능한 것들"]
+  },
+
+  "benefits_if_adopted": [
+    {"benefit": "이점 이름", "impact": "HIGH|MEDIUM|LOW", "why": "왜 이점인지"}
+  ],
+
+  "migration_guide": {
+    "estimated_time": "예상 소요 시간 (예: 30분)",
+    "difficulty": "EASY | MEDIUM | HARD",
+    "steps": [
+      {"step": 1, "action": "실행할 명령어/행동", "note": "참고사항"}
+    ],
+    "rollback": "문제 시 원복 방법"
+  },
+
+  "usage_guide": {
+    "getting_started": ["시작하기 단계들"],
+    "key_features": ["핵심 기능 사용법"],
+    "tips": ["활용 팁"]
+  },
+
+  "decision_factors": {
+    "adopt_if": ["이런 경우 채택하세요"],
+    "skip_if": ["이런 경우 스킵하세요"]
+  }
+}'''
 
 
 class GeminiAnalyzer:
@@ -10,7 +85,16 @@ class GeminiAnalyzer:
     def __init__(self):
         settings = get_settings()
         genai.configure(api_key=settings.gemini_api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        self.model_name = "gemini-2.0-flash"
+        self.model = genai.GenerativeModel(self.model_name)
+        self.cache = get_llm_cache()
+        self.rate_limiter = get_gemini_rate_limiter()
+        self.max_retries = settings.llm_max_retries
+        self.retry_base_delay = settings.llm_retry_base_delay
+        self.batch_max_items = settings.llm_batch_max_items
+        self.batch_input_token_budget = settings.llm_batch_input_token_budget
+        self.batch_output_token_budget = settings.llm_batch_output_token_budget
+        self.output_tokens_per_item = settings.llm_batch_output_tokens_per_item
 
     async def analyze(
         self,
@@ -18,18 +102,78 @@ class GeminiAnalyzer:
         system_prompt: str | None = None,
         max_tokens: int = 4000,
     ) -> str:
-        """Generic analysis method"""
+        """
+        Generic analysis method.
+
+        Calls are paced by the shared Gemini token bucket and retried with
+        jittered exponential backoff on 429/5xx.
+        """
         full_prompt = prompt
         if system_prompt:
             full_prompt = f"{system_prompt}\n\n{prompt}"
 
-        response = self.model.generate_content(
-            full_prompt,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=max_tokens,
-            ),
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self.model.generate_content_async(
+                    full_prompt,
+                    generation_config=genai.types.GenerationConfig(
+                        max_output_tokens=max_tokens,
+                    ),
+                )
+                record_gemini_usage(self.model_name, started, response)
+                return response.text
+            except RETRYABLE_ERRORS as e:
+                record_llm("gemini", self.model_name, time.perf_counter() - started, error=True)
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_base_delay * 2 ** attempt * (1 + random.random())
+                logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except Exception:
+                record_llm("gemini", self.model_name, time.perf_counter() - started, error=True)
+                raise
+
+    async def _analyze_json(
+        self, template: str, inputs: Dict[str, Any], prompt: str, lookup: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run a JSON prompt through the response cache.
+
+        The cache key covers the model, the template version and the inputs,
+        so unchanged items are answered without calling Gemini. Responses
+        that fail to parse are not cached. lookup=False skips the read for
+        callers that already missed on the same key.
+        """
+        cache_key = self.cache.make_key(
+            self.model_name, template, PROMPT_VERSIONS[template], inputs
         )
-        return response.text
+        if lookup:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self.analyze(prompt)
+        parsed = self._parse_json(result)
+        if not (isinstance(parsed, dict) and parsed.get("parse_error")):
+            await self.cache.set(cache_key, parsed)
+        return parsed
+
+    @staticmethod
+    def _parse_json(result: str) -> Dict[str, Any]:
+        try:
+            # Clean up response - Gemini sometimes wraps JSON in markdown
+            result = result.strip()
+            if result.startswith("```json"):
+                result = result[7:]
+            if result.startswith("```"):
+                result = result[3:]
+            if result.endswith("```"):
+                result = result[:-3]
+            return json.loads(result.strip())
+        except json.JSONDecodeError:
+            return {"raw_response": result, "parse_error": True}
 
     async def analyze_new_tool(
         self,
@@ -38,8 +182,23 @@ class GeminiAnalyzer:
         current_stack: Dict[str, str],
     ) -> Dict[str, Any]:
         """Analyze a new tool against user principles and current stack"""
+        return await self._analyze_json(
+            "analyze_new_tool",
+            {
+                "tool_info": tool_info,
+                "user_principles": user_principles,
+                "current_stack": current_stack,
+            },
+            self._new_tool_prompt(tool_info, user_principles, current_stack),
+        )
 
-        prompt = f'''당신은 AI 코딩 도구 전문 분석가입니다.
+    @staticmethod
+    def _new_tool_prompt(
+        tool_info: Dict[str, Any],
+        user_principles: List[str],
+        current_stack: Dict[str, str],
+    ) -> str:
+        return f'''당신은 AI 코딩 도구 전문 분석가입니다.
 사용자가 이 도구를 채택해야 할지 "판단만 하면 되는" 형태로 분석하세요.
 
 TOOL INFO:
@@ -52,55 +211,125 @@ CURRENT STACK:
 {json.dumps(current_stack, indent=2, ensure_ascii=False)}
 
 다음 JSON 형식으로 분석하세요:
-{{
-  "summary": "한 문장 요약 (한국어)",
-  "verdict": "ADOPT | CONSIDER | SKIP",
-  "confidence": 0.0-1.0,
-
-  "difference_from_current": {{
-    "what_changes": "현재 도구 → 새 도구 변경 요약",
-    "breaking_changes": ["호환 안되는 변경사항"],
-    "compatible": ["그대로 사용 가능한 것들"]
-  }},
-
-  "benefits_if_adopted": [
-    {{"benefit": "이점 이름", "impact": "HIGH|MEDIUM|LOW", "why": "왜 이점인지"}}
-  ],
+{NEW_TOOL_SCHEMA}'''
 
-  "migration_guide": {{
-    "estimated_time": "예상 소요 시간 (예: 30분)",
-    "difficulty": "EASY | MEDIUM | HARD",
-    "steps": [
-      {{"step": 1, "action": "실행할 명령어/행동", "note": "참고사항"}}
-    ],
-    "rollback": "문제 시 원복 방법"
-  }},
+    def plan_batches(
+        self,
+        tool_infos: List[Dict[str, Any]],
+        user_principles: List[str],
+        current_stack: Dict[str, str],
+    ) -> List[List[int]]:
+        """
+        Group tool_infos (by index) into batches for analyze_new_tools_batch.
+
+        A batch is capped at batch_max_items, at what fits in the output
+        token budget, and at what fits in the input token budget once the
+        shared principles/stack section is counted.
+        """
+        shared_tokens = self._estimate_tokens(
+            NEW_TOOL_SCHEMA, user_principles, current_stack
+        )
+        max_items = max(1, min(
+            self.batch_max_items,
+            self.batch_output_token_budget // self.output_tokens_per_item,
+        ))
+
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        batch_tokens = shared_tokens
+        for index, tool_info in enumerate(tool_infos):
+            item_tokens = self._estimate_tokens(tool_info)
+            if batch and (
+                len(batch) >= max_items
+                or batch_tokens + item_tokens > self.batch_input_token_budget
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], shared_tokens
+            batch.append(index)
+            batch_tokens += item_tokens
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _estimate_tokens(*parts: Any) -> int:
+        return sum(
+            len(part if isinstance(part, str) else json.dumps(part, ensure_ascii=False))
+            for part in parts
+        ) // CHARS_PER_TOKEN
+
+    async def analyze_new_tools_batch(
+        self,
+        tool_infos: List[Dict[str, Any]],
+        user_principles: List[str],
+        current_stack: Dict[str, str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several tools in one prompt (see plan_batches for sizing).
+
+        Results come back in input order and are cached under the same keys
+        as analyze_new_tool, so cached items are not re-sent. Any entry that
+        is missing or malformed in the batch response falls back to a single
+        analyze_new_tool call.
+        """
+        inputs = [
+            {
+                "tool_info": tool_info,
+                "user_principles": user_principles,
+                "current_stack": current_stack,
+            }
+            for tool_info in tool_infos
+        ]
+        keys = [
+            self.cache.make_key(
+                self.model_name, "analyze_new_tool", PROMPT_VERSIONS["analyze_new_tool"], item
+            )
+            for item in inputs
+        ]
+        results: List[Dict[str, Any] | None] = [await self.cache.get(key) for key in keys]
+        pending = [index for index, result in enumerate(results) if result is None]
+
+        if len(pending) > 1:
+            tools = [{"index": index, "tool": tool_infos[index]} for index in pending]
+            prompt = f'''당신은 AI 코딩 도구 전문 분석가입니다.
+아래 TOOLS 각각에 대해 사용자가 채택해야 할지 "판단만 하면 되는" 형태로 분석하세요.
+
+TOOLS:
+{json.dumps(tools, indent=2, ensure_ascii=False)}
 
-  "usage_guide": {{
-    "getting_started": ["시작하기 단계들"],
-    "key_features": ["핵심 기능 사용법"],
-    "tips": ["활용 팁"]
-  }},
+USER'S PRINCIPLES:
+{chr(10).join(f"- {p}" for p in user_principles)}
 
-  "decision_factors": {{
-    "adopt_if": ["이런 경우 채택하세요"],
-    "skip_if": ["이런 경우 스킵하세요"]
-  }}
-}}'''
+CURRENT STACK:
+{json.dumps(current_stack, indent=2, ensure_ascii=False)}
 
-        result = await self.analyze(prompt)
-        try:
-            # Clean up response - Gemini sometimes wraps JSON in markdown
-            result = result.strip()
-            if result.startswith("```json"):
-                result = result[7:]
-            if result.startswith("```"):
-                result = result[3:]
-            if result.endswith("```"):
-                result = result[:-3]
-            return json.loads(result.strip())
-        except json.JSONDecodeError:
-            return {"raw_response": result, "parse_error": True}
+각 도구마다 아래 형식의 JSON 객체를 만들고 "index" 필드에 해당 도구의 index를 넣으세요.
+모든 객체를 담은 JSON 배열 하나로만 응답하세요:
+{NEW_TOOL_SCHEMA}'''
+
+            response = self._parse_json(await self.analyze(
+                prompt, max_tokens=self.output_tokens_per_item * len(pending)
+            ))
+            entries = response if isinstance(response, list) else []
+            for entry in entries:
+                index = entry.get("index") if isinstance(entry, dict) else None
+                if index in pending and results[index] is None and "verdict" in entry:
+                    entry = {k: v for k, v in entry.items() if k != "index"}
+                    results[index] = entry
+                    await self.cache.set(keys[index], entry)
+
+        for index in pending:
+            if results[index] is None:
+                # Already counted as a miss above
+                results[index] = await self._analyze_json(
+                    "analyze_new_tool",
+                    inputs[index],
+                    self._new_tool_prompt(tool_infos[index], user_principles, current_stack),
+                    lookup=False,
+                )
+
+        return results
 
     async def compare_with_current_stack(
         self,
@@ -134,18 +363,15 @@ Output as JSON:
   "summary": "recommendation summary in Korean"
 }}'''
 
-        result = await self.analyze(prompt)
-        try:
-            result = result.strip()
-            if result.startswith("```json"):
-                result = result[7:]
-            if result.startswith("```"):
-                result = result[3:]
-            if result.endswith("```"):
-                result = result[:-3]
-            return json.loads(result.strip())
-        except json.JSONDecodeError:
-            return {"raw_response": result, "parse_error": True}
+        return await self._analyze_json(
+            "compare_with_current_stack",
+            {
+                "comparison_item": comparison_item,
+                "current_tool": current_tool,
+                "user_principles": user_principles,
+            },
+            prompt,
+        )
 
     async def summarize_trends(
         self,
@@ -183,15 +409,12 @@ Output as JSON:
   "summary": "Executive summary in Korean (3-5 sentences)"
 }}'''
 
-        result = await self.analyze(prompt)
-        try:
-            result = result.strip()
-            if result.startswith("```json"):
-                result = result[7:]
-            if result.startswith("```"):
-                result = result[3:]
-            if result.endswith("```"):
-                result = result[:-3]
-            return json.loads(result.strip())
-        except json.JSONDecodeError:
-            return {"raw_response": result, "parse_error": True}
+        return await self._analyze_json(
+            "summarize_trends",
+            {
+                "items": items_text,
+                "user_principles": user_principles,
+                "time_period": time_period,
+            },
+            prompt,
+        )
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from app.core.config import get_settings
+
+
+class TokenBucket:
+    """Async token bucket: refills `rate` tokens per second, holds at most `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available and take them (FIFO across waiters)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+_gemini_bucket: TokenBucket | None = None
+
+
+def get_gemini_rate_limiter() -> TokenBucket:
+    """Process-wide bucket matching the Gemini quota (settings.gemini_requests_per_minute)"""
+    global _gemini_bucket
+    if _gemini_bucket is None:
+        settings = get_settings()
+        _gemini_bucket = TokenBucket(
+            rate=settings.gemini_requests_per_minute / 60,
+            capacity=settings.gemini_burst,
+        )
+    return _gemini_bucket
@@ -1,6 +1,16 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 from datetime import datetime
+from urllib.parse import urlparse
+import hashlib
+
+import httpx
+
+from app.core.http import get_http_client, host_slot
+
+
+# Per-source HTTP cache validators, stored as columns on the sources row
+CACHE_VALIDATORS = ("etag", "last_modified", "content_hash")
 
 
 class CollectedItem:
@@ -37,6 +47,8 @@ class AbstractCollector(ABC):
     def __init__(self, source_id: str, config: Dict[str, Any] | None = None):
         self.source_id = source_id
         self.config = config or {}
+        self.validators: Dict[str, str | None] = {}
+        self.not_modified = False
 
     @abstractmethod
     async def collect(self) -> List[CollectedItem]:
@@ -47,3 +59,52 @@ class AbstractCollector(ABC):
     def get_source_type(self) -> str:
         """Return the type of source (rss, web, github, etc.)"""
         pass
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client"""
+        return get_http_client()
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared client, within the per-host connection cap"""
+        async with host_slot(url):
+            return await self.http.get(url, **kwargs)
+
+    async def _conditional_get(self, url: str, **kwargs) -> httpx.Response | None:
+        """
+        GET using the stored validators (If-None-Match / If-Modified-Since).
+
+        Returns None and sets not_modified when the server answers 304 or the
+        body hashes to the stored content_hash. Otherwise refreshes
+        self.validators from the response and returns it.
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        if self.validators.get("etag"):
+            headers["If-None-Match"] = self.validators["etag"]
+        if self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = self.validators["last_modified"]
+
+        response = await self._get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            self.not_modified = True
+            return None
+
+        if response.is_success:
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if content_hash == self.validators.get("content_hash"):
+                self.not_modified = True
+            self.validators = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "content_hash": content_hash,
+            }
+            if self.not_modified:
+                return None
+
+        return response
+
+    def get_host(self) -> str:
+        """Return the host this collector fetches from (used for per-host limits)"""
+        url = getattr(self, "url", None) or ""
+        return urlparse(url).hostname or self.get_source_type()
@@ -1,6 +1,6 @@
-import httpx
 from typing import List, Dict, Any
 from datetime import datetime
+from urllib.parse import urlparse
 
 from app.services.collector.base import AbstractCollector, CollectedItem
 
@@ -21,6 +21,9 @@ class GitHubCollector(AbstractCollector):
     def get_source_type(self) -> str:
         return "github"
 
+    def get_host(self) -> str:
+        return urlparse(self.api_base).hostname
+
     async def collect(self) -> List[CollectedItem]:
         items = []
 
@@ -33,19 +36,18 @@ class GitHubCollector(AbstractCollector):
     async def _fetch_releases(self) -> List[CollectedItem]:
         url = f"{self.api_base}/repos/{self.repo}/releases"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                timeout=30.0,
-                headers={
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "VirtualSelf/1.0",
-                },
-            )
+        response = await self._conditional_get(
+            url,
+            timeout=30.0,
+            headers={
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "VirtualSelf/1.0",
+            },
+        )
 
-            if response.status_code == 404:
-                return []
-            response.raise_for_status()
+        if response is None or response.status_code == 404:
+            return []
+        response.raise_for_status()
 
         releases = response.json()
         items = []
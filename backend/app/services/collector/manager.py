@@ -1,10 +1,20 @@
-from typing import Dict, Type
-from app.services.collector.base import AbstractCollector, CollectedItem
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Type
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+import asyncio
+import time
+
+import httpx
+
+from app.services.collector.base import AbstractCollector, CollectedItem, CACHE_VALIDATORS
 from app.services.collector.rss import RSSCollector
 from app.services.collector.web import WebCollector
 from app.services.collector.github import GitHubCollector
 from app.services.collector.twitter import TwitterCollector
-from app.core.database import get_supabase_client
+from app.services.collector.schedule import PollScheduler
+from app.core.config import get_settings
+from app.core.metrics import timed
+from app.repositories import CollectedItemRepository, SourceRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,37 +32,172 @@ class CollectorManager:
     """Manages collection from all configured sources"""
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self.sources = SourceRepository()
+        self.items = CollectedItemRepository()
+
+    @timed("collect", items=lambda results: sum(result.get("collected", 0) for result in results))
+    async def collect_all(
+        self,
+        agenda_id: str | None = None,
+        concurrency: int | None = None,
+        save_scope: str | None = None,
+        on_result: Callable[[Dict[str, Any]], None] | None = None,
+        on_inserted: Callable[[List[Dict[str, Any]]], Awaitable[None]] | None = None,
+        due_only: bool | None = None,
+    ):
+        """
+        Run collection for all active sources.
+
+        With due_only (settings.collector_adaptive_polling by default) only
+        sources whose next_poll_at has passed are collected. Either way each
+        collected source gets its next poll time (see PollScheduler).
+
+        Sources are collected concurrently, at most `concurrency` at a time
+        (settings.collector_max_concurrency by default) and at most
+        settings.collector_per_host_concurrency per host, so one slow feed
+        only holds its own slot. Pass concurrency=1 to collect sequentially.
+        Results keep the order of the sources query.
 
-    async def collect_all(self, agenda_id: str | None = None):
-        """Run collection for all active sources"""
-        query = self.client.table("sources").select("*").eq("is_active", True)
+        save_scope (settings.collector_save_scope by default) controls
+        batching: "source" upserts each source's items as soon as they are
+        collected, "run" buffers the whole run and saves it in chunked
+        multi-row requests at the end.
 
-        if agenda_id:
-            query = query.eq("agenda_id", agenda_id)
+        on_result is called with each source's result once its counts are
+        final: as soon as it is saved, or after the run flush. on_inserted
+        is awaited with the newly inserted collected_items rows at the same
+        point; a slow consumer holds the source's slots, which throttles
+        collection.
+        """
+        settings = get_settings()
+        due_before = None
+        if due_only if due_only is not None else settings.collector_adaptive_polling:
+            due_before = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        sources = query.execute()
+        sources = await self.sources.list(agenda_id, active_only=True, due_before=due_before)
 
-        results = []
-        for source in sources.data:
+        run_slots = asyncio.Semaphore(concurrency or settings.collector_max_concurrency)
+        host_slots: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(settings.collector_per_host_concurrency)
+        )
+        deferred: List[Dict[str, Any]] | None = (
+            [] if (save_scope or settings.collector_save_scope) == "run" else None
+        )
+
+        async def run(source: dict) -> dict:
             try:
-                items = await self._collect_source(source)
-                saved = await self._save_items(source["id"], items)
-                results.append({
-                    "source_id": source["id"],
-                    "collected": len(items),
-                    "saved": saved,
-                })
+                collector = self._create_collector(source)
             except Exception as e:
-                results.append({
-                    "source_id": source["id"],
-                    "error": str(e),
-                })
+                return {"source_id": source["id"], "error": str(e), "duration_ms": 0}
+
+            # Take the host slot first so sources queued behind a busy host
+            # don't hold global slots while they wait.
+            async with host_slots[collector.get_host()], run_slots:
+                result = await self._collect_and_save(source, collector, deferred, on_inserted)
+
+            if on_result and (deferred is None or "error" in result):
+                on_result(result)
+            return result
 
+        results = await asyncio.gather(*(run(source) for source in sources))
+
+        if deferred:
+            inserted = await self._save_run(deferred)
+            if on_inserted and inserted:
+                await on_inserted(inserted)
+        if on_result and deferred is not None:
+            for entry in deferred:
+                on_result(entry["result"])
+
+        await self._update_schedules(sources, results)
         return results
 
-    async def _collect_source(self, source: dict) -> list[CollectedItem]:
-        """Collect items from a single source"""
+    async def _collect_and_save(
+        self,
+        source: dict,
+        collector: AbstractCollector,
+        deferred: List[Dict[str, Any]] | None = None,
+        on_inserted: Callable[[List[Dict[str, Any]]], Awaitable[None]] | None = None,
+    ) -> dict:
+        """
+        Collect and save a single source, timing the whole round trip.
+
+        When `deferred` is given the save is queued there for _save_run and
+        the result's counts are filled in once the run is flushed.
+        Otherwise the inserted rows are handed to on_inserted.
+        """
+        started = time.perf_counter()
+        inserted: List[Dict[str, Any]] = []
+        try:
+            items = await collector.collect()
+            result = {
+                "source_id": source["id"],
+                "collected": len(items),
+                "saved": 0,
+                "existing": 0,
+                "cache_hit": collector.not_modified,
+            }
+            # 304 or identical body: nothing to parse or save
+            rows = [] if collector.not_modified else self._build_rows(source["id"], items)
+
+            if deferred is not None:
+                deferred.append({
+                    "source": source,
+                    "rows": rows,
+                    "validators": collector.validators,
+                    "result": result,
+                })
+            elif collector.not_modified:
+                await self._update_source(source["id"], collector.validators)
+            else:
+                counts, inserted = await self._save_items(source["id"], rows, collector.validators)
+                result.update(counts)
+
+            result["duration_ms"] = self._elapsed_ms(started)
+        except Exception as e:
+            logger.warning(f"Collection failed for source {source['id']}: {e}")
+            return {
+                "source_id": source["id"],
+                "error": str(e),
+                "duration_ms": self._elapsed_ms(started),
+                **self._error_details(e),
+            }
+
+        if on_inserted and inserted:
+            await on_inserted(inserted)
+        return result
+
+    @staticmethod
+    def _error_details(error: Exception) -> Dict[str, Any]:
+        """HTTP status and Retry-After seconds of a failed fetch, for backoff"""
+        if not isinstance(error, httpx.HTTPStatusError):
+            return {}
+        details: Dict[str, Any] = {"status_code": error.response.status_code}
+        retry_after = error.response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            details["retry_after"] = int(retry_after)
+        return details
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> int:
+        return round((time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    def summarize(results: list[dict]) -> dict:
+        """Aggregate per-source results into a run summary"""
+        fetched = [r for r in results if "error" not in r]
+        cache_hits = sum(1 for r in fetched if r.get("cache_hit"))
+        return {
+            "sources": len(results),
+            "errors": len(results) - len(fetched),
+            "saved": sum(r.get("saved", 0) for r in fetched),
+            "existing": sum(r.get("existing", 0) for r in fetched),
+            "cache_hits": cache_hits,
+            "cache_hit_rate": round(cache_hits / len(fetched), 3) if fetched else 0.0,
+        }
+
+    def _create_collector(self, source: dict) -> AbstractCollector:
+        """Build the collector for a source row"""
         source_type = source["source_type"]
 
         if source_type not in COLLECTOR_REGISTRY:
@@ -81,32 +226,131 @@ class CollectorManager:
         else:
             collector = collector_class(source["id"], source["url"], source.get("config"))
 
-        return await collector.collect()
-
-    async def _save_items(self, source_id: str, items: list[CollectedItem]) -> int:
-        """Save collected items to database, avoiding duplicates"""
-        saved = 0
+        collector.validators = {key: source.get(key) for key in CACHE_VALIDATORS}
+        return collector
 
+    @staticmethod
+    def _build_rows(source_id: str, items: list[CollectedItem]) -> List[Dict[str, Any]]:
+        """Turn items into collected_items rows, dropping repeated external_ids"""
+        rows: Dict[str, Dict[str, Any]] = {}
         for item in items:
-            data = {
-                "source_id": source_id,
-                **item.to_dict(),
-            }
+            rows.setdefault(item.external_id, {"source_id": source_id, **item.to_dict()})
+        return list(rows.values())
+
+    async def _save_items(
+        self,
+        source_id: str,
+        rows: List[Dict[str, Any]],
+        validators: Dict[str, str | None] | None = None,
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Save one source's rows, avoiding duplicates, and mark it collected.
+        Returns the counts and the newly inserted rows.
+        """
+        inserted, failed = await self._upsert_rows(rows)
+
+        # Keep the old validators if anything failed so the next run refetches
+        if not failed:
+            await self._update_source(source_id, validators)
+
+        return self._save_counts(len(rows), len(inserted), len(failed)), inserted
+
+    async def _save_run(self, deferred: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Save every deferred source of a run in chunked multi-row requests.
+        Returns the newly inserted rows.
+        """
+        rows = [row for entry in deferred for row in entry["rows"]]
+        inserted, failed = await self._upsert_rows(rows)
+
+        inserted_by_source = Counter(row["source_id"] for row in inserted)
+        failed_by_source = Counter(row["source_id"] for row in failed)
 
-            # Upsert to avoid duplicates
+        collected = []
+        for entry in deferred:
+            source_id = entry["source"]["id"]
+            entry["result"].update(self._save_counts(
+                len(entry["rows"]),
+                inserted_by_source[source_id],
+                failed_by_source[source_id],
+            ))
+            if not failed_by_source[source_id]:
+                collected.append(entry)
+
+        await self._update_sources(collected)
+        return inserted
+
+    @staticmethod
+    def _save_counts(total: int, inserted: int, failed: int) -> Dict[str, int]:
+        counts = {"saved": inserted, "existing": total - inserted - failed}
+        if failed:
+            counts["failed"] = failed
+        return counts
+
+    async def _upsert_rows(
+        self, rows: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Insert rows in chunks of settings.collector_upsert_chunk_size.
+
+        Rows whose (source_id, external_id) already exists are skipped, so
+        only the newly inserted ones come back. Returns the inserted
+        rows and the rows of any chunk that failed.
+        """
+        chunk_size = get_settings().collector_upsert_chunk_size
+        inserted: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
             try:
-                self.client.table("collected_items").upsert(
-                    data,
-                    on_conflict="source_id,external_id",
-                ).execute()
-                saved += 1
+                inserted.extend(await self.items.insert_new(chunk))
             except Exception as e:
-                logger.warning(f"Failed to save item {item.external_id}: {e}")
+                logger.warning(f"Failed to save {len(chunk)} items: {e}")
+                failed.extend(chunk)
+
+        return inserted, failed
+
+    async def _update_source(self, source_id: str, validators: Dict[str, str | None] | None = None):
+        """Update last_collected_at and the stored HTTP cache validators"""
+        data = {"last_collected_at": datetime.now().isoformat()}
+        if validators:
+            data.update(validators)
+        await self.sources.update(source_id, data)
+
+    async def _update_sources(self, entries: List[Dict[str, Any]]):
+        """Batched _update_source for the deferred entries of a run"""
+        if not entries:
+            return
+
+        collected_at = datetime.now().isoformat()
+        updates = [
+            {
+                "id": entry["source"]["id"],
+                **{key: entry["validators"].get(key) for key in CACHE_VALIDATORS},
+                "last_collected_at": collected_at,
+            }
+            for entry in entries
+        ]
+        try:
+            await self.sources.update_many(updates)
+        except Exception as e:
+            # The items are saved; old validators only mean a full refetch next run
+            logger.warning(f"Failed to update {len(updates)} sources: {e}")
 
-        # Update last_collected_at
-        from datetime import datetime
-        self.client.table("sources").update({
-            "last_collected_at": datetime.now().isoformat(),
-        }).eq("id", source_id).execute()
+    async def _update_schedules(self, sources: List[Dict[str, Any]], results: List[Dict[str, Any]]):
+        """Store each collected source's next poll time in one batched update"""
+        if not sources:
+            return
 
-        return saved
+        try:
+            scheduler = PollScheduler(self.sources)
+            rates = await scheduler.publish_rates(sources)
+            updates = [
+                {"id": source["id"], **scheduler.next_poll(source, result, rates[source["id"]])}
+                for source, result in zip(sources, results)
+            ]
+            await self.sources.update_many(updates)
+        except Exception as e:
+            # Sources without a schedule are simply due on the next tick
+            logger.warning(f"Failed to update source poll schedules: {e}")
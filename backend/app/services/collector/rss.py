@@ -1,5 +1,4 @@
 import feedparser
-import httpx
 from typing import List, Dict, Any
 from datetime import datetime
 from time import mktime
@@ -18,9 +17,10 @@ class RSSCollector(AbstractCollector):
         return "rss"
 
     async def collect(self) -> List[CollectedItem]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.url, timeout=30.0)
-            response.raise_for_status()
+        response = await self._conditional_get(self.url, timeout=30.0)
+        if response is None:
+            return []
+        response.raise_for_status()
 
         feed = feedparser.parse(response.text)
         items = []
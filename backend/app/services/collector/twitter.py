@@ -1,6 +1,7 @@
 import httpx
 from typing import List, Dict, Any
-from datetime import datetime, timezone
+from datetime import datetime
+from urllib.parse import urlparse
 import logging
 
 from app.services.collector.base import AbstractCollector, CollectedItem
@@ -37,6 +38,9 @@ class TwitterCollector(AbstractCollector):
     def get_source_type(self) -> str:
         return "twitter"
 
+    def get_host(self) -> str:
+        return urlparse(self.base_url).hostname
+
     async def collect(self) -> List[CollectedItem]:
         """Collect tweets based on config."""
         if not self.api_key:
@@ -52,9 +56,10 @@ class TwitterCollector(AbstractCollector):
             return await self._search_tweets(query)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
-                logger.warning("Twitter API rate limited, will retry later")
-                return []
-            logger.error(f"Twitter API error: {e}")
+                # Raised so the poll schedule waits out Retry-After
+                logger.warning("Twitter API rate limited, backing off until Retry-After")
+            else:
+                logger.error(f"Twitter API error: {e}")
             raise
         except Exception as e:
             logger.error(f"Twitter collection failed: {e}")
@@ -66,21 +71,20 @@ class TwitterCollector(AbstractCollector):
         include_replies = self.config.get("include_replies", False) if self.config else False
         min_likes = self.config.get("min_likes", 0) if self.config else 0
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/search/search",
-                params={
-                    "query": query,
-                    "section": "latest",
-                    "limit": max_results,
-                },
-                headers={
-                    "X-RapidAPI-Key": self.api_key,
-                    "X-RapidAPI-Host": "twitter154.p.rapidapi.com",
-                },
-                timeout=30.0,
-            )
-            response.raise_for_status()
+        response = await self._get(
+            f"{self.base_url}/search/search",
+            params={
+                "query": query,
+                "section": "latest",
+                "limit": max_results,
+            },
+            headers={
+                "X-RapidAPI-Key": self.api_key,
+                "X-RapidAPI-Host": "twitter154.p.rapidapi.com",
+            },
+            timeout=30.0,
+        )
+        response.raise_for_status()
 
         data = response.json()
         tweets = data.get("results", [])
@@ -1,4 +1,3 @@
-import httpx
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any
 import hashlib
@@ -29,13 +28,14 @@ class WebCollector(AbstractCollector):
         return "web"
 
     async def collect(self) -> List[CollectedItem]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.url,
-                timeout=30.0,
-                headers={"User-Agent": "VirtualSelf/1.0"},
-            )
-            response.raise_for_status()
+        response = await self._conditional_get(
+            self.url,
+            timeout=30.0,
+            headers={"User-Agent": "VirtualSelf/1.0"},
+        )
+        if response is None:
+            return []
+        response.raise_for_status()
 
         soup = BeautifulSoup(response.text, "lxml")
         items = []
@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import logging
+import time
+
+from app.core.config import get_settings
+from app.repositories import AgendaRepository, PrincipleRepository, SourceRepository, StackRepository
+
+logger = logging.getLogger(__name__)
+
+# Stack used when user_stack is empty or unreadable
+DEFAULT_STACK = {
+    "terminal": "Ghostty",
+    "harness": "Claude Code",
+    "orchestrator": "OMC (oh-my-claudecode)"
+}
+
+DEFAULT_AGENDA_NAME = "vibecoding"
+
+# Process-wide snapshots of rarely-changing rows: kind -> (loaded_at, value)
+_snapshots: Dict[str, tuple[float, Any]] = {}
+
+
+@dataclass
+class RunContext:
+    """
+    Read-only inputs shared by every stage of one pipeline run.
+
+    Built once per run by build_run_context(); stages read from it instead
+    of re-querying agendas, sources, principles and user_stack per item.
+    """
+
+    agenda: Dict[str, Any] | None
+    sources: Dict[str, Dict[str, Any]]
+    principles: List[str]
+    stack: Dict[str, str]
+    # The vibecoding agenda, whose items the processor analyzes whatever
+    # agenda the run targets
+    processed_agenda: Dict[str, Any] | None = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def agenda_id(self) -> str | None:
+        return self.agenda["id"] if self.agenda else None
+
+    def processed_source_ids(self) -> List[str]:
+        """IDs of the sources whose items the processor analyzes"""
+        if not self.processed_agenda:
+            return []
+        return [
+            source_id
+            for source_id, source in self.sources.items()
+            if source.get("agenda_id") == self.processed_agenda["id"]
+        ]
+
+
+async def _load_principles() -> List[str]:
+    """Active principle texts, most confident first"""
+    principles = await PrincipleRepository().list(active_only=True, limit=10, columns="content")
+    return [p["content"] for p in principles]
+
+
+async def _load_stack() -> Dict[str, str]:
+    """
+    Load user stack from database.
+    Falls back to DEFAULT_STACK on error.
+    """
+    try:
+        rows = await StackRepository().list(columns="category, tool_name")
+        if rows:
+            return {row["category"]: row["tool_name"] for row in rows}
+        return dict(DEFAULT_STACK)
+    except Exception as e:
+        logger.warning(f"Failed to load user stack from DB: {e}, using defaults")
+        return dict(DEFAULT_STACK)
+
+
+async def _snapshot(kind: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached snapshot for `kind`, reloading it once stale"""
+    ttl = get_settings().run_context_ttl_seconds
+    cached = _snapshots.get(kind)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    value = await loader()
+    _snapshots[kind] = (time.monotonic(), value)
+    return value
+
+
+async def get_principles() -> List[str]:
+    """Cached active principles"""
+    return await _snapshot("principles", _load_principles)
+
+
+async def get_stack() -> Dict[str, str]:
+    """Cached user stack"""
+    return await _snapshot("stack", _load_stack)
+
+
+def invalidate_run_context(*kinds: str):
+    """
+    Drop cached snapshots so the next run reloads them.
+
+    Called by the endpoints that write principles or user_stack. With no
+    arguments every snapshot is dropped. Only this process's snapshots are
+    dropped: other workers keep theirs for up to run_context_ttl_seconds.
+    """
+    for kind in kinds or list(_snapshots):
+        _snapshots.pop(kind, None)
+
+
+async def build_run_context(agenda_id: str | None = None) -> RunContext:
+    """
+    Snapshot everything a run reads but never writes.
+
+    The agenda is looked up by ID, or the vibecoding agenda when none is
+    given; the vibecoding agenda is always loaded for the processor.
+    Agendas and sources are read fresh each run; principles and the stack
+    come from the process-wide cache. Everything is read concurrently.
+    """
+    agendas = AgendaRepository()
+    processed_agenda, agenda, sources, principles, stack = await asyncio.gather(
+        agendas.get_by_name(DEFAULT_AGENDA_NAME),
+        # Without agenda_id the run's agenda is the vibecoding one
+        agendas.get(agenda_id) if agenda_id else asyncio.sleep(0),
+        SourceRepository().list(),
+        get_principles(),
+        get_stack(),
+    )
+
+    return RunContext(
+        agenda=agenda if agenda_id else processed_agenda,
+        sources={source["id"]: source for source in sources},
+        principles=principles,
+        stack=stack,
+        processed_agenda=processed_agenda,
+    )
@@ -1,7 +1,8 @@
-import httpx
 from typing import Dict, Any
 from app.services.executor.base import AbstractExecutor
 from app.core.config import get_settings
+from app.core.http import get_http_client
+from app.core.metrics import timed
 
 
 class NotificationExecutor(AbstractExecutor):
@@ -10,6 +11,7 @@ class NotificationExecutor(AbstractExecutor):
     def get_executor_type(self) -> str:
         return "notification"
 
+    @timed("notify")
     async def execute(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """Execute notification (placeholder for email/slack)"""
         # For now, just log the action
@@ -54,10 +56,9 @@ class SlackNotifier(AbstractExecutor):
             ]
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.webhook_url, json=message)
+        response = await get_http_client().post(self.webhook_url, json=message)
 
-            if response.status_code == 200:
-                return {"success": True, "message": "Slack notification sent"}
-            else:
-                return {"success": False, "error": f"Slack error: {response.status_code}"}
+        if response.status_code == 200:
+            return {"success": True, "message": "Slack notification sent"}
+        else:
+            return {"success": False, "error": f"Slack error: {response.status_code}"}
@@ -1,60 +1,50 @@
 from typing import Dict, Any, List
-from app.core.database import get_supabase_client
+from app.repositories import FeedbackRepository, PrincipleRepository
+from app.services.context import invalidate_run_context
 
 
 class FeedbackLearner:
     """Learn from user feedback to improve recommendations"""
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self.feedback = FeedbackRepository()
+        self.principles = PrincipleRepository()
 
     async def analyze_feedback(self) -> Dict[str, Any]:
         """Analyze feedback patterns"""
-        feedback = self.client.table("feedback").select("*").execute()
+        feedback = await self.feedback.list()
 
-        if not feedback.data:
+        if not feedback:
             return {"total": 0, "patterns": []}
 
         # Group by feedback type
-        confirms = [f for f in feedback.data if f["feedback_type"] == "confirm"]
-        rejects = [f for f in feedback.data if f["feedback_type"] == "reject"]
+        confirms = [f for f in feedback if f["feedback_type"] == "confirm"]
+        rejects = [f for f in feedback if f["feedback_type"] == "reject"]
 
         return {
-            "total": len(feedback.data),
+            "total": len(feedback),
             "confirms": len(confirms),
             "rejects": len(rejects),
-            "confirm_rate": len(confirms) / len(feedback.data) if feedback.data else 0,
+            "confirm_rate": len(confirms) / len(feedback) if feedback else 0,
         }
 
     async def update_principle_confidence(self, principle_id: str, adjustment: float):
         """Adjust principle confidence based on feedback"""
-        principle = (
-            self.client.table("principles")
-            .select("confidence_score")
-            .eq("id", principle_id)
-            .single()
-            .execute()
-        )
+        principle = await self.principles.get(principle_id, columns="confidence_score")
 
-        if principle.data:
-            new_score = max(0, min(1, principle.data["confidence_score"] + adjustment))
-            self.client.table("principles").update({
-                "confidence_score": new_score,
-            }).eq("id", principle_id).execute()
+        if principle:
+            new_score = max(0, min(1, principle["confidence_score"] + adjustment))
+            await self.principles.update(principle_id, {"confidence_score": new_score})
+            # Confidence decides which principles make the top 10
+            invalidate_run_context("principles")
 
     async def suggest_principle_refinements(self) -> List[Dict[str, Any]]:
         """Suggest refinements to principles based on feedback patterns"""
         # Get principles with low confidence
-        low_confidence = (
-            self.client.table("principles")
-            .select("*")
-            .lt("confidence_score", 0.3)
-            .eq("is_active", True)
-            .execute()
-        )
+        low_confidence = await self.principles.list(active_only=True, max_confidence=0.3)
 
         suggestions = []
-        for principle in low_confidence.data:
+        for principle in low_confidence:
             suggestions.append({
                 "principle_id": principle["id"],
                 "content": principle["content"],
@@ -1,8 +1,17 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List
 from datetime import datetime
+import asyncio
 import logging
+import time
 
-from app.core.database import get_supabase_client
+from app.core.config import get_settings
+from app.core.metrics import record_run, run_metrics_scope
+from app.repositories import ActionRepository, CollectedItemRepository, SourceRepository
+from app.services.analyzer.cache import cache_stats_scope
+from app.services.context import RunContext, build_run_context
+from app.services.run_history import RunHistory
+from app.services.runs import PipelineRun, get_run_registry
+from app.services.streaming import StreamingRun
 from app.services.collector.manager import CollectorManager
 from app.services.processor.vibecoding import VibeCodingProcessor
 from app.services.reporter.generator import ReportGenerator
@@ -15,123 +24,259 @@ logger = logging.getLogger(__name__)
 class Pipeline:
     """Main orchestration pipeline: Collect -> Process -> Analyze -> Report -> Execute"""
 
+    # Rows per update_quality_scores RPC call
+    QUALITY_UPDATE_CHUNK_SIZE = 500
+
     def __init__(self):
-        self.client = get_supabase_client()
+        self.items = CollectedItemRepository()
         self.collector = CollectorManager()
         self.processor = VibeCodingProcessor()
         self.reporter = ReportGenerator()
         self.notifier = NotificationExecutor()
         self.quality_scorer = QualityScorer()
+        self.history = RunHistory()
 
     async def _filter_by_quality(
-        self, items: List[Dict], agenda: Dict | None = None
+        self,
+        items: List[Dict],
+        agenda: Dict | None = None,
+        context: RunContext | None = None,
+        on_result: Callable[[Dict[str, Any]], None] | None = None,
     ) -> List[Dict]:
         """
         Filter collected items by quality score.
-        Updates DB with scores and returns items above threshold.
+        Updates DB with scores in bulk and returns items above threshold.
+        Source reputation comes from `context` when given; on_result gets
+        each item's score update once the batch is saved.
         """
         if not items:
             return []
 
         # Get sources for reputation info
-        source_ids = list(set(item.get("source_id") for item in items if item.get("source_id")))
-        sources = {}
-        if source_ids:
-            result = self.client.table("sources").select("*").in_("id", source_ids).execute()
-            sources = {s["id"]: s for s in result.data}
+        if context:
+            sources = context.sources
+        else:
+            source_ids = list(set(item.get("source_id") for item in items if item.get("source_id")))
+            sources = {s["id"]: s for s in await SourceRepository().get_many(source_ids)}
 
         filtered_items = []
-        for item in items:
-            source = sources.get(item.get("source_id"), {})
-            result = self.quality_scorer.score(item, source, agenda)
-
-            # Update DB with score
-            self.client.table("collected_items").update({
+        updates = []
+        results = self.quality_scorer.score_many(items, sources, agenda)
+        for item, result in zip(items, results):
+            updates.append({
+                "id": item["id"],
                 "quality_score": result.score,
                 "quality_breakdown": result.breakdown,
-                "filtered_out": not result.should_process
-            }).eq("id", item["id"]).execute()
+                "filtered_out": not result.should_process,
+            })
 
             if result.should_process:
                 filtered_items.append(item)
 
+        # Update DB with scores in bulk
+        await self._save_quality_scores(updates)
+        if on_result:
+            for update in updates:
+                on_result(update)
+
         logger.info(
             f"Quality filter: {len(filtered_items)}/{len(items)} passed "
             f"(threshold: {self.quality_scorer.DEFAULT_THRESHOLD})"
         )
         return filtered_items
 
-    async def run_full_pipeline(self, agenda_id: str | None = None) -> Dict[str, Any]:
-        """Run the complete pipeline"""
+    async def _save_quality_scores(self, updates: List[Dict[str, Any]]):
+        """Persist quality results via the update_quality_scores RPC, in concurrent chunks"""
+        await asyncio.gather(*(
+            self.items.update_quality_scores(updates[start:start + self.QUALITY_UPDATE_CHUNK_SIZE])
+            for start in range(0, len(updates), self.QUALITY_UPDATE_CHUNK_SIZE)
+        ))
+
+    async def run_full_pipeline(
+        self,
+        agenda_id: str | None = None,
+        run: PipelineRun | None = None,
+        mode: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the complete pipeline.
+
+        mode (settings.pipeline_mode by default) is "streaming", where
+        collection, scoring, analysis and reporting overlap (see
+        StreamingRun), or "phased", where each step finishes before the
+        next starts, which is easier to follow when debugging.
+
+        Agenda, sources, principles and stack are read once into a
+        RunContext and shared by every step.
+
+        Progress is emitted as events on `run` (registered here when not
+        given): stage start/finish plus one collected, scored, analyzed or
+        report_created event per source or item, each with its timings.
+
+        results["metrics"] breaks the run down by component (busy time,
+        items/sec), DB and outbound HTTP round trips, and LLM latency
+        percentiles and tokens; see app.core.metrics.
+
+        Every run, including one that crashes, is saved to the
+        pipeline_runs table (see RunHistory) for trend queries.
+        """
+        mode = mode or get_settings().pipeline_mode
+        if mode not in ("streaming", "phased"):
+            raise ValueError(f"Unknown pipeline mode: {mode}")
+
+        run = run or get_run_registry().create(agenda_id)
+        run.emit("run_started", agenda_id=agenda_id, mode=mode)
+
         results = {
+            "run_id": run.id,
+            "mode": mode,
             "started_at": datetime.now().isoformat(),
             "steps": {},
             "errors": [],
         }
 
+        started = time.perf_counter()
+        try:
+            with run_metrics_scope() as run_metrics:
+                if mode == "streaming":
+                    await StreamingRun(self, agenda_id, run, results).execute()
+                else:
+                    await self._run_steps(agenda_id, run, results)
+                await self._notify_step(run, results)
+        except BaseException as e:
+            record_run("crashed", time.perf_counter() - started)
+            run.fail(str(e) or type(e).__name__)
+            results["errors"].append(f"Crashed: {str(e) or type(e).__name__}")
+            results["completed_at"] = datetime.now().isoformat()
+            results["success"] = False
+            results["metrics"] = {"wall_ms": {"total": round((time.perf_counter() - started) * 1000)}}
+            # Shielded so a second cancellation can't drop the crashed run's row
+            await asyncio.shield(self.history.record(results, agenda_id))
+            raise
+
+        results["completed_at"] = datetime.now().isoformat()
+        results["success"] = len(results["errors"]) == 0
+        results["metrics"] = {
+            "wall_ms": {"total": round((time.perf_counter() - started) * 1000), **run.stage_durations},
+            **run_metrics.summary(),
+        }
+        record_run("success" if results["success"] else "failed", time.perf_counter() - started)
+
+        run.finish(results)
+        await self.history.record(results, agenda_id)
+        return results
+
+    async def _run_steps(
+        self, agenda_id: str | None, run: PipelineRun, results: Dict[str, Any]
+    ):
+        """Phased steps of run_full_pipeline; a failed step is recorded in `results` and the run goes on"""
+        context = None
+        stage = "collect"
+
         try:
             # Step 1: Collect
             logger.info("Starting collection...")
-            collection_results = await self.collector.collect_all(agenda_id)
+            run.start_stage(stage)
+            collection_results = await self.collector.collect_all(
+                agenda_id,
+                on_result=lambda result: run.emit("collected", **result),
+            )
+            summary = self.collector.summarize(collection_results)
             results["steps"]["collect"] = {
                 "success": True,
+                **summary,
                 "results": collection_results,
             }
+            run.end_stage(stage, **summary)
+
+            context = await build_run_context(agenda_id)
 
             # Step 1.5: Quality filtering on newly collected items
             logger.info("Applying quality filter to newly collected items...")
-            agenda = None
-            if agenda_id:
-                agenda_result = self.client.table("agendas").select("*").eq("id", agenda_id).single().execute()
-                agenda = agenda_result.data if agenda_result.data else None
+            stage = "quality_filter"
+            run.start_stage(stage)
+            # Agenda keywords only apply when the run targets an agenda
+            agenda = context.agenda if agenda_id else None
 
             # Get newly collected items (no quality_score yet)
-            newly_collected = (
-                self.client.table("collected_items")
-                .select("*")
-                .is_("quality_score", "null")
-                .order("collected_at", desc=True)
-                .limit(200)
-                .execute()
-            )
+            newly_collected = await self._get_unscored_items()
 
-            filtered_items = await self._filter_by_quality(newly_collected.data, agenda)
+            filtered_items = await self._filter_by_quality(
+                newly_collected,
+                agenda,
+                context,
+                on_result=lambda update: run.emit(
+                    "scored",
+                    item_id=update["id"],
+                    quality_score=update["quality_score"],
+                    passed=not update["filtered_out"],
+                ),
+            )
             results["steps"]["quality_filter"] = {
                 "success": True,
-                "total_items": len(newly_collected.data),
+                "total_items": len(newly_collected),
                 "passed_items": len(filtered_items),
-                "filtered_out": len(newly_collected.data) - len(filtered_items),
+                "filtered_out": len(newly_collected) - len(filtered_items),
             }
+            run.end_stage(stage, **results["steps"]["quality_filter"])
         except Exception as e:
             logger.error(f"Collection failed: {e}")
             results["errors"].append(f"Collection: {str(e)}")
             results["steps"]["collect"] = {"success": False, "error": str(e)}
+            run.end_stage(stage, error=str(e))
 
+        stage = "process"
         try:
             # Step 2: Process & Analyze
             logger.info("Processing items...")
-            process_results = await self.processor.process_new_items()
+            run.start_stage(stage)
+            context = context or await build_run_context(agenda_id)
+            with cache_stats_scope() as cache_stats:
+                process_results = await self.processor.process_new_items(
+                    context=context,
+                    on_result=lambda result: run.emit(
+                        "analyzed",
+                        item_id=result["item_id"],
+                        item_title=result["item_title"],
+                        verdict=result["analysis"].get("verdict"),
+                        duration_ms=result["duration_ms"],
+                    ),
+                )
             results["steps"]["process"] = {
                 "success": True,
                 "processed_count": len(process_results),
+                "llm_cache": cache_stats,
             }
+            run.end_stage(stage, **results["steps"]["process"])
 
             # Step 3: Generate Reports for recommendations
             logger.info("Generating reports...")
+            stage = "reports"
+            run.start_stage(stage)
             reports_created = await self._generate_reports_from_analysis(
-                agenda_id, process_results
+                context, process_results, run
             )
             results["steps"]["reports"] = {
                 "success": True,
                 "reports_created": reports_created,
             }
+            run.end_stage(stage, reports_created=reports_created)
         except Exception as e:
             logger.error(f"Processing failed: {e}")
             results["errors"].append(f"Processing: {str(e)}")
             results["steps"]["process"] = {"success": False, "error": str(e)}
+            run.end_stage(stage, error=str(e))
 
+    async def _get_unscored_items(self) -> List[Dict[str, Any]]:
+        """Newest collected items without a quality score"""
+        return await self.items.list_unscored(limit=200)
+
+    async def _notify_step(self, run: PipelineRun, results: Dict[str, Any]):
+        """Last step of either mode, once every report is written"""
+        stage = "notify"
         try:
             # Step 4: Notify about new pending actions
+            run.start_stage(stage)
             pending_actions = await self._get_pending_actions()
             if pending_actions:
                 logger.info(f"Notifying about {len(pending_actions)} pending actions...")
@@ -140,29 +285,21 @@ class Pipeline:
                 "success": True,
                 "notifications_sent": len(pending_actions),
             }
+            run.end_stage(stage, notifications_sent=len(pending_actions))
         except Exception as e:
             logger.error(f"Notification failed: {e}")
             results["errors"].append(f"Notification: {str(e)}")
-
-        results["completed_at"] = datetime.now().isoformat()
-        results["success"] = len(results["errors"]) == 0
-
-        return results
+            run.end_stage(stage, error=str(e))
 
     async def _generate_reports_from_analysis(
-        self, agenda_id: str | None, process_results: List[Dict[str, Any]]
+        self,
+        context: RunContext,
+        process_results: List[Dict[str, Any]],
+        run: PipelineRun | None = None,
     ) -> int:
         """Generate reports from analysis results"""
-        if not agenda_id:
-            # Get default vibecoding agenda
-            agenda = (
-                self.client.table("agendas")
-                .select("id")
-                .eq("name", "vibecoding")
-                .single()
-                .execute()
-            )
-            agenda_id = agenda.data["id"] if agenda.data else None
+        # The run's agenda, or the default vibecoding agenda
+        agenda_id = context.agenda_id
 
         if not agenda_id:
             return 0
@@ -176,13 +313,22 @@ class Pipeline:
 
             # Create reports for ADOPT and CONSIDER verdicts
             if verdict in ["ADOPT", "CONSIDER"]:
-                await self.reporter.generate_new_tool_report(
+                started = time.perf_counter()
+                report = await self.reporter.generate_new_tool_report(
                     agenda_id=agenda_id,
                     tool_name=result.get("item_title", "Unknown"),
                     analysis=analysis,
                     source_item={"id": result.get("item_id"), "url": None},
                 )
                 reports_created += 1
+                if run:
+                    run.emit(
+                        "report_created",
+                        report_id=report["id"],
+                        item_id=result.get("item_id"),
+                        verdict=verdict,
+                        duration_ms=round((time.perf_counter() - started) * 1000),
+                    )
             elif verdict == "SKIP":
                 logger.info(f"Skipped: {result.get('item_title')} - {analysis.get('summary', 'No reason')}")
 
@@ -190,13 +336,7 @@ class Pipeline:
 
     async def _get_pending_actions(self) -> List[Dict[str, Any]]:
         """Get all pending actions"""
-        result = (
-            self.client.table("actions")
-            .select("*")
-            .eq("status", "pending")
-            .execute()
-        )
-        return result.data
+        return await ActionRepository().list(status="pending")
 
     async def _send_notifications(self, actions: List[Dict[str, Any]]):
         """Send notifications for pending actions"""
@@ -1,7 +1,12 @@
 from typing import List, Dict, Any
+import time
 import google.generativeai as genai
 from app.core.config import get_settings
+from app.core.metrics import record_llm
 from app.schemas.principles import PrincipleCreate
+from app.services.analyzer.gemini import record_gemini_usage
+
+MODEL_NAME = "gemini-2.0-flash"
 
 EXTRACTION_PROMPT = '''You are analyzing AI conversation history to extract the user's personal principles, preferences, and values.
 
@@ -40,7 +45,7 @@ class PrincipleExtractor:
     def __init__(self):
         settings = get_settings()
         genai.configure(api_key=settings.gemini_api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        self.model = genai.GenerativeModel(MODEL_NAME)
 
     async def extract_from_conversations(
         self, conversations: List[Dict[str, Any]]
@@ -72,12 +77,18 @@ class PrincipleExtractor:
         prompt = EXTRACTION_PROMPT.format(conversation=content)
 
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=2000,
-                ),
-            )
+            started = time.perf_counter()
+            try:
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=genai.types.GenerationConfig(
+                        max_output_tokens=2000,
+                    ),
+                )
+            except Exception:
+                record_llm("gemini", MODEL_NAME, time.perf_counter() - started, error=True)
+                raise
+            record_gemini_usage(MODEL_NAME, started, response)
 
             result_text = response.text.strip()
             # Clean up response - Gemini sometimes wraps JSON in markdown
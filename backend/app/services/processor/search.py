@@ -0,0 +1,176 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set
+import asyncio
+import logging
+import re
+
+from app.core.config import get_settings
+from app.repositories import CollectedItemRepository
+
+logger = logging.getLogger(__name__)
+
+# Search terms per stack category; each term is a phrase of word prefixes
+CATEGORY_KEYWORDS = {
+    "terminal": ["terminal", "shell", "ghostty", "warp", "iterm", "kitty"],
+    "harness": ["claude code", "cursor", "aider", "windsurf", "cline", "copilot"],
+    "orchestrator": ["mcp", "orchestrat", "agent", "omc", "roo", "continue"],
+}
+
+# Same word boundaries as the '[^[:alnum:]]+' split in search_collected_items
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# Title hits count double, like the A/B weights of the Postgres index
+TITLE_WEIGHT = 2.0
+CONTENT_WEIGHT = 1.0
+
+# Rows fetched per request while (re)building the in-memory index
+INDEX_PAGE_SIZE = 1000
+
+
+def tokenize(text: str | None) -> List[str]:
+    """Lowercased alphanumeric words of `text`"""
+    return WORD_PATTERN.findall((text or "").lower())
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over collected item titles and content.
+
+    Mirrors search_collected_items for local runs without the migration:
+    every word of a term is prefix-matched, an item matches when any term
+    does, and title hits weigh more than content hits. Word order inside a
+    term is not checked.
+    """
+
+    def __init__(self):
+        # word -> {item id: weighted term frequency}
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.vocabulary: List[str] = []
+        self.collected_at: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.collected_at)
+
+    def add(self, item: Dict[str, Any]):
+        """Index one item; re-adding an item replaces its postings"""
+        item_id = item["id"]
+        if item_id in self.collected_at:
+            self.remove(item_id)
+
+        weights: Dict[str, float] = defaultdict(float)
+        for word in tokenize(item.get("title")):
+            weights[word] += TITLE_WEIGHT
+        for word in tokenize(item.get("content")):
+            weights[word] += CONTENT_WEIGHT
+
+        for word, weight in weights.items():
+            if word not in self.postings:
+                self.vocabulary.insert(bisect_left(self.vocabulary, word), word)
+            self.postings[word][item_id] = weight
+
+        self.collected_at[item_id] = item.get("collected_at") or ""
+
+    def remove(self, item_id: str):
+        """Drop an item from the index"""
+        self.collected_at.pop(item_id, None)
+        for word in [word for word, items in self.postings.items() if item_id in items]:
+            del self.postings[word][item_id]
+            if not self.postings[word]:
+                del self.postings[word]
+                del self.vocabulary[bisect_left(self.vocabulary, word)]
+
+    def _prefix_matches(self, prefix: str) -> Dict[str, float]:
+        """Summed weights per item over every word starting with `prefix`"""
+        scores: Dict[str, float] = defaultdict(float)
+        start = bisect_left(self.vocabulary, prefix)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(prefix):
+                break
+            for item_id, weight in self.postings[word].items():
+                scores[item_id] += weight
+        return scores
+
+    def search(self, terms: Iterable[str], limit: int = 20) -> List[str]:
+        """IDs of the best `limit` items matching any term, best first"""
+        scores: Dict[str, float] = defaultdict(float)
+        for term in terms:
+            words = tokenize(term)
+            if not words:
+                continue
+
+            matches = [self._prefix_matches(word) for word in words]
+            candidates: Set[str] = set(matches[0])
+            for match in matches[1:]:
+                candidates &= match.keys()
+
+            for item_id in candidates:
+                scores[item_id] += sum(match[item_id] for match in matches)
+
+        ranked = sorted(
+            scores,
+            key=lambda item_id: (scores[item_id], self.collected_at.get(item_id, "")),
+            reverse=True,
+        )
+        return ranked[:limit]
+
+
+class ItemSearch:
+    """
+    Keyword search over collected items.
+
+    The "postgres" backend calls the search_collected_items RPC (migration
+    008) and falls back to the in-memory index if the call fails. The
+    "memory" backend keeps an InvertedIndex that is built once and then
+    topped up with items saved since the last search.
+    """
+
+    def __init__(self, items: CollectedItemRepository, backend: str | None = None):
+        self.items = items
+        self.backend = backend or get_settings().search_backend
+        self.index = InvertedIndex()
+        # ingest_seq of the last indexed item; collected_at is the publish
+        # time, so items saved later can carry older dates
+        self._cursor: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def search(self, terms: List[str], limit: int = 20) -> List[Dict[str, Any]]:
+        """Full rows of the best `limit` items matching any of `terms`"""
+        if not terms:
+            return []
+
+        if self.backend == "postgres":
+            try:
+                return await self.items.search(terms, limit)
+            except Exception as e:
+                logger.warning(f"Full-text search failed: {e}, using in-memory index")
+
+        return await self._search_memory(terms, limit)
+
+    async def _search_memory(self, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        async with self._lock:
+            await self._refresh()
+            item_ids = self.index.search(terms, limit)
+
+        if not item_ids:
+            return []
+
+        rows = await self.items.get_many(item_ids)
+        by_id = {row["id"]: row for row in rows}
+        return [by_id[item_id] for item_id in item_ids if item_id in by_id]
+
+    async def _refresh(self):
+        """Index items saved since the last refresh, a page at a time"""
+        while True:
+            rows = await self.items.page_after(
+                self._cursor, INDEX_PAGE_SIZE, columns="id, title, content, collected_at, ingest_seq"
+            )
+            for row in rows:
+                self.index.add(row)
+            if rows:
+                self._cursor = rows[-1]["ingest_seq"]
+
+            if len(rows) < INDEX_PAGE_SIZE:
+                break
+
+        logger.debug(f"Search index holds {len(self.index)} items")
@@ -1,9 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable
 from datetime import datetime, timedelta
+import asyncio
 import logging
+import time
 
 from app.services.analyzer.gemini import GeminiAnalyzer
-from app.core.database import get_supabase_client
+from app.core.config import get_settings
+from app.core.metrics import stage_timer
+from app.repositories import CollectedItemRepository
+from app.services.context import RunContext, build_run_context, get_principles, get_stack
+from app.services.processor.search import CATEGORY_KEYWORDS, ItemSearch
 
 logger = logging.getLogger(__name__)
 
@@ -11,113 +17,152 @@ logger = logging.getLogger(__name__)
 class VibeCodingProcessor:
     """Process VibeCoding agenda items"""
 
-    # Default stack (fallback if DB fails)
-    DEFAULT_STACK = {
-        "terminal": "Ghostty",
-        "harness": "Claude Code",
-        "orchestrator": "OMC (oh-my-claudecode)"
-    }
+    # Items analyzed per run at most; the rest wait for the next run
+    MAX_ITEMS_PER_RUN = 50
 
     def __init__(self):
         self.analyzer = GeminiAnalyzer()
-        self.client = get_supabase_client()
-        self.agenda_name = "vibecoding"
-
-    async def process_new_items(self) -> List[Dict[str, Any]]:
-        """Process newly collected items"""
-        # Get unprocessed items
-        items = await self._get_unprocessed_items()
-        if not items:
-            return []
-
-        # Get user principles
-        principles = await self._get_user_principles()
-
-        results = []
-        for item in items:
-            result = await self._process_single_item(item, principles)
-            results.append(result)
+        self.items = CollectedItemRepository()
+        self.search = ItemSearch(self.items)
+
+    async def process_new_items(
+        self,
+        concurrency: int | None = None,
+        context: RunContext | None = None,
+        on_result: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process newly collected items.
 
-            # Mark as processed
-            await self._mark_processed(item["id"])
+        Up to `concurrency` analyses (settings.llm_max_concurrency by
+        default) run at once; pass 1 to process sequentially. Each item is
+        marked processed as soon as its analysis lands. Items whose analysis
+        fails are logged and left unprocessed for the next run.
 
-        return results
+        With settings.llm_batch_max_items > 1, items are packed several to a
+        Gemini prompt and each batch counts as one analysis.
 
-    async def _get_unprocessed_items(self) -> List[Dict[str, Any]]:
-        """Get items that haven't been processed yet"""
-        # Get vibecoding agenda ID
-        agenda = self.client.table("agendas").select("id").eq("name", self.agenda_name).single().execute()
+        Principles and stack come from `context`, built once here when the
+        caller (normally the pipeline) does not pass one. on_result is called
+        with each result once its item is marked processed.
+        """
+        context = context or await build_run_context()
 
-        if not agenda.data:
+        # Get unprocessed items
+        items = await self._get_unprocessed_items(context)
+        if not items:
             return []
 
-        agenda_id = agenda.data["id"]
+        slots = asyncio.Semaphore(concurrency or get_settings().llm_max_concurrency)
 
-        # Get sources for this agenda
-        sources = self.client.table("sources").select("id").eq("agenda_id", agenda_id).execute()
-        source_ids = [s["id"] for s in sources.data]
+        if self.analyzer.batch_max_items > 1:
+            return await self._process_in_batches(items, context, slots, on_result)
 
-        if not source_ids:
-            return []
-
-        # Get unprocessed collected items (excluding filtered_out)
-        items = (
-            self.client.table("collected_items")
-            .select("*")
-            .in_("source_id", source_ids)
-            .is_("processed_at", "null")
-            .eq("filtered_out", False)
-            .order("collected_at", desc=True)
-            .limit(50)
-            .execute()
+        results = await asyncio.gather(
+            *(self._analyze_item(item, context, slots, on_result) for item in items)
         )
-
-        return items.data
-
-    async def _get_user_principles(self) -> List[str]:
-        """Get active user principles"""
-        principles = (
-            self.client.table("principles")
-            .select("content")
-            .eq("is_active", True)
-            .order("confidence_score", desc=True)
-            .limit(10)
-            .execute()
+        return [result for result in results if result is not None]
+
+    async def _analyze_item(
+        self,
+        item: Dict[str, Any],
+        context: RunContext,
+        slots: asyncio.Semaphore,
+        on_result: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> Dict[str, Any] | None:
+        """Analyze one item in a slot and mark it processed; None if it failed"""
+        async with slots:
+            started = time.perf_counter()
+            with stage_timer("analyze") as stage:
+                try:
+                    result = await self._process_single_item(item, context)
+                except Exception as e:
+                    logger.error(f"Failed to process item {item['id']}: {e}")
+                    return None
+                stage.items = 1
+            result["duration_ms"] = round((time.perf_counter() - started) * 1000)
+
+        # Mark as processed
+        await self._mark_processed(item["id"], self._verdict(result["analysis"]))
+        if on_result:
+            on_result(result)
+        return result
+
+    async def _process_in_batches(
+        self,
+        items: List[Dict[str, Any]],
+        context: RunContext,
+        slots: asyncio.Semaphore,
+        on_result: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Batched variant of process_new_items; durations are per batch"""
+        principles = context.principles
+        current_stack = context.stack
+        tool_infos = [self._tool_info(item) for item in items]
+        batches = self.analyzer.plan_batches(tool_infos, principles, current_stack)
+
+        async def run(batch: List[int]) -> List[Dict[str, Any]]:
+            async with slots:
+                started = time.perf_counter()
+                with stage_timer("analyze") as stage:
+                    try:
+                        analyses = await self.analyzer.analyze_new_tools_batch(
+                            [tool_infos[index] for index in batch], principles, current_stack
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to process batch of {len(batch)} items: {e}")
+                        return []
+                    stage.items = len(batch)
+                duration_ms = round((time.perf_counter() - started) * 1000)
+
+            await self._mark_processed_many({
+                items[index]["id"]: self._verdict(analysis)
+                for index, analysis in zip(batch, analyses)
+            })
+            results = [
+                {
+                    "item_id": items[index]["id"],
+                    "item_title": items[index]["title"],
+                    "analysis": analysis,
+                    "duration_ms": duration_ms,
+                }
+                for index, analysis in zip(batch, analyses)
+            ]
+            if on_result:
+                for result in results:
+                    on_result(result)
+            return results
+
+        batch_results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [result for results in batch_results for result in results]
+
+    async def _get_unprocessed_items(self, context: RunContext) -> List[Dict[str, Any]]:
+        """Get items that haven't been processed yet"""
+        # Unprocessed items of the vibecoding agenda's sources (excluding filtered_out)
+        return await self.items.list_unprocessed(
+            context.processed_source_ids(), self.MAX_ITEMS_PER_RUN
         )
 
-        return [p["content"] for p in principles.data]
-
-    async def _get_current_stack(self) -> Dict[str, str]:
-        """
-        Load user stack from database.
-        Falls back to DEFAULT_STACK on error.
-        """
-        try:
-            result = self.client.table("user_stack").select("category, tool_name").execute()
-            if result.data:
-                return {row["category"]: row["tool_name"] for row in result.data}
-            return self.DEFAULT_STACK
-        except Exception as e:
-            logger.warning(f"Failed to load user stack from DB: {e}, using defaults")
-            return self.DEFAULT_STACK
-
-    async def _process_single_item(
-        self, item: Dict[str, Any], principles: List[str]
-    ) -> Dict[str, Any]:
-        """Process a single collected item"""
-        tool_info = {
+    @staticmethod
+    def _tool_info(item: Dict[str, Any]) -> Dict[str, Any]:
+        """The item fields sent to the analyzer"""
+        return {
             "title": item.get("title"),
             "content": item.get("content"),
             "url": item.get("url"),
             "metadata": item.get("metadata", {}),
         }
 
-        current_stack = await self._get_current_stack()
+    async def _process_single_item(
+        self, item: Dict[str, Any], context: RunContext
+    ) -> Dict[str, Any]:
+        """Process a single collected item"""
+        tool_info = self._tool_info(item)
 
         analysis = await self.analyzer.analyze_new_tool(
             tool_info=tool_info,
-            user_principles=principles,
-            current_stack=current_stack,
+            user_principles=context.principles,
+            current_stack=context.stack,
         )
 
         return {
@@ -126,90 +171,182 @@ class VibeCodingProcessor:
             "analysis": analysis,
         }
 
-    async def _mark_processed(self, item_id: str):
+    @staticmethod
+    def _verdict(analysis: Dict[str, Any]) -> str | None:
+        """ADOPT, CONSIDER or SKIP, stored on the item for filtered reprocessing"""
+        return (analysis.get("verdict") or "").upper() or None
+
+    async def _mark_processed(self, item_id: str, verdict: str | None = None):
         """Mark item as processed"""
-        self.client.table("collected_items").update({
-            "processed_at": datetime.now().isoformat(),
-        }).eq("id", item_id).execute()
+        await self.items.mark_processed({item_id: verdict})
+
+    async def _mark_processed_many(self, verdicts: Dict[str, str | None]):
+        """Mark several items as processed (item ID -> verdict)"""
+        await self.items.mark_processed(verdicts)
 
     async def generate_comparison_report(
-        self, category: str
+        self,
+        category: str,
+        context: RunContext | None = None,
+        timeout: float | None = None,
     ) -> Dict[str, Any]:
-        """Generate comparison report for a category (terminal, harness, orchestrator)"""
-        current_stack = await self._get_current_stack()
-
-        if category not in current_stack:
-            raise ValueError(f"Unknown category: {category}")
-
-        current_tool = current_stack[category]
-        principles = await self._get_user_principles()
+        """
+        Generate comparison report for a category (terminal, harness, orchestrator).
 
-        # Get recent items related to this category
-        items = await self._search_items_by_category(category)
+        Comparisons run concurrently. Those still running after `timeout`
+        seconds (settings.comparison_timeout_seconds by default) are
+        cancelled and listed under "timed_out"; the rest are returned.
+        """
+        events = await self.stream_comparison_report(category, context, timeout)
 
         comparisons = []
-        for item in items[:5]:  # Limit comparisons
-            comparison = await self.analyzer.compare_with_current_stack(
-                comparison_item={
-                    "title": item["title"],
-                    "content": item["content"],
-                    "url": item["url"],
-                },
-                current_tool=current_tool,
-                user_principles=principles,
-            )
-            comparisons.append({
-                "item": item["title"],
-                "analysis": comparison,
-            })
+        async for event in events:
+            if event["event"] == "start":
+                current_tool = event["current_tool"]
+            elif event["event"] == "comparison":
+                comparisons.append(event)
+            elif event["event"] == "done":
+                failed = event["failed"]
+                timed_out = event["timed_out"]
+
+        comparisons.sort(key=lambda event: event["index"])
 
         return {
             "category": category,
             "current_tool": current_tool,
-            "comparisons": comparisons,
+            "comparisons": [
+                {"item": event["item"], "analysis": event["analysis"]}
+                for event in comparisons
+            ],
+            "failed": failed,
+            "timed_out": timed_out,
         }
 
-    async def _search_items_by_category(self, category: str) -> List[Dict[str, Any]]:
-        """Search collected items related to a category"""
-        keywords = {
-            "terminal": ["terminal", "shell", "ghostty", "warp", "iterm", "kitty"],
-            "harness": ["claude code", "cursor", "aider", "windsurf", "cline", "copilot"],
-            "orchestrator": ["mcp", "orchestrat", "agent", "omc", "roo", "continue"],
-        }
+    async def stream_comparison_report(
+        self,
+        category: str,
+        context: RunContext | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Start a comparison report and return its events as they happen.
 
-        search_terms = keywords.get(category, [])
+        Raises ValueError for an unknown category before any event is sent.
+        The events are "start", one "comparison" per finished analysis in
+        completion order, and a final "done" listing failed and timed-out
+        items.
+        """
+        current_stack = context.stack if context else await get_stack()
 
-        # Simple search in title/content
-        all_items = self.client.table("collected_items").select("*").execute()
+        if category not in current_stack:
+            raise ValueError(f"Unknown category: {category}")
+
+        current_tool = current_stack[category]
+        principles = context.principles if context else await get_principles()
+
+        # Get recent items related to this category
+        items = await self._search_items_by_category(category, limit=5)
+
+        if timeout is None:
+            timeout = get_settings().comparison_timeout_seconds
+
+        return self._comparison_events(category, current_tool, principles, items, timeout)
+
+    async def _comparison_events(
+        self,
+        category: str,
+        current_tool: str,
+        principles: List[str],
+        items: List[Dict[str, Any]],
+        timeout: float,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout
+
+        yield {
+            "event": "start",
+            "category": category,
+            "current_tool": current_tool,
+            "items": [item["title"] for item in items],
+        }
 
-        matched = []
-        for item in all_items.data:
-            title_lower = (item.get("title") or "").lower()
-            content_lower = (item.get("content") or "").lower()
+        tasks = {
+            asyncio.create_task(
+                self.analyzer.compare_with_current_stack(
+                    comparison_item={
+                        "title": item["title"],
+                        "content": item["content"],
+                        "url": item["url"],
+                    },
+                    current_tool=current_tool,
+                    user_principles=principles,
+                )
+            ): index
+            for index, item in enumerate(items)
+        }
+        pending = set(tasks)
+        failed = []
 
-            if any(term in title_lower or term in content_lower for term in search_terms):
-                matched.append(item)
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index = tasks[task]
+                    title = items[index]["title"]
+                    if task.exception():
+                        logger.error(f"Comparison failed for {title}: {task.exception()}")
+                        failed.append(title)
+                        continue
+
+                    yield {
+                        "event": "comparison",
+                        "index": index,
+                        "item": title,
+                        "analysis": task.result(),
+                        "elapsed_ms": round((loop.time() - started) * 1000),
+                    }
+        finally:
+            # Deadline passed or the client went away
+            for task in pending:
+                task.cancel()
+
+        timed_out = [items[tasks[task]]["title"] for task in pending]
+        if timed_out:
+            logger.warning(f"{len(timed_out)} {category} comparisons timed out after {timeout}s")
+
+        yield {
+            "event": "done",
+            "completed": len(items) - len(failed) - len(timed_out),
+            "failed": failed,
+            "timed_out": timed_out,
+            "elapsed_ms": round((loop.time() - started) * 1000),
+        }
 
-        return matched
+    async def _search_items_by_category(
+        self, category: str, limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Best-ranked collected items related to a category"""
+        return await self.search.search(CATEGORY_KEYWORDS.get(category, []), limit)
 
-    async def generate_weekly_summary(self) -> Dict[str, Any]:
+    async def generate_weekly_summary(
+        self, context: RunContext | None = None
+    ) -> Dict[str, Any]:
         """Generate weekly trends summary"""
         # Get items from last week
         week_ago = (datetime.now() - timedelta(days=7)).isoformat()
 
-        items = (
-            self.client.table("collected_items")
-            .select("*")
-            .gte("collected_at", week_ago)
-            .order("collected_at", desc=True)
-            .limit(100)
-            .execute()
-        )
-
-        principles = await self._get_user_principles()
+        items = await self.items.list_since(week_ago, limit=100)
+        principles = context.principles if context else await get_principles()
 
         summary = await self.analyzer.summarize_trends(
-            items=items.data,
+            items=items,
             user_principles=principles,
             time_period="this week",
         )
@@ -0,0 +1,72 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword set.
+
+    find() reports every keyword that occurs anywhere in the text
+    (substring semantics, overlapping hits included) in one linear scan,
+    instead of one `kw in text` scan per keyword. Matching is exact, so
+    callers lowercase both sides; use get_matcher() for that and caching.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (index,)
+
+        # Breadth-first so every fail target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+                queue.append(next_state)
+
+    def find(self, text: str) -> List[int]:
+        """Return the indices of all keywords found in text, in keyword order"""
+        found = set(self._out[0])  # empty keywords match everything
+        remaining = len(self.keywords) - len(found)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                for index in out[state]:
+                    if index not in found:
+                        found.add(index)
+                        remaining -= 1
+                if not remaining:
+                    break
+
+        return sorted(found)
+
+
+@lru_cache(maxsize=128)
+def get_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Compiled case-insensitive matcher for a keyword set, built once per set"""
+    return KeywordMatcher(kw.lower() for kw in keywords)
@@ -1,14 +1,20 @@
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from datetime import datetime, timezone
 import logging
+import math
+
+import numpy as np
+
+from app.core.metrics import timed
+from app.services.quality.matcher import get_matcher
 
 logger = logging.getLogger(__name__)
 
 @dataclass
 class QualityResult:
     score: float  # 0-100
-    breakdown: Dict[str, float]
+    breakdown: Dict[str, Any]  # factor scores, plus matched_keywords
     should_process: bool
 
 class QualityScorer:
@@ -43,7 +49,8 @@ class QualityScorer:
         item: Dict[str, Any],
         source: Dict[str, Any],
         agenda: Dict[str, Any] | None = None,
-        threshold: float | None = None
+        threshold: float | None = None,
+        now: datetime | None = None,
     ) -> QualityResult:
         """
         Calculate quality score for a collected item.
@@ -53,20 +60,23 @@ class QualityScorer:
             source: The sources row (for reputation, keywords)
             agenda: The agendas row (for keywords), optional
             threshold: Override default threshold
+            now: Reference time for recency, defaults to the current time
 
         Returns:
             QualityResult with score, breakdown, and should_process flag
         """
+        keyword_score, matched_keywords = self._calculate_keyword_score(item, agenda, source)
         breakdown = {
             "content_length": self._calculate_content_length_score(item),
             "has_url": self._calculate_url_score(item),
-            "recency": self._calculate_recency_score(item),
+            "recency": self._calculate_recency_score(item, now),
             "reputation": self._calculate_reputation_score(source),
-            "keyword_relevance": self._calculate_keyword_score(item, agenda, source),
+            "keyword_relevance": keyword_score,
             "engagement": self._calculate_engagement_score(item),
         }
 
         total_score = sum(breakdown.values())
+        breakdown["matched_keywords"] = matched_keywords
         effective_threshold = threshold or self.DEFAULT_THRESHOLD
 
         return QualityResult(
@@ -75,6 +85,107 @@ class QualityScorer:
             should_process=total_score >= effective_threshold
         )
 
+    @timed("score", items=len)
+    def score_many(
+        self,
+        items: List[Dict[str, Any]],
+        sources: Dict[str, Dict[str, Any]],
+        agenda: Dict[str, Any] | None = None,
+        threshold: float | None = None,
+        now: datetime | None = None,
+    ) -> List[QualityResult]:
+        """
+        Calculate quality scores for many items in one pass.
+
+        Gives the same results as calling score() for each item with the
+        same reference time. Raw features are read once per item, keyword
+        matchers are compiled once per keyword set, and the six factors are
+        computed as NumPy column arithmetic.
+
+        Args:
+            items: The collected_items rows
+            sources: The sources rows keyed by id (looked up by item.source_id)
+            agenda: The agendas row (for keywords), optional
+            threshold: Override default threshold
+            now: Reference time for recency, defaults to the current time
+
+        Returns:
+            One QualityResult per item, in order
+        """
+        if not items:
+            return []
+
+        now = now or datetime.now(timezone.utc)
+        count = len(items)
+        effective_threshold = threshold or self.DEFAULT_THRESHOLD
+
+        lengths = np.fromiter(
+            (len(item.get("content") or "") for item in items), dtype=np.float64, count=count
+        )
+        has_url = np.fromiter((bool(item.get("url")) for item in items), dtype=bool, count=count)
+        ages = np.fromiter(
+            (self._age_hours(item, now) for item in items), dtype=np.float64, count=count
+        )
+        engagement = np.fromiter(
+            (self._engagement_total(item) for item in items), dtype=np.float64, count=count
+        )
+
+        reputation = np.empty(count)
+        matched = np.empty(count)
+        keyword_counts = np.empty(count)
+        matched_keywords: List[List[str]] = []
+        reputation_by_source: Dict[Any, float] = {}
+        for i, item in enumerate(items):
+            source_id = item.get("source_id")
+            source = sources.get(source_id, {})
+            if source_id not in reputation_by_source:
+                reputation_by_source[source_id] = self._calculate_reputation_score(source)
+            keywords = self._resolve_keywords(agenda, source)
+            hits = self._match_keywords(item, keywords)
+            reputation[i] = reputation_by_source[source_id]
+            matched[i] = len(hits)
+            keyword_counts[i] = len(keywords)
+            matched_keywords.append(self._unique_keywords(keywords, hits))
+
+        columns = {
+            "content_length": np.where(
+                lengths < 50,
+                0.0,
+                np.where(lengths >= 200, 20.0, ((lengths - 50) / 150) * 20.0),
+            ),
+            "has_url": np.where(has_url, 10.0, 0.0),
+            "recency": np.select(
+                [np.isnan(ages), ages < 24, ages < 168, ages < 720],
+                [10.0, 20.0, 15.0, 10.0],
+                default=5.0,
+            ),
+            "reputation": reputation,
+            "keyword_relevance": np.divide(
+                matched, keyword_counts, out=np.zeros(count), where=keyword_counts > 0
+            ) * 25.0,
+            "engagement": np.select(
+                [engagement >= 100, engagement >= 50, engagement >= 10, engagement > 0],
+                [10.0, 7.0, 4.0, 2.0],
+                default=0.0,
+            ),
+        }
+
+        # Same left-to-right addition order as sum(breakdown.values())
+        totals = np.zeros(count)
+        for column in columns.values():
+            totals = totals + column
+
+        names = list(columns)
+        rows = np.column_stack([columns[name] for name in names]).tolist()
+        return [
+            QualityResult(
+                score=round(total, 2),
+                breakdown={**dict(zip(names, row)), "matched_keywords": hits},
+                should_process=total >= effective_threshold,
+            )
+            for total, row, hits in zip(totals.tolist(), rows, matched_keywords)
+        ]
+
     def _calculate_content_length_score(self, item: Dict[str, Any]) -> float:
         """Score based on content length. Max 20 points."""
         content = item.get("content") or ""
@@ -90,11 +201,28 @@ class QualityScorer:
         """Score based on URL presence. Max 10 points."""
         return 10.0 if item.get("url") else 0.0
 
-    def _calculate_recency_score(self, item: Dict[str, Any]) -> float:
+    def _calculate_recency_score(
+        self, item: Dict[str, Any], now: datetime | None = None
+    ) -> float:
         """
         Score based on recency. Max 20 points.
         Priority: metadata.published_at > collected_at
         """
+        age_hours = self._age_hours(item, now or datetime.now(timezone.utc))
+
+        if math.isnan(age_hours):
+            return 10.0  # Default mid-score if no date
+        elif age_hours < 24:
+            return 20.0
+        elif age_hours < 168:  # 7 days
+            return 15.0
+        elif age_hours < 720:  # 30 days
+            return 10.0
+        else:
+            return 5.0
+
+    def _age_hours(self, item: Dict[str, Any], now: datetime) -> float:
+        """Age of the item in hours relative to `now`, NaN if it has no date"""
         published_at = item.get("metadata", {}).get("published_at")
 
         if published_at:
@@ -107,23 +235,14 @@ class QualityScorer:
         else:
             collected_at = item.get("collected_at")
             if not collected_at:
-                return 10.0  # Default mid-score if no date
+                return float("nan")
             reference_time = datetime.fromisoformat(collected_at)
 
         # Ensure timezone awareness
         if reference_time.tzinfo is None:
             reference_time = reference_time.replace(tzinfo=timezone.utc)
 
-        age_hours = (datetime.now(timezone.utc) - reference_time).total_seconds() / 3600
-
-        if age_hours < 24:
-            return 20.0
-        elif age_hours < 168:  # 7 days
-            return 15.0
-        elif age_hours < 720:  # 30 days
-            return 10.0
-        else:
-            return 5.0
+        return (now - reference_time).total_seconds() / 3600
 
     def _calculate_reputation_score(self, source: Dict[str, Any]) -> float:
         """
@@ -143,37 +262,45 @@ class QualityScorer:
         item: Dict[str, Any],
         agenda: Dict[str, Any] | None,
         source: Dict[str, Any]
-    ) -> float:
+    ) -> Tuple[float, List[str]]:
         """
         Score based on keyword relevance. Max 25 points.
         Priority: agenda.keywords > source.config.keywords > DEFAULT_KEYWORDS
+
+        Returns the score and the keywords that matched.
         """
-        keywords = []
+        keywords = self._resolve_keywords(agenda, source)
+        hits = self._match_keywords(item, keywords)
+        match_ratio = len(hits) / len(keywords) if keywords else 0
+
+        return match_ratio * 25.0, self._unique_keywords(keywords, hits)
+
+    def _resolve_keywords(
+        self, agenda: Dict[str, Any] | None, source: Dict[str, Any]
+    ) -> List[str]:
         if agenda and agenda.get("keywords"):
-            keywords = agenda["keywords"]
+            return agenda["keywords"]
         elif source.get("config", {}).get("keywords"):
-            keywords = source["config"]["keywords"]
+            return source["config"]["keywords"]
         else:
-            keywords = self.DEFAULT_KEYWORDS
+            return self.DEFAULT_KEYWORDS
 
+    @staticmethod
+    def _match_keywords(item: Dict[str, Any], keywords: List[str]) -> List[int]:
+        """Indices of the keywords found in title + content (case-insensitive)"""
         text = f"{item.get('title', '')} {item.get('content', '')}".lower()
-        matched = sum(1 for kw in keywords if kw.lower() in text)
-        match_ratio = matched / len(keywords) if keywords else 0
+        return get_matcher(tuple(keywords)).find(text)
 
-        return match_ratio * 25.0
+    @staticmethod
+    def _unique_keywords(keywords: List[str], hits: List[int]) -> List[str]:
+        return list(dict.fromkeys(keywords[i] for i in hits))
 
     def _calculate_engagement_score(self, item: Dict[str, Any]) -> float:
         """
         Score based on engagement signals. Max 10 points.
         Uses likes, retweets, stars from metadata.
         """
-        metadata = item.get("metadata", {})
-
-        likes = metadata.get("likes", 0) or 0
-        retweets = metadata.get("retweets", 0) or 0
-        stars = metadata.get("stars", 0) or 0
-
-        total_engagement = likes + retweets + stars
+        total_engagement = self._engagement_total(item)
 
         if total_engagement >= 100:
             return 10.0
@@ -185,3 +312,13 @@ class QualityScorer:
             return 2.0
         else:
             return 0.0
+
+    def _engagement_total(self, item: Dict[str, Any]) -> int:
+        metadata = item.get("metadata", {})
+
+        likes = metadata.get("likes", 0) or 0
+        retweets = metadata.get("retweets", 0) or 0
+        stars = metadata.get("stars", 0) or 0
+
+        return likes + retweets + stars
+
@@ -1,6 +1,7 @@
 from typing import Dict, Any, List
 from datetime import datetime
-from app.core.database import get_supabase_client
+from app.core.metrics import timed
+from app.repositories import ActionRepository, ReportRepository
 from app.schemas.reports import ReportCreate, ReportType
 
 
@@ -8,8 +9,10 @@ class ReportGenerator:
     """Generate reports from analysis results"""
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self.reports = ReportRepository()
+        self.actions = ActionRepository()
 
+    @timed("report")
     async def generate_new_tool_report(
         self,
         agenda_id: str,
@@ -36,8 +39,7 @@ class ReportGenerator:
             },
         }
 
-        result = self.client.table("reports").insert(report_data).execute()
-        report = result.data[0]
+        report = await self.reports.insert(report_data)
 
         # Create recommended actions
         await self._create_actions_for_report(report, analysis)
@@ -78,8 +80,7 @@ class ReportGenerator:
             },
         }
 
-        result = self.client.table("reports").insert(report_data).execute()
-        report = result.data[0]
+        report = await self.reports.insert(report_data)
 
         # Create actions if switch recommended
         if best_alternative:
@@ -108,17 +109,18 @@ class ReportGenerator:
             },
         }
 
-        result = self.client.table("reports").insert(report_data).execute()
-        report = result.data[0]
+        report = await self.reports.insert(report_data)
 
-        # Create actions for each action item
-        for action_item in summary.get("action_items", []):
-            await self._create_action(
+        # Create actions for each action item, in one request
+        await self.actions.insert_many([
+            self._action_data(
                 report_id=report["id"],
                 action_type="review",
                 title=action_item,
                 priority="medium",
             )
+            for action_item in summary.get("action_items", [])
+        ])
 
         return report
 
@@ -204,16 +206,20 @@ class ReportGenerator:
             "difficulty": migration.get("difficulty", "MEDIUM"),
         }
 
-    async def _create_action(
-        self,
+    async def _create_action(self, **fields: Any):
+        """Create a single action; `fields` as for _action_data"""
+        await self.actions.insert(self._action_data(**fields))
+
+    @staticmethod
+    def _action_data(
         report_id: str,
         action_type: str,
         title: str,
         description: str | None = None,
         priority: str = "medium",
         payload: Dict[str, Any] | None = None,
-    ):
-        """Create a single action"""
+    ) -> Dict[str, Any]:
+        """Row for the actions table"""
         action_data = {
             "report_id": report_id,
             "action_type": action_type,
@@ -226,4 +232,4 @@ class ReportGenerator:
         if payload is not None:
             action_data["payload"] = payload
 
-        self.client.table("actions").insert(action_data).execute()
+        return action_data
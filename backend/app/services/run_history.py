@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+import asyncio
+import logging
+
+from app.core.config import get_settings
+from app.repositories import PipelineRunRepository
+
+logger = logging.getLogger(__name__)
+
+# Columns for run listings; steps, metrics and errors only come with a single run
+SUMMARY_COLUMNS = (
+    "id, agenda_id, mode, success, started_at, completed_at, duration_ms, "
+    "items_collected, items_scored, items_passed, items_processed, reports_created, "
+    "llm_calls, llm_prompt_tokens, llm_output_tokens, llm_cost_usd"
+)
+
+
+def llm_cost_usd(prompt_tokens: int, output_tokens: int) -> float:
+    """Token cost at the configured per-million prices"""
+    settings = get_settings()
+    return round(
+        prompt_tokens * settings.llm_prompt_price_per_million / 1_000_000
+        + output_tokens * settings.llm_output_price_per_million / 1_000_000,
+        6,
+    )
+
+
+class RunHistory:
+    """Finished pipeline runs in the pipeline_runs table, and trends over them"""
+
+    def __init__(self):
+        self.runs = PipelineRunRepository()
+
+    async def record(self, results: Dict[str, Any], agenda_id: str | None = None):
+        """
+        Save a run result from Pipeline.run_full_pipeline.
+
+        Never raises: losing a history row must not fail the run itself.
+        """
+        try:
+            await self.runs.save(self._to_row(results, agenda_id))
+        except Exception as e:
+            logger.warning(f"Could not record pipeline run {results.get('run_id')}: {e}")
+
+    def _to_row(self, results: Dict[str, Any], agenda_id: str | None) -> Dict[str, Any]:
+        steps = results.get("steps", {})
+        metrics = results.get("metrics", {})
+        llm = metrics.get("llm", {})
+        prompt_tokens = llm.get("prompt_tokens", 0)
+        output_tokens = llm.get("output_tokens", 0)
+
+        return {
+            "id": results["run_id"],
+            "agenda_id": agenda_id,
+            "mode": results["mode"],
+            "success": results.get("success", False),
+            "started_at": results["started_at"],
+            "completed_at": results.get("completed_at"),
+            "duration_ms": metrics.get("wall_ms", {}).get("total", 0),
+            "items_collected": steps.get("collect", {}).get("saved", 0),
+            "items_scored": steps.get("quality_filter", {}).get("total_items", 0),
+            "items_passed": steps.get("quality_filter", {}).get("passed_items", 0),
+            "items_processed": steps.get("process", {}).get("processed_count", 0),
+            "reports_created": steps.get("reports", {}).get("reports_created", 0),
+            "llm_calls": llm.get("count", 0),
+            "llm_prompt_tokens": prompt_tokens,
+            "llm_output_tokens": output_tokens,
+            "llm_cost_usd": llm_cost_usd(prompt_tokens, output_tokens),
+            "steps": steps,
+            "metrics": metrics,
+            "errors": results.get("errors", []),
+        }
+
+    async def list(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        agenda_id: str | None = None,
+        success: bool | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Run summaries, newest first"""
+        return await self.runs.list(
+            agenda_id=agenda_id, success=success, columns=SUMMARY_COLUMNS, limit=limit, offset=offset
+        )
+
+    async def get(self, run_id: str) -> Dict[str, Any] | None:
+        return await self.runs.get(run_id)
+
+    async def stats(self, days: int = 30, bucket: str = "day") -> Dict[str, Any]:
+        """
+        Totals and a per-bucket trend for runs started in the last `days`:
+        run and failure counts, p50/p95 duration, items per run, quality
+        filter pass rate and LLM tokens and cost.
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        overall, trend = await asyncio.gather(
+            self.runs.stats(since, "all"),
+            self.runs.stats(since, bucket),
+        )
+
+        return {
+            "since": since,
+            "bucket": bucket,
+            "overall": overall[0] if overall else None,
+            "trend": trend,
+        }
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+import asyncio
+import logging
+import time
+import uuid
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Events after which a run emits nothing more
+TERMINAL_EVENTS = ("run_completed", "run_failed")
+
+
+@dataclass
+class PipelineRun:
+    """
+    One pipeline run and the events it has emitted so far.
+
+    Events are dicts with "id" (1-based sequence), "event", "ts" and
+    "elapsed_ms" since the run started, plus event-specific fields. Every
+    event is kept so late subscribers can replay the run from the start.
+    """
+
+    agenda_id: str | None = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = "running"
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: str | None = None
+    result: Dict[str, Any] | None = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    # Wall time of each finished stage
+    stage_durations: Dict[str, int] = field(default_factory=dict)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _stage_started: Dict[str, float] = field(default_factory=dict, repr=False)
+    _subscribers: List[asyncio.Queue] = field(default_factory=list, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def emit(self, event: str, **data: Any) -> Dict[str, Any]:
+        """Record an event and hand it to every live subscriber"""
+        record = {
+            "id": len(self.events) + 1,
+            "event": event,
+            "run_id": self.id,
+            "ts": datetime.now().isoformat(),
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000),
+            **data,
+        }
+        self.events.append(record)
+        for queue in self._subscribers:
+            queue.put_nowait(record)
+        return record
+
+    def start_stage(self, stage: str):
+        self._stage_started[stage] = time.perf_counter()
+        self.emit("stage_started", stage=stage)
+
+    def end_stage(self, stage: str, error: str | None = None, **data: Any):
+        """Emit stage_completed (or stage_failed with `error`) with the stage duration"""
+        started = self._stage_started.pop(stage, time.perf_counter())
+        duration_ms = round((time.perf_counter() - started) * 1000)
+        self.stage_durations[stage] = duration_ms
+        if error is not None:
+            self.emit("stage_failed", stage=stage, duration_ms=duration_ms, error=error)
+        else:
+            self.emit("stage_completed", stage=stage, duration_ms=duration_ms, **data)
+
+    def finish(self, result: Dict[str, Any]):
+        self.result = result
+        self.status = "completed" if result.get("success") else "failed"
+        self.finished_at = datetime.now().isoformat()
+        self.emit(
+            "run_completed" if result.get("success") else "run_failed",
+            duration_ms=round((time.perf_counter() - self._started) * 1000),
+            errors=result.get("errors", []),
+        )
+
+    def fail(self, error: str):
+        """Finish a run that crashed before producing a result"""
+        self.status = "failed"
+        self.finished_at = datetime.now().isoformat()
+        self.emit(
+            "run_failed",
+            duration_ms=round((time.perf_counter() - self._started) * 1000),
+            errors=[error],
+        )
+
+    async def subscribe(
+        self, after: int = 0, keepalive: float | None = None
+    ) -> AsyncIterator[Dict[str, Any] | None]:
+        """
+        Yield events with id > `after`: the recorded ones, then live ones
+        until the run finishes.
+
+        With `keepalive`, None is yielded whenever that many seconds pass
+        without an event, so callers can keep idle connections open.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        # Snapshot and subscribe in one step so no event is missed or repeated
+        backlog = self.events[after:]
+        self._subscribers.append(queue)
+        try:
+            for event in backlog:
+                yield event
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                yield event
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            self._subscribers.remove(queue)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.id,
+            "agenda_id": self.agenda_id,
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "event_count": len(self.events),
+        }
+
+
+class RunRegistry:
+    """Recent pipeline runs by ID; the oldest finished runs are dropped first"""
+
+    def __init__(self, max_runs: int):
+        self.max_runs = max_runs
+        self._runs: "OrderedDict[str, PipelineRun]" = OrderedDict()
+
+    def create(self, agenda_id: str | None = None) -> PipelineRun:
+        run = PipelineRun(agenda_id=agenda_id)
+        self._runs[run.id] = run
+        self._evict()
+        return run
+
+    def get(self, run_id: str) -> PipelineRun | None:
+        return self._runs.get(run_id)
+
+    def list(self) -> List[PipelineRun]:
+        """Newest first"""
+        return list(reversed(self._runs.values()))
+
+    def _evict(self):
+        excess = len(self._runs) - self.max_runs
+        for run_id in [run_id for run_id, run in self._runs.items() if run.finished][:max(excess, 0)]:
+            del self._runs[run_id]
+
+
+_registry: RunRegistry | None = None
+
+
+def get_run_registry() -> RunRegistry:
+    """Process-wide run registry"""
+    global _registry
+    if _registry is None:
+        _registry = RunRegistry(get_settings().pipeline_run_retention)
+    return _registry
@@ -1,22 +1,52 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
+import functools
 import logging
 
-logger = logging.getLogger(__name__)
-scheduler = AsyncIOScheduler()
-
+from app.core.config import get_settings
+from app.core.locks import COLLECTION_LOCK, PIPELINE_LOCK, WEEKLY_SUMMARY_LOCK, JobLock, JobLockBusy, JobLockLost
 
+logger = logging.getLogger(__name__)
+# One instance of each job per process; runs missed while one was still
+# going collapse into a single catch-up run
+scheduler = AsyncIOScheduler(
+    job_defaults={"max_instances": 1, "coalesce": True, "misfire_grace_time": 600}
+)
+
+
+def locked_job(lock_name: str):
+    """
+    Run the job only while holding its job lock, so with several API
+    processes (or a manual run in progress) it runs once, not once per
+    process. A busy lock skips this occurrence; a lost lock cancels it.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper():
+            try:
+                async with JobLock(lock_name) as lock:
+                    await lock.run(func())
+            except JobLockBusy:
+                logger.info(f"Skipping {func.__name__}: {lock_name} is running elsewhere")
+            except JobLockLost:
+                logger.error(f"Aborted {func.__name__}: lost {lock_name} while running")
+        return wrapper
+    return decorator
+
+
+@locked_job(COLLECTION_LOCK)
 async def run_collection_job():
-    """Periodic job to collect from all sources"""
+    """Periodic job to collect from the sources that are due (all of them without adaptive polling)"""
     from app.services.collector.manager import CollectorManager
 
     logger.info("Starting scheduled collection...")
     manager = CollectorManager()
     results = await manager.collect_all()
-    logger.info(f"Collection completed: {results}")
+    logger.info(f"Collection completed: {manager.summarize(results)}")
 
 
+@locked_job(PIPELINE_LOCK)
 async def run_full_pipeline():
     """Run the full pipeline periodically"""
     from app.services.pipeline import Pipeline
@@ -24,32 +54,41 @@ async def run_full_pipeline():
     logger.info("Starting scheduled pipeline run...")
     pipeline = Pipeline()
     results = await pipeline.run_full_pipeline()
-    logger.info(f"Pipeline completed: {results}")
+    metrics = results["metrics"]
+    logger.info(
+        f"Pipeline run {results['run_id']} {'completed' if results['success'] else 'failed'} "
+        f"in {metrics['wall_ms']['total']}ms (errors: {results['errors']}); "
+        f"see /pipeline/history/{results['run_id']}"
+    )
 
 
+@locked_job(WEEKLY_SUMMARY_LOCK)
 async def run_weekly_summary():
     """Generate weekly summary every Monday"""
     from app.services.pipeline import Pipeline
-    from app.core.database import get_supabase_client
+    from app.repositories import AgendaRepository
 
     logger.info("Generating weekly summary...")
 
-    client = get_supabase_client()
-    agenda = client.table("agendas").select("id").eq("name", "vibecoding").single().execute()
+    agenda = await AgendaRepository().get_by_name("vibecoding")
 
-    if agenda.data:
+    if agenda:
         pipeline = Pipeline()
-        await pipeline.run_weekly_summary(agenda.data["id"])
+        await pipeline.run_weekly_summary(agenda["id"])
         logger.info("Weekly summary generated")
 
 
 def start_scheduler():
-    # Collection job - every 2 hours
+    # Collection job - every few minutes with adaptive polling, where each
+    # source is only collected when its own schedule says it is due;
+    # otherwise every 2 hours
+    settings = get_settings()
+    collection_minutes = settings.collector_poll_tick_minutes if settings.collector_adaptive_polling else 120
     scheduler.add_job(
         run_collection_job,
-        trigger=IntervalTrigger(hours=2),
+        trigger=IntervalTrigger(minutes=collection_minutes),
         id="collection_job",
-        name="Collect from all sources",
+        name="Collect from due sources",
         replace_existing=True,
     )
 
@@ -0,0 +1,273 @@
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Set
+import asyncio
+import logging
+
+from app.core.config import get_settings
+from app.services.analyzer.cache import cache_stats_scope
+from app.services.context import RunContext, build_run_context
+from app.services.runs import PipelineRun
+
+if TYPE_CHECKING:
+    from app.services.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+# Marks a channel whose producer has finished
+_CLOSED = object()
+
+
+class Channel:
+    """
+    Bounded queue between two pipeline stages.
+
+    The producer waits while the channel is full, which is what keeps a fast
+    stage from running ahead of a slow one. Any number of consumers read
+    batches until the producer closes it.
+    """
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    async def put(self, item: Any):
+        await self.queue.put(item)
+
+    async def close(self):
+        await self.queue.put(_CLOSED)
+
+    async def get_batch(self, max_items: int) -> List[Any] | None:
+        """
+        Wait for one item, then take whatever else is already queued, up to
+        `max_items`. Returns None once the channel is closed and empty.
+        """
+        if self.closed:
+            return None
+
+        item = await self.queue.get()
+        if item is _CLOSED:
+            return self._on_closed()
+
+        batch = [item]
+        while len(batch) < max_items and not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is _CLOSED:
+                self._on_closed()
+                break
+            batch.append(item)
+        return batch
+
+    def _on_closed(self) -> None:
+        self.closed = True
+        # Leave the marker for consumers still waiting on the queue
+        self.queue.put_nowait(_CLOSED)
+
+    async def drain(self):
+        """Discard items until the producer closes the channel"""
+        while await self.get_batch(self.queue.maxsize or 1) is not None:
+            pass
+
+
+class StreamingRun:
+    """
+    Streaming execution of one pipeline run.
+
+    Collect, score, analyze and report run at the same time and hand work
+    downstream through bounded Channels, so scoring and analysis start on
+    the first source's new items while later sources are still downloading.
+    Channel capacity (settings.pipeline_queue_size) caps how many items are
+    held in memory between stages.
+
+    Items left over by earlier runs (unscored, or passed but unprocessed)
+    are fed in before the new ones. A failed stage is recorded in the
+    results like a failed phased step; it keeps draining its input so
+    upstream stages are never blocked, and downstream stages simply get no
+    more work.
+    """
+
+    def __init__(
+        self,
+        pipeline: "Pipeline",
+        agenda_id: str | None,
+        run: PipelineRun,
+        results: Dict[str, Any],
+    ):
+        settings = get_settings()
+        self.pipeline = pipeline
+        self.agenda_id = agenda_id
+        self.run = run
+        self.results = results
+        self.collected = Channel(settings.pipeline_queue_size)
+        self.passed = Channel(settings.pipeline_queue_size)
+        self.analyzed = Channel(settings.pipeline_queue_size)
+        self._context: "asyncio.Future[RunContext] | None" = None
+
+    async def execute(self):
+        await asyncio.gather(
+            self._stage("collect", "Collection", self._collect, None, self.collected),
+            self._stage("quality_filter", "Collection", self._score, self.collected, self.passed),
+            self._stage("process", "Processing", self._analyze, self.passed, self.analyzed),
+            self._stage("reports", "Processing", self._report, self.analyzed, None),
+        )
+
+    async def _stage(
+        self,
+        name: str,
+        label: str,
+        body: Callable[[], Awaitable[Dict[str, Any]]],
+        inbox: Channel | None,
+        outbox: Channel | None,
+    ):
+        """Run one stage, record its outcome and always close its outbox"""
+        self.run.start_stage(name)
+        try:
+            step = await body()
+            self.results["steps"][name] = {"success": True, **step}
+            self.run.end_stage(name, **{k: v for k, v in step.items() if k != "results"})
+        except Exception as e:
+            logger.error(f"Streaming stage {name} failed: {e}")
+            self.results["errors"].append(f"{label}: {str(e)}")
+            self.results["steps"][name] = {"success": False, "error": str(e)}
+            self.run.end_stage(name, error=str(e))
+            if inbox:
+                await inbox.drain()
+        finally:
+            if outbox:
+                await outbox.close()
+
+    async def _get_context(self) -> RunContext:
+        """
+        The run's context, built once by the first stage that needs it.
+        Built inside the stages so a failure is recorded as theirs while
+        collection goes on, as in the phased mode.
+        """
+        if self._context is None:
+            self._context = asyncio.ensure_future(build_run_context(self.agenda_id))
+        return await asyncio.shield(self._context)
+
+    async def _collect(self) -> Dict[str, Any]:
+        collector = self.pipeline.collector
+
+        async def forward(rows: List[Dict[str, Any]]):
+            for row in rows:
+                await self.collected.put(row)
+
+        logger.info("Starting streaming collection...")
+        # Run-scope saves would hold every item back until the end
+        collection_results = await collector.collect_all(
+            self.agenda_id,
+            save_scope="source",
+            on_result=lambda result: self.run.emit("collected", **result),
+            on_inserted=forward,
+        )
+        return {**collector.summarize(collection_results), "results": collection_results}
+
+    async def _score(self) -> Dict[str, Any]:
+        pipeline = self.pipeline
+        processor = pipeline.processor
+        context = await self._get_context()
+        # Agenda keywords only apply when the run targets an agenda
+        agenda = context.agenda if self.agenda_id else None
+        # Only the vibecoding agenda is analyzed, as in processor._get_unprocessed_items
+        agenda_sources = set(context.processed_source_ids())
+        seen: Set[str] = set()
+        counts = {"total_items": 0, "passed_items": 0}
+
+        async def score(rows: List[Dict[str, Any]]):
+            rows = [row for row in rows if row["id"] not in seen]
+            seen.update(row["id"] for row in rows)
+            if not rows:
+                return
+
+            passed = await pipeline._filter_by_quality(
+                rows,
+                agenda,
+                context,
+                on_result=lambda update: self.run.emit(
+                    "scored",
+                    item_id=update["id"],
+                    quality_score=update["quality_score"],
+                    passed=not update["filtered_out"],
+                ),
+            )
+            counts["total_items"] += len(rows)
+            counts["passed_items"] += len(passed)
+            for item in passed:
+                if item.get("source_id") in agenda_sources:
+                    await self.passed.put(item)
+
+        # Backlog from earlier runs first: unscored items, then passed ones
+        # still waiting for analysis
+        await score(await pipeline._get_unscored_items())
+        for item in await processor._get_unprocessed_items(context):
+            if item.get("quality_score") is not None:
+                await self.passed.put(item)
+
+        chunk_size = pipeline.QUALITY_UPDATE_CHUNK_SIZE
+        while (batch := await self.collected.get_batch(chunk_size)) is not None:
+            await score(batch)
+
+        counts["filtered_out"] = counts["total_items"] - counts["passed_items"]
+        return counts
+
+    async def _analyze(self) -> Dict[str, Any]:
+        processor = self.pipeline.processor
+        analyzer = processor.analyzer
+        context = await self._get_context()
+        workers = get_settings().llm_max_concurrency
+        slots = asyncio.Semaphore(workers)
+        batch_size = analyzer.batch_max_items
+        seen: Set[str] = set()
+        processed: List[Dict[str, Any]] = []
+
+        def emit(result: Dict[str, Any]):
+            self.run.emit(
+                "analyzed",
+                item_id=result["item_id"],
+                item_title=result["item_title"],
+                verdict=result["analysis"].get("verdict"),
+                duration_ms=result["duration_ms"],
+            )
+
+        async def worker():
+            while (batch := await self.passed.get_batch(batch_size)) is not None:
+                # Same per-run cap as the phased mode; the rest wait for the next run
+                room = processor.MAX_ITEMS_PER_RUN - len(seen)
+                batch = [item for item in batch if item["id"] not in seen][:max(room, 0)]
+                seen.update(item["id"] for item in batch)
+                if not batch:
+                    continue
+
+                if batch_size > 1:
+                    results = await processor._process_in_batches(batch, context, slots, emit)
+                else:
+                    result = await processor._analyze_item(batch[0], context, slots, emit)
+                    results = [result] if result else []
+
+                for result in results:
+                    processed.append(result)
+                    await self.analyzed.put(result)
+
+        logger.info("Processing items as they pass the quality filter...")
+        with cache_stats_scope() as cache_stats:
+            tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # One failed worker fails the stage; stop the others with it
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return {
+            "processed_count": len(processed),
+            "llm_cache": cache_stats,
+        }
+
+    async def _report(self) -> Dict[str, Any]:
+        context = await self._get_context()
+        reports_created = 0
+        while (batch := await self.analyzed.get_batch(self.analyzed.queue.maxsize)) is not None:
+            reports_created += await self.pipeline._generate_reports_from_analysis(
+                context, batch, self.run
+            )
+        return {"reports_created": reports_created}
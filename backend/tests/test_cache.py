@@ -0,0 +1,65 @@
+import pytest
+
+from app.services.analyzer import cache
+from app.services.analyzer.cache import MemoryCacheBackend
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock.time)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    backend = MemoryCacheBackend(ttl_seconds=60, max_entries=10)
+    backend.set("key", "value")
+
+    clock.now += 60
+    assert backend.get("key") == "value"
+
+    clock.now += 1
+    assert backend.get("key") is None
+    # Expired entries are dropped on read
+    assert "key" not in backend._entries
+
+
+def test_set_restarts_the_ttl(clock):
+    backend = MemoryCacheBackend(ttl_seconds=60, max_entries=10)
+    backend.set("key", "old")
+    clock.now += 50
+    backend.set("key", "new")
+    clock.now += 50
+    assert backend.get("key") == "new"
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    backend = MemoryCacheBackend(ttl_seconds=60, max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+
+    # Reading "a" makes "b" the least recently used
+    assert backend.get("a") == "1"
+    backend.set("c", "3")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+
+
+def test_overwriting_does_not_evict(clock):
+    backend = MemoryCacheBackend(ttl_seconds=60, max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.set("a", "3")
+
+    assert backend.get("a") == "3"
+    assert backend.get("b") == "2"
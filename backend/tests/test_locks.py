@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from app.core import locks
+from app.core.locks import JobLock, JobLockBusy, JobLockLost
+from app.services.scheduler import locked_job
+
+# Renewals run every third of the TTL
+TTL = 0.03
+
+
+class FakeLockTable:
+    """job_locks RPCs over a dict of lock name -> holder; leases never expire"""
+
+    def __init__(self):
+        self.holders = {}
+
+    def rpc(self, function: str, params: dict):
+        return FakeCall(self, function, params)
+
+    def call(self, function: str, params: dict):
+        name, holder = params["lock_name"], params["lock_holder"]
+        if function == "acquire_job_lock":
+            if self.holders.get(name, holder) != holder:
+                return False
+            self.holders[name] = holder
+            return True
+        if function == "renew_job_lock":
+            return self.holders.get(name) == holder
+        if function == "release_job_lock":
+            if self.holders.get(name) == holder:
+                del self.holders[name]
+            return None
+        raise AssertionError(f"Unexpected RPC {function}")
+
+
+class FakeCall:
+    def __init__(self, table: FakeLockTable, function: str, params: dict):
+        self.table = table
+        self.function = function
+        self.params = params
+
+    async def execute(self):
+        return FakeResult(self.table.call(self.function, self.params))
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeLockTable()
+    monkeypatch.setattr(locks, "get_async_supabase_client", lambda: table)
+    monkeypatch.setattr(locks.get_settings(), "job_lock_ttl_seconds", TTL)
+    return table
+
+
+@pytest.mark.asyncio
+async def test_second_lock_in_same_process_cannot_acquire(table):
+    async with JobLock("job"):
+        with pytest.raises(JobLockBusy):
+            async with JobLock("job"):
+                pass
+
+    # Released on exit, so the next holder gets it
+    async with JobLock("job"):
+        pass
+    assert table.holders == {}
+
+
+@pytest.mark.asyncio
+async def test_lock_is_released_when_the_job_raises(table):
+    async def job():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        async with JobLock("job") as lock:
+            await lock.run(job())
+    assert table.holders == {}
+
+
+@pytest.mark.asyncio
+async def test_lost_renewal_cancels_the_job(table):
+    cancelled = asyncio.Event()
+
+    async def job():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(JobLockLost):
+        async with JobLock("job") as lock:
+            # Taken over by another process before the first renewal
+            table.holders["job"] = "elsewhere"
+            await asyncio.wait_for(lock.run(job()), 1)
+
+    assert cancelled.is_set()
+    assert lock.lost
+    # Release leaves the new holder's lock alone
+    assert table.holders == {"job": "elsewhere"}
+
+
+@pytest.mark.asyncio
+async def test_locked_job_skips_a_busy_lock(table):
+    runs = []
+
+    @locked_job("job")
+    async def job():
+        runs.append(1)
+
+    table.holders["job"] = "elsewhere"
+    await job()
+    assert runs == []
+
+    del table.holders["job"]
+    await job()
+    assert runs == [1]
+    assert table.holders == {}
+
+
+@pytest.mark.asyncio
+async def test_locked_job_cancels_the_job_when_the_lock_is_lost(table):
+    reached_end = []
+
+    @locked_job("job")
+    async def job():
+        table.holders["job"] = "elsewhere"
+        await asyncio.sleep(10)
+        reached_end.append(1)
+
+    # JobLockLost is logged, not raised to the scheduler
+    await asyncio.wait_for(job(), 1)
+    assert reached_end == []
+
+
+@pytest.mark.asyncio
+async def test_locked_job_releases_the_lock_when_the_job_raises(table):
+    @locked_job("job")
+    async def job():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await job()
+    assert table.holders == {}
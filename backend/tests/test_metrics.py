@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from app.core.metrics import MeteredTransport, _record_db_request, _record_http_request, run_metrics_scope
+
+
+def _client(handler, record) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=MeteredTransport(httpx.MockTransport(handler), record))
+
+
+async def _respond(request: httpx.Request) -> httpx.Response:
+    status = int(request.url.params.get("status", 200))
+    return httpx.Response(status, json=[])
+
+
+async def _reset(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("Connection reset by peer", request=request)
+
+
+@pytest.mark.asyncio
+async def test_http_requests_count_error_statuses():
+    async with _client(_respond, _record_http_request) as client:
+        with run_metrics_scope() as run:
+            await client.get("https://example.com/feed")
+            await client.get("https://example.com/feed?status=503")
+
+    assert len(run.http["example.com"]) == 2
+    assert run.http_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_transport_failures_count_as_errors():
+    async with _client(_reset, _record_http_request) as client:
+        with run_metrics_scope() as run:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://example.com/feed")
+
+    assert len(run.http["example.com"]) == 1
+    assert run.http_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_db_requests_are_recorded_by_table():
+    async with _client(_reset, _record_db_request) as client:
+        with run_metrics_scope() as run:
+            with pytest.raises(httpx.ConnectError):
+                await client.post("https://db.example.com/rest/v1/rpc/update_sources")
+
+    assert len(run.db["rpc/update_sources"]) == 1
+    assert run.db_errors == 1
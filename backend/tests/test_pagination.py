@@ -0,0 +1,117 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+from fastapi.responses import JSONResponse
+
+from app.core.pagination import NEXT_CURSOR_HEADER, Page, Paginated, decode_cursor, encode_cursor
+from app.repositories import ActionRepository, PrincipleRepository, StackRepository
+from app.schemas.reports import ActionResponse
+
+KEY = str(uuid.uuid4())
+
+
+def test_parse_cursor_normalizes_the_keyset_types():
+    actions = ActionRepository()
+    assert actions.parse_cursor("2026-10-01T12:00:00+00:00", KEY.upper()) == (
+        "2026-10-01T12:00:00+00:00",
+        KEY,
+    )
+    # NULL order values sort first and page like any other
+    assert actions.parse_cursor(None, KEY) == (None, KEY)
+    assert PrincipleRepository().parse_cursor(3, KEY) == (3.0, KEY)
+    assert StackRepository().parse_cursor("2026-10-01T00:00:00", "terminal") == (
+        "2026-10-01T00:00:00",
+        "terminal",
+    )
+
+
+@pytest.mark.parametrize("repository, value, key", [
+    (ActionRepository(), "yesterday", KEY),
+    (ActionRepository(), 5, KEY),
+    (ActionRepository(), "2026-10-01T00:00:00", "not-a-uuid"),
+    (ActionRepository(), "2026-10-01T00:00:00", None),
+    (PrincipleRepository(), "0.5", KEY),
+    (PrincipleRepository(), True, KEY),
+    (PrincipleRepository(), float("nan"), KEY),
+    (StackRepository(), "2026-10-01T00:00:00", 1),
+])
+def test_parse_cursor_rejects_values_of_the_wrong_type(repository, value, key):
+    with pytest.raises(ValueError):
+        repository.parse_cursor(value, key)
+
+
+def test_decode_cursor_round_trips_and_rejects_garbage():
+    actions = ActionRepository()
+    cursor = ("2026-10-01T12:00:00+00:00", KEY)
+    assert decode_cursor(encode_cursor(cursor), actions) == cursor
+
+    for garbage in ["%%%", encode_cursor(("2026-10-01",)), encode_cursor(("soon", KEY))]:
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(garbage, actions)
+        assert error.value.status_code == 400
+
+
+def _rows(count):
+    """Rows in list() order: newest first"""
+    newest = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    return [
+        {"id": str(uuid.UUID(int=i)), "created_at": (newest - timedelta(minutes=i)).isoformat()}
+        for i in range(count)
+    ]
+
+
+def test_page_asks_for_one_extra_row_and_trims_it():
+    response = Response()
+    page = Page(ActionRepository(), response, "*", None, 3, projected=False)
+    assert page.query == {"columns": "*", "after": None, "limit": 4}
+
+    rows = _rows(4)
+    assert page.respond(rows) == rows[:3]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER], ActionRepository()) == (
+        rows[2]["created_at"],
+        rows[2]["id"],
+    )
+
+
+def test_last_page_has_no_next_cursor():
+    response = Response()
+    page = Page(ActionRepository(), response, "*", None, 3, projected=False)
+    assert page.respond(_rows(3)) == _rows(3)
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_page_without_limit_returns_every_row():
+    response = Response()
+    page = Page(ActionRepository(), response, "*", None, None, projected=False)
+    assert page.query["limit"] is None
+    assert page.respond(_rows(300)) == _rows(300)
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_projected_page_bypasses_the_response_model():
+    page = Page(ActionRepository(), Response(), "id,created_at", None, 1, projected=True)
+    rows = _rows(2)
+    result = page.respond(rows)
+    assert isinstance(result, JSONResponse)
+    assert json.loads(result.body) == rows[:1]
+    assert NEXT_CURSOR_HEADER in result.headers
+
+
+def test_paginated_applies_default_limit_and_keyset_columns():
+    paginated = Paginated(ActionRepository, ActionResponse, default_limit=50)
+
+    page = paginated(Response(), cursor=None, limit=None, fields=None)
+    assert page.limit == 50
+    assert page.columns == "*"
+
+    page = paginated(Response(), cursor=None, limit=10, fields="status, id")
+    assert page.limit == 10
+    assert page.columns == "status,id,created_at"
+    assert page.projected
+
+    with pytest.raises(HTTPException) as error:
+        paginated(Response(), cursor=None, limit=None, fields="status,secret")
+    assert error.value.status_code == 400
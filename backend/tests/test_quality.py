@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.quality.scorer import QualityScorer
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+SOURCES = {
+    "gh": {"id": "gh", "source_type": "github", "config": {}},
+    "rss": {"id": "rss", "source_type": "rss", "config": {"reputation_score": 90}},
+    "kw": {"id": "kw", "source_type": "web", "config": {"keywords": ["ghostty", "warp"]}},
+}
+
+
+def _items():
+    """Items spanning every factor's brackets, including missing fields"""
+    lengths = [0, 49, 50, 125, 200, 500]
+    ages = [None, 1, 72, 480, 2000]
+    engagement = [0, 5, 10, 50, 100]
+    items = []
+    for i in range(30):
+        age = ages[i % len(ages)]
+        metadata = {"stars": engagement[i % len(engagement)]}
+        item = {
+            "id": f"item-{i}",
+            "source_id": list(SOURCES)[i % len(SOURCES)],
+            "title": ["Claude Code agent", "Ghostty release", "MCP server for Cursor"][i % 3],
+            "content": "llm terminal " * (lengths[i % len(lengths)] // 13 + 1)
+            if lengths[i % len(lengths)] else "",
+            "metadata": metadata,
+        }
+        if i % 7:
+            item["url"] = f"https://example.com/{i}"
+        if age is not None:
+            published = NOW - timedelta(hours=age)
+            if i % 2:
+                metadata["published_at"] = published.isoformat().replace("+00:00", "Z")
+            else:
+                # Naive collected_at is read as UTC
+                item["collected_at"] = published.replace(tzinfo=None).isoformat()
+        items.append(item)
+    return items
+
+
+@pytest.mark.parametrize("agenda", [None, {"keywords": ["claude", "mcp", "cursor"]}])
+@pytest.mark.parametrize("threshold", [None, 60])
+def test_score_many_matches_score(agenda, threshold):
+    scorer = QualityScorer()
+    items = _items()
+
+    batch = scorer.score_many(items, SOURCES, agenda, threshold, now=NOW)
+
+    assert len(batch) == len(items)
+    for item, result in zip(items, batch):
+        expected = scorer.score(item, SOURCES[item["source_id"]], agenda, threshold, now=NOW)
+        assert result.score == expected.score
+        assert result.should_process == expected.should_process
+        assert result.breakdown == pytest.approx(expected.breakdown)
+
+
+def test_score_many_of_nothing():
+    assert QualityScorer().score_many([], SOURCES) == []
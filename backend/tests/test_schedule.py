@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.collector.schedule import PollScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = PollScheduler(sources=None)
+    scheduler.min_minutes = 30
+    scheduler.max_minutes = 1440
+    scheduler.target_items = 3.0
+    return scheduler
+
+
+def test_healthy_source_is_due_after_target_items_at_its_rate(scheduler):
+    source = {"poll_interval_minutes": 240, "consecutive_failures": 2}
+
+    # 3 items at 1 an hour -> 3 hours
+    schedule = scheduler.next_poll(source, {"saved": 4}, rate=1.0)
+    assert schedule["poll_interval_minutes"] == 180
+    assert schedule["consecutive_failures"] == 0
+
+    before = datetime.now(timezone.utc)
+    next_poll_at = datetime.fromisoformat(schedule["next_poll_at"])
+    assert before + timedelta(minutes=179) < next_poll_at <= before + timedelta(minutes=181)
+
+
+def test_interval_stays_within_bounds(scheduler):
+    assert scheduler.next_poll({}, {}, rate=1000.0)["poll_interval_minutes"] == 30
+    assert scheduler.next_poll({}, {}, rate=0.01)["poll_interval_minutes"] == 1440
+    # No items in the history window: poll as rarely as allowed
+    assert scheduler.next_poll({}, {}, rate=0.0)["poll_interval_minutes"] == 1440
+
+
+def test_failures_double_the_previous_interval_up_to_the_max(scheduler):
+    source = {}
+    intervals = []
+    for _ in range(8):
+        schedule = scheduler.next_poll(source, {"error": "timeout"}, rate=5.0)
+        intervals.append(schedule["poll_interval_minutes"])
+        source = schedule
+
+    assert intervals == [60, 120, 240, 480, 960, 1440, 1440, 1440]
+    assert source["consecutive_failures"] == 8
+
+    # The first success resets the count and goes back to the publish rate
+    schedule = scheduler.next_poll(source, {"saved": 1}, rate=5.0)
+    assert schedule["poll_interval_minutes"] == 36
+    assert schedule["consecutive_failures"] == 0
+
+
+def test_retry_after_is_honoured_past_the_max(scheduler):
+    schedule = scheduler.next_poll(
+        {"poll_interval_minutes": 30},
+        {"error": "429 Too Many Requests", "retry_after": 2 * 86400},
+        rate=5.0,
+    )
+    assert schedule["poll_interval_minutes"] == 2880
+
+    # A short Retry-After never shortens the backoff
+    schedule = scheduler.next_poll(
+        {"poll_interval_minutes": 120},
+        {"error": "503 Service Unavailable", "retry_after": 60},
+        rate=5.0,
+    )
+    assert schedule["poll_interval_minutes"] == 240
@@ -0,0 +1,52 @@
+import pytest
+
+from app.services.processor.search import InvertedIndex, ItemSearch
+
+
+class FakeItems:
+    """CollectedItemRepository stand-in holding rows in save order"""
+
+    def __init__(self):
+        self.rows = []
+
+    def save(self, item_id: str, title: str, collected_at: str):
+        self.rows.append({
+            "id": item_id,
+            "title": title,
+            "content": "",
+            "collected_at": collected_at,
+            "ingest_seq": len(self.rows) + 1,
+        })
+
+    async def page_after(self, after_seq, size, columns="*"):
+        rows = [row for row in self.rows if after_seq is None or row["ingest_seq"] > after_seq]
+        return rows[:size]
+
+    async def get_many(self, keys, columns="*"):
+        return [row for row in self.rows if row["id"] in keys]
+
+
+@pytest.mark.asyncio
+async def test_memory_search_finds_items_saved_after_refresh_with_older_dates():
+    items = FakeItems()
+    items.save("new", "ghostty terminal release", "2026-10-01T00:00:00+00:00")
+    search = ItemSearch(items, backend="memory")
+    assert [row["id"] for row in await search.search(["ghostty"])] == ["new"]
+
+    # Saved later, published earlier than everything already indexed
+    items.save("old", "ghostty backport", "2025-01-01T00:00:00+00:00")
+    assert {row["id"] for row in await search.search(["ghostty"])} == {"new", "old"}
+
+
+def test_inverted_index_prefix_terms_and_title_weight():
+    index = InvertedIndex()
+    index.add({"id": "a", "title": "Claude Code hooks", "content": ""})
+    index.add({"id": "b", "title": "notes", "content": "claude code tips"})
+    index.add({"id": "c", "title": "cursor", "content": ""})
+
+    assert index.search(["claude code"]) == ["a", "b"]
+    assert index.search(["curs"]) == ["c"]
+
+    index.remove("a")
+    assert index.search(["claude code"]) == ["b"]
+    assert "hooks" not in index.vocabulary
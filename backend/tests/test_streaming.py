@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.services.streaming import Channel
+
+
+@pytest.mark.asyncio
+async def test_get_batch_takes_what_is_queued_up_to_max_items():
+    channel = Channel(10)
+    for item in range(5):
+        await channel.put(item)
+
+    assert await channel.get_batch(3) == [0, 1, 2]
+    assert await channel.get_batch(3) == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_get_batch_waits_for_the_first_item():
+    channel = Channel(10)
+    batch = asyncio.ensure_future(channel.get_batch(3))
+    await asyncio.sleep(0)
+    assert not batch.done()
+
+    await channel.put("first")
+    assert await asyncio.wait_for(batch, 1) == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_close_ends_every_consumer_after_the_last_batch():
+    channel = Channel(10)
+    await channel.put(1)
+    await channel.put(2)
+    await channel.close()
+
+    # Items queued before close still come out, then None from then on
+    assert await channel.get_batch(10) == [1, 2]
+    assert channel.closed
+    assert await channel.get_batch(10) is None
+
+    # Consumers already waiting on the queue see the close too
+    waiting = Channel(10)
+    consumers = [asyncio.ensure_future(waiting.get_batch(10)) for _ in range(3)]
+    await asyncio.sleep(0)
+    await waiting.close()
+    assert await asyncio.wait_for(asyncio.gather(*consumers), 1) == [None, None, None]
+
+
+@pytest.mark.asyncio
+async def test_full_channel_holds_the_producer_back():
+    channel = Channel(2)
+    await channel.put(1)
+    await channel.put(2)
+
+    blocked = asyncio.ensure_future(channel.put(3))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    assert await channel.get_batch(1) == [1]
+    await asyncio.wait_for(blocked, 1)
+
+
+@pytest.mark.asyncio
+async def test_drain_unblocks_the_producer_until_close():
+    channel = Channel(2)
+
+    async def produce():
+        for item in range(20):
+            await channel.put(item)
+        await channel.close()
+
+    producer = asyncio.ensure_future(produce())
+    await asyncio.wait_for(channel.drain(), 1)
+    await asyncio.wait_for(producer, 1)
+    assert await channel.get_batch(2) is None
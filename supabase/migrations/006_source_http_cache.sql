@@ -0,0 +1,11 @@
+-- Migration: HTTP cache validators for sources
+-- Purpose: Let collectors send conditional GETs and skip unchanged feeds
+
+ALTER TABLE sources ADD COLUMN etag TEXT;
+ALTER TABLE sources ADD COLUMN last_modified TEXT;
+ALTER TABLE sources ADD COLUMN content_hash VARCHAR(64);
+
+-- Comment explaining usage
+COMMENT ON COLUMN sources.etag IS 'ETag from the last successful fetch, sent back as If-None-Match';
+COMMENT ON COLUMN sources.last_modified IS 'Last-Modified from the last successful fetch, sent back as If-Modified-Since';
+COMMENT ON COLUMN sources.content_hash IS 'SHA-256 of the last fetched body; an identical body skips parsing and saving';
@@ -0,0 +1,26 @@
+-- Migration: Bulk quality score updates
+-- Purpose: Persist a whole batch of quality scores in one round trip
+
+CREATE OR REPLACE FUNCTION update_quality_scores(updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+  WITH updated AS (
+    UPDATE collected_items AS c
+    SET quality_score = u.quality_score,
+        quality_breakdown = u.quality_breakdown,
+        filtered_out = u.filtered_out
+    FROM jsonb_to_recordset(updates) AS u(
+      id UUID,
+      quality_score FLOAT,
+      quality_breakdown JSONB,
+      filtered_out BOOLEAN
+    )
+    WHERE c.id = u.id
+    RETURNING 1
+  )
+  SELECT count(*)::INTEGER FROM updated;
+$$;
+
+-- Comment explaining usage
+COMMENT ON FUNCTION update_quality_scores(JSONB) IS 'Bulk update quality_score, quality_breakdown and filtered_out from an array of {id, quality_score, quality_breakdown, filtered_out}';
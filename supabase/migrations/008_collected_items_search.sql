@@ -0,0 +1,48 @@
+-- Migration: Full-text search on collected items
+-- Purpose: Rank and limit keyword searches in Postgres instead of scanning the table client-side
+
+-- Weighted document: title matches outrank content matches.
+-- 'simple' keeps tool names like "ghostty" and "mcp" unstemmed.
+CREATE OR REPLACE FUNCTION collected_items_search_vector(title TEXT, content TEXT)
+RETURNS TSVECTOR
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+      || setweight(to_tsvector('simple', coalesce(content, '')), 'B');
+$$;
+
+-- Expression index rather than a stored column, so select("*") payloads stay the same size
+CREATE INDEX idx_collected_items_search
+  ON collected_items USING GIN (collected_items_search_vector(title, content));
+
+-- Each term is a phrase of prefix-matched words ("claude code" -> 'claude':* <-> 'code':*);
+-- an item matches when any term does. Best-ranked first, newest breaking ties.
+CREATE OR REPLACE FUNCTION search_collected_items(search_terms TEXT[], match_limit INTEGER DEFAULT 20)
+RETURNS SETOF collected_items
+LANGUAGE sql
+STABLE
+AS $$
+  WITH phrases AS (
+    SELECT array_to_string(ARRAY(
+      SELECT quote_literal(word) || ':*'
+      FROM regexp_split_to_table(lower(term), '[^[:alnum:]]+') AS word
+      WHERE word <> ''
+    ), ' <-> ') AS phrase
+    FROM unnest(search_terms) AS term
+  ),
+  query AS (
+    SELECT to_tsquery('simple', string_agg('(' || phrase || ')', ' | ')) AS q
+    FROM phrases
+    WHERE phrase <> ''
+  )
+  SELECT c.*
+  FROM collected_items AS c, query
+  WHERE collected_items_search_vector(c.title, c.content) @@ query.q
+  ORDER BY ts_rank(collected_items_search_vector(c.title, c.content), query.q) DESC,
+           c.collected_at DESC
+  LIMIT match_limit;
+$$;
+
+-- Comment explaining usage
+COMMENT ON FUNCTION search_collected_items(TEXT[], INTEGER) IS 'Ranked full-text search over collected item titles and content; any of search_terms may match';
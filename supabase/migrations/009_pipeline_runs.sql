@@ -0,0 +1,70 @@
+-- Migration: Pipeline run history
+-- Purpose: Keep every pipeline run's timings, counts, LLM usage and errors for trend queries
+
+CREATE TABLE pipeline_runs (
+    id UUID PRIMARY KEY,  -- run ID from the in-process run registry
+    agenda_id UUID REFERENCES agendas(id) ON DELETE SET NULL,
+    mode VARCHAR(20) NOT NULL,
+    success BOOLEAN NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    duration_ms INTEGER NOT NULL,
+    items_collected INTEGER DEFAULT 0,
+    items_scored INTEGER DEFAULT 0,
+    items_passed INTEGER DEFAULT 0,
+    items_processed INTEGER DEFAULT 0,
+    reports_created INTEGER DEFAULT 0,
+    llm_calls INTEGER DEFAULT 0,
+    llm_prompt_tokens INTEGER DEFAULT 0,
+    llm_output_tokens INTEGER DEFAULT 0,
+    llm_cost_usd FLOAT DEFAULT 0,
+    steps JSONB DEFAULT '{}',
+    metrics JSONB DEFAULT '{}',
+    errors JSONB DEFAULT '[]',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX idx_pipeline_runs_started_at ON pipeline_runs(started_at DESC);
+CREATE INDEX idx_pipeline_runs_agenda ON pipeline_runs(agenda_id);
+
+-- Aggregates per period ('hour', 'day', 'week', 'month'), or one row for 'all'
+CREATE OR REPLACE FUNCTION pipeline_run_stats(since TIMESTAMP WITH TIME ZONE, bucket TEXT DEFAULT 'day')
+RETURNS TABLE (
+    period TIMESTAMP WITH TIME ZONE,
+    runs BIGINT,
+    failed_runs BIGINT,
+    p50_duration_ms DOUBLE PRECISION,
+    p95_duration_ms DOUBLE PRECISION,
+    avg_items_collected DOUBLE PRECISION,
+    avg_items_processed DOUBLE PRECISION,
+    avg_reports_created DOUBLE PRECISION,
+    filter_pass_rate DOUBLE PRECISION,
+    llm_prompt_tokens BIGINT,
+    llm_output_tokens BIGINT,
+    llm_cost_usd DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    CASE WHEN bucket = 'all' THEN NULL ELSE date_trunc(bucket, started_at) END,
+    count(*),
+    count(*) FILTER (WHERE NOT success),
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms),
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms),
+    avg(items_collected)::DOUBLE PRECISION,
+    avg(items_processed)::DOUBLE PRECISION,
+    avg(reports_created)::DOUBLE PRECISION,
+    sum(items_passed)::DOUBLE PRECISION / NULLIF(sum(items_scored), 0),
+    sum(llm_prompt_tokens),
+    sum(llm_output_tokens),
+    sum(llm_cost_usd)
+  FROM pipeline_runs
+  WHERE started_at >= since
+  GROUP BY 1
+  ORDER BY 1;
+$$;
+
+-- Comment explaining usage
+COMMENT ON TABLE pipeline_runs IS 'One row per finished pipeline run; steps, metrics and errors mirror the run result';
+COMMENT ON FUNCTION pipeline_run_stats(TIMESTAMP WITH TIME ZONE, TEXT) IS 'Run count, duration percentiles, items per run, filter pass rate and LLM cost per period since a given time';
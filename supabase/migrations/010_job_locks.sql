@@ -0,0 +1,53 @@
+-- Migration: Job locks
+-- Purpose: Lease-based locks so a scheduled or manual job runs in one process at a time
+-- (advisory locks would not survive PostgREST's pooled, per-request connections)
+
+CREATE TABLE job_locks (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    acquired_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Take the lock if it is free or its lease has expired
+CREATE OR REPLACE FUNCTION acquire_job_lock(lock_name TEXT, lock_holder TEXT, ttl_seconds INTEGER)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO job_locks (name, holder, acquired_at, expires_at)
+  VALUES (lock_name, lock_holder, NOW(), NOW() + make_interval(secs => ttl_seconds))
+  ON CONFLICT (name) DO UPDATE
+    SET holder = EXCLUDED.holder,
+        acquired_at = EXCLUDED.acquired_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE job_locks.expires_at < NOW();
+  RETURN FOUND;
+END;
+$$;
+
+-- Extend a lease still held by lock_holder; false once it has been lost
+CREATE OR REPLACE FUNCTION renew_job_lock(lock_name TEXT, lock_holder TEXT, ttl_seconds INTEGER)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  UPDATE job_locks
+  SET expires_at = NOW() + make_interval(secs => ttl_seconds)
+  WHERE name = lock_name AND holder = lock_holder;
+  RETURN FOUND;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION release_job_lock(lock_name TEXT, lock_holder TEXT)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  DELETE FROM job_locks WHERE name = lock_name AND holder = lock_holder;
+  RETURN FOUND;
+END;
+$$;
+
+-- Comment explaining usage
+COMMENT ON TABLE job_locks IS 'One row per held job lock; a row past expires_at is free to take over';
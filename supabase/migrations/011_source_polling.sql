@@ -0,0 +1,25 @@
+-- Migration: Adaptive source polling
+-- Purpose: Poll each source on a cadence learned from how often it publishes
+
+ALTER TABLE sources ADD COLUMN next_poll_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE sources ADD COLUMN poll_interval_minutes INTEGER;
+ALTER TABLE sources ADD COLUMN consecutive_failures INTEGER DEFAULT 0;
+
+CREATE INDEX idx_sources_next_poll ON sources(next_poll_at) WHERE is_active = true;
+
+-- New items per source since a given time, for publish rate estimates
+CREATE OR REPLACE FUNCTION source_publish_stats(since TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (source_id UUID, item_count BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT source_id, count(*)
+  FROM collected_items
+  WHERE collected_at >= since
+  GROUP BY source_id;
+$$;
+
+-- Comment explaining usage
+COMMENT ON COLUMN sources.next_poll_at IS 'When the source is next due for collection; NULL means due now';
+COMMENT ON COLUMN sources.poll_interval_minutes IS 'Interval last chosen from the publish rate and error backoff';
+COMMENT ON COLUMN sources.consecutive_failures IS 'Failed collections in a row; each one doubles the interval';
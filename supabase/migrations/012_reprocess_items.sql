@@ -0,0 +1,64 @@
+-- Migration: Set-based reprocessing
+-- Purpose: Reset processed_at on a filtered set of items in one statement
+
+-- Analyzer verdict (ADOPT, CONSIDER, SKIP), set when an item is marked processed
+ALTER TABLE collected_items ADD COLUMN verdict VARCHAR(20);
+
+-- Earlier verdicts survive only in the reports of ADOPT/CONSIDER items
+UPDATE collected_items AS c
+SET verdict = upper(r.content->'analysis'->>'verdict')
+FROM reports AS r
+WHERE r.report_type = 'new_tool'
+  AND r.content->>'source_item_id' = c.id::text;
+
+CREATE INDEX idx_collected_items_processed
+  ON collected_items(collected_at DESC)
+  WHERE processed_at IS NOT NULL;
+
+-- Every filter is optional and they combine with AND. Newest items go
+-- first when max_items caps the set. Returns how many items were reset,
+-- or with dry_run how many would be.
+CREATE OR REPLACE FUNCTION reprocess_items(
+  filter_source_ids UUID[] DEFAULT NULL,
+  filter_agenda_id UUID DEFAULT NULL,
+  collected_after TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+  collected_before TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+  filter_verdicts TEXT[] DEFAULT NULL,
+  min_quality FLOAT DEFAULT NULL,
+  max_quality FLOAT DEFAULT NULL,
+  max_items INTEGER DEFAULT NULL,
+  dry_run BOOLEAN DEFAULT false
+)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+  WITH matched AS (
+    SELECT c.id
+    FROM collected_items AS c
+    WHERE c.processed_at IS NOT NULL
+      AND NOT c.filtered_out
+      AND (filter_source_ids IS NULL OR c.source_id = ANY(filter_source_ids))
+      AND (filter_agenda_id IS NULL
+           OR c.source_id IN (SELECT s.id FROM sources AS s WHERE s.agenda_id = filter_agenda_id))
+      AND (collected_after IS NULL OR c.collected_at >= collected_after)
+      AND (collected_before IS NULL OR c.collected_at < collected_before)
+      AND (filter_verdicts IS NULL OR c.verdict = ANY(filter_verdicts))
+      AND (min_quality IS NULL OR c.quality_score >= min_quality)
+      AND (max_quality IS NULL OR c.quality_score <= max_quality)
+    ORDER BY c.collected_at DESC
+    LIMIT max_items
+  ),
+  reset AS (
+    UPDATE collected_items AS c
+    SET processed_at = NULL
+    FROM matched
+    WHERE c.id = matched.id
+      AND NOT dry_run
+    RETURNING 1
+  )
+  SELECT (CASE WHEN dry_run THEN (SELECT count(*) FROM matched) ELSE (SELECT count(*) FROM reset) END)::INTEGER;
+$$;
+
+-- Comment explaining usage
+COMMENT ON COLUMN collected_items.verdict IS 'Analyzer verdict from the last time the item was processed';
+COMMENT ON FUNCTION reprocess_items(UUID[], UUID, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, TEXT[], FLOAT, FLOAT, INTEGER, BOOLEAN) IS 'Clear processed_at on processed, unfiltered items matching the filters so the next run analyzes them again';
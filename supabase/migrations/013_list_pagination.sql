@@ -0,0 +1,9 @@
+-- Migration: Keyset pagination on list endpoints
+-- Purpose: Serve each page from an index range instead of sorting the whole table
+
+CREATE INDEX idx_reports_created_at_id ON reports(created_at DESC, id DESC);
+CREATE INDEX idx_reports_status_created_at_id ON reports(status, created_at DESC, id DESC);
+CREATE INDEX idx_reports_agenda_created_at_id ON reports(agenda_id, created_at DESC, id DESC);
+CREATE INDEX idx_actions_created_at_id ON actions(created_at DESC, id DESC);
+CREATE INDEX idx_conversations_imported_at_id ON conversations(imported_at DESC, id DESC);
+CREATE INDEX idx_principles_confidence_id ON principles(confidence_score DESC, id DESC);
@@ -0,0 +1,32 @@
+-- Migration: Bulk source state updates
+-- Purpose: Store collection state of many sources in one round trip without touching their identity
+
+-- Each element is {id, ...} with any of the collection state columns below;
+-- columns missing from an element keep their value. Ids that no longer
+-- exist are skipped, so a source deleted mid-run stays deleted.
+CREATE OR REPLACE FUNCTION update_sources(updates JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+  WITH updated AS (
+    UPDATE sources AS s
+    SET last_collected_at = CASE WHEN u.data ? 'last_collected_at'
+          THEN (u.data->>'last_collected_at')::TIMESTAMP WITH TIME ZONE ELSE s.last_collected_at END,
+        etag = CASE WHEN u.data ? 'etag' THEN u.data->>'etag' ELSE s.etag END,
+        last_modified = CASE WHEN u.data ? 'last_modified' THEN u.data->>'last_modified' ELSE s.last_modified END,
+        content_hash = CASE WHEN u.data ? 'content_hash' THEN u.data->>'content_hash' ELSE s.content_hash END,
+        next_poll_at = CASE WHEN u.data ? 'next_poll_at'
+          THEN (u.data->>'next_poll_at')::TIMESTAMP WITH TIME ZONE ELSE s.next_poll_at END,
+        poll_interval_minutes = CASE WHEN u.data ? 'poll_interval_minutes'
+          THEN (u.data->>'poll_interval_minutes')::INTEGER ELSE s.poll_interval_minutes END,
+        consecutive_failures = CASE WHEN u.data ? 'consecutive_failures'
+          THEN (u.data->>'consecutive_failures')::INTEGER ELSE s.consecutive_failures END
+    FROM jsonb_array_elements(updates) AS u(data)
+    WHERE s.id = (u.data->>'id')::UUID
+    RETURNING 1
+  )
+  SELECT count(*)::INTEGER FROM updated;
+$$;
+
+-- Comment explaining usage
+COMMENT ON FUNCTION update_sources(JSONB) IS 'Bulk update last_collected_at, HTTP cache validators and poll schedule of existing sources from an array of {id, ...}';
@@ -0,0 +1,21 @@
+-- Migration: Publish rate window per source
+-- Purpose: Count only items published while the source was being watched
+
+-- collected_at holds the item's own publish time where the feed has one,
+-- so the back catalog returned by a source's first collection predates
+-- the source. Counting from the later of `since` and sources.created_at
+-- matches the window the publish rate is divided by.
+CREATE OR REPLACE FUNCTION source_publish_stats(since TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (source_id UUID, item_count BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT c.source_id, count(*)
+  FROM collected_items AS c
+  JOIN sources AS s ON s.id = c.source_id
+  WHERE c.collected_at >= greatest(since, s.created_at)
+  GROUP BY c.source_id;
+$$;
+
+-- Comment explaining usage
+COMMENT ON FUNCTION source_publish_stats(TIMESTAMP WITH TIME ZONE) IS 'Items per source published since the later of `since` and the source''s creation, for publish rate estimates';
@@ -0,0 +1,12 @@
+-- Migration: Insertion order of collected items
+-- Purpose: Let readers page through items in the order they were saved
+
+-- collected_at is the item's publish time where the feed has one, so an
+-- item saved later can sort before items already read. ingest_seq only
+-- grows; existing rows are numbered when the column is added.
+ALTER TABLE collected_items ADD COLUMN ingest_seq BIGINT GENERATED ALWAYS AS IDENTITY;
+
+CREATE UNIQUE INDEX idx_collected_items_ingest_seq ON collected_items(ingest_seq);
+
+-- Comment explaining usage
+COMMENT ON COLUMN collected_items.ingest_seq IS 'Increases with every saved item; cursor of the in-memory search index';